@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+MIT License
+Copyright (c) 2020-2023 Chris1320
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import time
+import atexit
+import weakref
+import threading
+from typing import Callable
+from typing import Optional
+from concurrent.futures import Future
+
+
+class GroupCommitter:
+    """
+    Coalesce concurrent commit requests into a single commit.
+
+    The first request starts a writer thread, which waits for <window> seconds so that
+    other requests can join, then calls <commit> once for all of them. Requests made while
+    a commit is running join the next one, since their changes may have been made after
+    the commit started. The writer thread stops when there are no more requests.
+    The requested commits are finished when the interpreter exits.
+    """
+
+    def __init__(self, commit: Callable[[], None], window: float):
+        """
+        :param commit: The function that commits the changes.
+        :param window: The number of seconds to wait for other requests before committing.
+        """
+
+        if window < 0:
+            raise ValueError("The commit window must not be negative.")
+
+        self.commit = commit
+        self.window = window
+
+        self.__lock = threading.Lock()
+        self.__pending: Optional[Future] = None  # The future of the next commit.
+        self.__running: Optional[Future] = None  # The future of the commit that is running.
+        self.__flushing = threading.Event()  # Set to commit without waiting for the rest of the window.
+        self.__writer: Optional[threading.Thread] = None
+
+        _group_committers.add(self)
+
+    def submit(self) -> Future:
+        """
+        Request a commit.
+
+        :returns: A future that is resolved when a commit that started after this request finishes.
+                  If the commit fails, the exception is set on the future.
+        """
+
+        with self.__lock:
+            if self.__pending is None:
+                self.__pending = Future()
+
+            if self.__writer is None:
+                self.__writer = threading.Thread(target=self.__run, name="GroupCommitter", daemon=True)
+                self.__writer.start()
+
+            return self.__pending
+
+    def flush(self) -> None:
+        """
+        Commit the requested commits without waiting for the rest of the window,
+        and wait until they and the running commit finish.
+        If one of them fails, its exception is raised.
+        """
+
+        with self.__lock:
+            futures = [future for future in (self.__running, self.__pending) if future is not None]
+            if self.__pending is not None:
+                self.__flushing.set()
+
+        errors = [future.exception() for future in futures]  # `exception()` waits for the commit.
+        for error in errors:
+            if error is not None:
+                raise error
+
+    def __run(self) -> None:
+        """
+        Commit the pending requests once per window until there are none left.
+        """
+
+        while True:
+            self.__flushing.wait(self.window)
+            with self.__lock:
+                self.__flushing.clear()
+                future, self.__pending = self.__pending, None
+                self.__running = future
+                if future is None:
+                    self.__writer = None
+                    return
+
+            try:
+                self.commit()
+
+            except BaseException as error:  # Every waiter gets the exception instead of the writer thread.
+                future.set_exception(error)
+
+            else:
+                future.set_result(None)
+
+            finally:
+                with self.__lock:
+                    self.__running = None
+
+
+class AutoSaver:
+    """
+    Save in a background thread after the data is modified.
+
+    The data is saved once it is not modified for <delay> seconds, or <max_delay> seconds
+    after the first unsaved modification if it keeps being modified. Unsaved modifications
+    are saved when the interpreter exits. If a background save fails, the modifications
+    are saved again by the next modification or by `flush()`, which raises the exception.
+    """
+
+    def __init__(self, save: Callable[[], None], delay: float, max_delay: float):
+        """
+        :param save: The function that saves the data.
+        :param delay: The number of seconds without modifications to wait before saving.
+        :param max_delay: The maximum number of seconds to wait after the first unsaved modification.
+        """
+
+        if delay < 0 or max_delay < 0:
+            raise ValueError("The auto-save delays must not be negative.")
+
+        self.save = save
+        self.delay = delay
+        self.max_delay = max_delay
+
+        self.__condition = threading.Condition()
+        # The time of the first and last unsaved modifications, or None if there are none.
+        self.__first_change: Optional[float] = None
+        self.__last_change: Optional[float] = None
+        self.__saving = False  # True while a background save is running.
+        self.__failed = False  # True if the last background save failed.
+        self.__writer: Optional[threading.Thread] = None
+
+        _auto_savers.add(self)
+
+    def notify(self) -> None:
+        """
+        Record a modification, and start the background thread if it is not running.
+        """
+
+        now = time.monotonic()
+        with self.__condition:
+            if self.__first_change is None:
+                self.__first_change = now
+
+            self.__last_change = now
+            if self.__writer is None:
+                self.__writer = threading.Thread(target=self.__run, name="AutoSaver", daemon=True)
+                self.__writer.start()
+
+    def cancel(self) -> None:
+        """
+        Forget the unsaved modifications, e.g., after the data is reloaded.
+        """
+
+        with self.__condition:
+            self.__first_change = self.__last_change = None
+            self.__failed = False
+            self.__condition.notify_all()
+
+    def flush(self) -> None:
+        """
+        Save the unsaved modifications now, and wait until they are saved.
+        """
+
+        with self.__condition:
+            while self.__saving:
+                self.__condition.wait()
+
+            if self.__first_change is None and not self.__failed:
+                return
+
+            self.__first_change = self.__last_change = None
+            self.__failed = False
+            self.__saving = True  # Keep the background thread from saving at the same time.
+
+        try:
+            self.save()
+
+        except BaseException:
+            with self.__condition:
+                self.__failed = True
+
+            raise
+
+        finally:
+            with self.__condition:
+                self.__saving = False
+                self.__condition.notify_all()
+
+    def __run(self) -> None:
+        """
+        Save the modifications once they are due until there are none left.
+        """
+
+        with self.__condition:
+            while True:
+                if self.__first_change is None or self.__last_change is None:
+                    self.__writer = None
+                    return
+
+                due = min(self.__last_change + self.delay, self.__first_change + self.max_delay)
+                remaining = due - time.monotonic()
+                if remaining > 0 or self.__saving:
+                    self.__condition.wait(remaining if remaining > 0 else None)
+                    continue
+
+                self.__first_change = self.__last_change = None
+                self.__saving = True
+                self.__condition.release()
+                try:
+                    self.save()
+
+                except Exception:
+                    failed = True
+
+                else:
+                    failed = False
+
+                finally:
+                    self.__condition.acquire()
+
+                self.__failed = failed
+                self.__saving = False
+                self.__condition.notify_all()
+
+
+def _flushAll() -> None:
+    """
+    Finish the requested commits of every group committer, and save the unsaved modifications
+    of every auto-saver before the interpreter exits.
+    """
+
+    errors = []
+    for background_writer in [*_group_committers, *_auto_savers]:
+        try:
+            background_writer.flush()
+
+        except Exception as error:  # Still save the other configuration files.
+            errors.append(error)
+
+    if errors:
+        raise errors[0]
+
+
+_group_committers: "weakref.WeakSet[GroupCommitter]" = weakref.WeakSet()
+_auto_savers: "weakref.WeakSet[AutoSaver]" = weakref.WeakSet()
+atexit.register(_flushAll)
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+MIT License
+Copyright (c) 2020-2023 Chris1320
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import os
+import stat
+import secrets
+import contextlib
+from typing import IO
+from typing import Any
+from typing import Final
+from typing import Tuple
+from typing import Union
+from typing import Iterator
+from typing import Optional
+
+# The durability policies of `atomicWrite()`:
+# - `none`: The file is replaced atomically, but it may be lost or empty after a power failure.
+# - `data`: The contents of the file are flushed to the disk before it is replaced.
+# - `full`: The directory is also flushed to the disk after the file is replaced,
+#           so the new file survives a power failure once `atomicWrite()` returns.
+durability_levels: Final[Tuple[str, ...]] = ("none", "data", "full")
+
+
+class Discard(Exception):
+    """
+    Raise this in an `atomicWrite()` block to keep the old file. It is not propagated.
+    """
+
+
+def checkDurability(durability: str) -> None:
+    """
+    Raise a `ValueError` if <durability> is not a durability policy.
+    """
+
+    if durability not in durability_levels:
+        raise ValueError(f"Unsupported durability policy: {durability}")
+
+
+def sync(f: IO[Any], durability: str) -> None:
+    """
+    Flush the contents of the open file <f> to the disk if required by <durability>.
+    """
+
+    checkDurability(durability)
+    if durability != "none":
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def syncDirectory(path: str, durability: str) -> None:
+    """
+    Flush the directory entries of the directory of <path> to the disk if required by <durability>.
+    This is skipped on Windows, where directories cannot be opened.
+    """
+
+    checkDurability(durability)
+    if durability != "full" or os.name == "nt":
+        return
+
+    fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+
+    finally:
+        os.close(fd)
+
+
+def fileState(path: Union[str, int]) -> Optional[Tuple[int, int, int]]:
+    """
+    Return the modification time, size, and inode number of <path>, or None if it does not exist.
+    The file is very likely unchanged if its state is unchanged, since a replaced file has a new inode.
+
+    :param path: The path of the file, or the file descriptor of an open file.
+    """
+
+    try:
+        stat_result = os.stat(path)
+
+    except FileNotFoundError:
+        return None
+
+    return stat_result.st_mtime_ns, stat_result.st_size, stat_result.st_ino
+
+
+@contextlib.contextmanager
+def atomicWrite(path: str, mode: str = "wb", durability: str = "none", **kwargs: Any) -> Iterator[IO[Any]]:
+    """
+    Open a temporary file in the directory of <path> for writing, and replace <path> with it
+    once the block exits without errors. Readers see either the old or the new file, never
+    a partially-written one. The temporary file is removed if the block raises an exception.
+    If the exception is `Discard`, the old file is kept and the exception is not propagated.
+    If <path> is a symbolic link, its target is replaced instead.
+
+    :param path: The path of the file to write.
+    :param mode: The mode to open the temporary file in. (`w` or `wb`)
+    :param durability: The durability policy. (See `durability_levels`)
+    :param kwargs: Other arguments to `open()`.
+    """
+
+    checkDurability(durability)
+    if mode not in ("w", "wb"):
+        raise ValueError(f"Unsupported mode: {mode}")
+
+    path = os.path.realpath(path)
+    temp_path = f"{path}.{secrets.token_hex(4)}.tmp"
+    try:
+        # The temporary file is created like the file itself, so it has the default permissions.
+        with open(temp_path, mode.replace('w', 'x'), **kwargs) as f:
+            yield f
+            sync(f, durability)
+
+        if os.path.exists(path):
+            os.chmod(temp_path, stat.S_IMODE(os.stat(path).st_mode))  # Keep the permissions of the old file.
+
+        os.replace(temp_path, path)
+
+    except BaseException as error:
+        with contextlib.suppress(OSError):
+            os.remove(temp_path)
+
+        if isinstance(error, Discard):
+            return
+
+        raise
+
+    syncDirectory(path, durability)
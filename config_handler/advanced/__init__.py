@@ -26,18 +26,38 @@ SOFTWARE.
 
 import os
 import json
+import mmap
+import base64
+import codecs
+import struct
+import itertools
+import threading
 from typing import Any
+from typing import Dict
 from typing import List
 from typing import Final
+from typing import Set
 from typing import Tuple
 from typing import Union
+from typing import BinaryIO
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
 from typing import Optional
 from hashlib import blake2b
+from concurrent.futures import Future
+from concurrent.futures import ProcessPoolExecutor
 
+from config_handler import _io
+from config_handler import _background
 from config_handler import info
 from config_handler import exceptions
 from config_handler.advanced import encryption
 from config_handler.advanced import compression
+from config_handler.advanced import json_backends
+from config_handler.advanced import _index
+from config_handler.advanced import _shards
+from config_handler.advanced.compression import dictionary
 
 
 class Advanced:
@@ -45,9 +65,34 @@ class Advanced:
     A class that creates and manipulates an "advanced" configuration file.
 
     This type of configuration file uses the JSON format.
+
+    Since parser version 3, the configuration file is a binary container:
+
+    - The magic bytes (`Advanced._magic`).
+    - The length of the header, the length of the payload, and the checksum of the payload (`Advanced._prefix`).
+    - The header, a JSON object that contains the metadata of the configuration file.
+    - The payload, which is the compressed and/or encrypted JSON-encoded data.
+
+    If the configuration file is sharded, the keys are split into shards by their CRC-32,
+    and each shard is packed separately. The header then contains the shard index,
+    and the checksum in the prefix is the checksum of the checksums of the shards.
+
+    If the configuration file is indexed, the payload contains a hash table of the keys
+    so that a value can be read without decoding the rest of the payload. (See `_index`)
+
+    Configuration files made by parser version 2 (a single JSON object) can still be loaded.
     """
 
-    parser_version: Final[Tuple[int, int, int]] = (2, 5, 0)
+    parser_version: Final[Tuple[int, int, int]] = (3, 2, 0)
+    _magic: Final[bytes] = b"\x89CHA\r\n\x1a\n"
+    _prefix: Final[struct.Struct] = struct.Struct(">IQ8s")
+    _metadata_keys: Final[Tuple[str, ...]] = ("name", "author", "compression", "encryption", "encoding", "parser")
+    _legacy_header_chunk_size: Final[int] = 4096
+    _legacy_header_limit: Final[int] = 65536  # The number of characters to read before giving up on finding the metadata.
+    _chunk_size: Final[int] = 65536  # The size of the chunks of the payload that are processed at a time.
+    _encode_batch_size: Final[int] = 1024  # The number of items to encode to JSON at a time.
+    _index_block_size: Final[int] = 4096  # The size of the blocks of an indexed payload before compression.
+    # The built-in algorithms. More can be added using `compression.registry` and `encryption.registry`.
     supported_compression: Final[tuple] = (
         None,
         "zlib",
@@ -55,16 +100,29 @@ class Advanced:
     )
     supported_encryption: Final[tuple] = (
         None,
-        "aes256"
+        "aes256",
+        "aes256-gcm",
+        "aes256-gcm-chunked"
     )
 
+    secret_encryption: str = "aes256-gcm"  # The encryption algorithm of the values set using `set_secret()`.
+
+    auto_compression_threshold: int = 1024  # Payloads smaller than this are not compressed in "auto" mode.
+    auto_compression_ratio: float = 0.5  # Use the faster algorithm in "auto" mode if the sample compresses worse than this.
+
     def __init__(
         self,
         config_path: str,
         config_pass: Optional[str] = None,
         readonly: bool = False,
         strict: bool = True,
-        encoding: str = info.defaults["encoding"]
+        encoding: str = info.defaults["encoding"],
+        reuse_salt: bool = False,
+        json_backend: Optional[str] = None,
+        durability: str = info.defaults["durability"],
+        group_commit: Optional[float] = None,
+        auto_save: Optional[float] = None,
+        auto_save_max_delay: float = info.defaults["auto_save_max_delay"]
     ):
         """
         :param config_path: The path of the configuration file to open or create.
@@ -72,23 +130,97 @@ class Advanced:
         :param readonly: True if the configuration file is read-only. (Default: `False`)
         :param strict: True to check the checksum of the configuration file. (Default: `True`)
         :param encoding: The encoding to use. (Default: `info.defaults["encoding"]`)
+        :param reuse_salt: True to encrypt using the salt of the last loaded or packed payload,
+                           so that the derived encryption key is only computed once per
+                           load-modify-save cycle. A new initialization vector is still
+                           generated every time. (Default: `False`)
+        :param json_backend: The JSON backend to use (`auto`, `json`, `orjson`, or `ujson`).
+                             If None, `info.defaults["json_backend"]` is used. (Default: `None`)
+        :param durability: The durability policy when saving: `none`, `data` to flush the file to
+                           the disk before replacing the old file, or `full` to also flush the
+                           directory. (Default: `info.defaults["durability"]`)
+        :param group_commit: If not None, `save()` only requests a commit, and a background thread
+                             saves the configuration file once for every request made within
+                             this many seconds. (Default: `None`)
+        :param auto_save: If not None, save the configuration file in a background thread once it is
+                          not modified for this many seconds. (See `self.flush()`) (Default: `None`)
+        :param auto_save_max_delay: The maximum number of seconds to wait after the first unsaved
+                                    modification before auto-saving.
+                                    (Default: `info.defaults["auto_save_max_delay"]`)
 
         Read-only mode allows manipulation but not writing to the configuration file.
         """
 
         self._compression = None
+        self._compression_options: Dict[str, Any] = {}
         self._encryption = None
         self.author = None
         self.name = None
+        self.shards: Optional[int] = None  # The number of shards, or None if the payload is not sharded.
+        self.indexed = False  # True if the payload contains a key index. (See `_index`)
 
         self.config_path = config_path
         self.readonly = readonly
         self.encoding = encoding
         self.strict = strict
+        self.reuse_salt = reuse_salt
+        self.json_backend = json_backend
+        self.durability = durability
+        self.group_commit = group_commit
 
         self.__config_pass = config_pass
         self.__initialized = False  # Is `self.load()` or `self.new()` called?
+        # Decodes the payload of a lazily-loaded configuration file. (See `self.__data`)
+        self.__pending_payload: Optional[Callable[[], Dict[str, Any]]] = None
+        # Decodes a single shard of a lazily-loaded sharded configuration file, and the shards it decoded.
+        self.__shard_decoder: Optional[Callable[[int], Dict[str, Any]]] = None
+        self.__decoded_shards: Dict[int, Dict[str, Any]] = {}
+        # Reads single values of a lazily-loaded indexed configuration file.
+        self.__key_index: Optional[_index.KeyIndex] = None
+        # The keys whose values are encrypted separately (See `self.set_secret()`), and their decrypted values.
+        self.__secret_keys: Set[str] = set()
+        self.__secret_values: Dict[str, Any] = {}
+        self.__secret_salt: Optional[bytes] = None  # The salt of the last encrypted secret.
         self.__data = {}  # The configuration file contents.
+        self.__salt: Optional[bytes] = None  # The salt of the last loaded or packed payload.
+        self.__payload_compression: Optional[str] = None  # The compression algorithm of the loaded payload.
+
+        # Dirty tracking. The configuration file is dirty if it is modified since the last `load()` or `save()`.
+        # Values that are modified in-place (e.g., appending to a list value) are not tracked.
+        self.__dirty = False
+        # The checksum of the last packed payload and the properties used to pack it. (See `self.__packFormat()`)
+        self.__checksum: Optional[str] = None
+        self.__checksum_format: Optional[tuple] = None
+        # The packed shards (See `self.__packShards()`), and the properties used to pack them.
+        # A shard is None if it is modified since it was packed.
+        self.__packed_shards: List[Optional[Tuple[bytes, _shards.ShardEntry]]] = []
+        self.__packed_shards_format: Optional[tuple] = None
+        # The state of the file (See `_io.fileState()`), the format (See `self.__saveFormat()`), and the checksum
+        # of the last loaded or saved configuration file. Used to skip saves that would not change the file,
+        # and loads that would not change the data. (See `self.reload_if_changed()`)
+        self.__saved: Optional[Tuple[Optional[Tuple[int, int, int]], Optional[Tuple[str, tuple, str]], Optional[str]]] = None
+        # Incremented every time the configuration file is modified, so a commit can tell
+        # if the configuration file is modified while it is being saved.
+        self.__generation = 0
+        self.__commit_lock = threading.Lock()  # Only one thread writes the configuration file at a time.
+        self.__group_committer: Optional[_background.GroupCommitter] = None
+        self.__auto_saver: Optional[_background.AutoSaver] = None
+        if auto_save is not None:
+            if readonly:
+                raise ValueError("Auto-save is not supported in read-only mode.")
+
+            self.__auto_saver = _background.AutoSaver(self.__autoSave, auto_save, auto_save_max_delay)
+
+    def __enter__(self) -> "Advanced":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """
+        Save the unsaved modifications if auto-save is enabled,
+        and wait for the requested group commits.
+        """
+
+        self.flush()
 
     def __contains__(self, key: str) -> bool:
         """
@@ -98,7 +230,8 @@ class Advanced:
         if not self.__initialized:
             raise exceptions.ConfigFileNotInitializedError
 
-        return key in self.__data
+        shard = self.__partialData(key)
+        return key in (self.__data if shard is None else shard)
 
     def __delitem__(self, key: str) -> None:
         """
@@ -109,6 +242,7 @@ class Advanced:
             raise exceptions.ConfigFileNotInitializedError
 
         del self.__data[key]
+        self.__markDirty(key)
 
     def __setitem__(self, key: str, value: Union[str, int, float, bool, None]) -> None:
         """
@@ -125,6 +259,7 @@ class Advanced:
             raise ValueError("Key contains invalid characters.")
 
         self.__data[key] = value
+        self.__markDirty(key)
 
     def __getitem__(self, key: str) -> Union[str, int, float, bool, None]:
         """
@@ -134,7 +269,8 @@ class Advanced:
         if not self.__initialized:
             raise exceptions.ConfigFileNotInitializedError
 
-        return self.__data[key]
+        shard = self.__partialData(key)
+        return self.__reveal(key, (self.__data if shard is None else shard)[key])
 
     def __repr__(self) -> str:
         """
@@ -163,6 +299,7 @@ class Advanced:
             "author": self.author,
 
             "compression": self.compression,
+            "compression_options": self.compression_options,
             "encryption": self.encryption,
             "encoding": self.encoding,
 
@@ -170,9 +307,87 @@ class Advanced:
                 "version": self.parser_version
             },
 
+            "shards": self.shards,
+            "indexed": self.indexed,
             "dict_size": len(self.__data)
         }
 
+    @property
+    def __data(self) -> Dict[str, Any]:
+        """
+        The configuration file contents.
+
+        If the configuration file is loaded lazily, the payload is decoded on first access.
+        If decoding fails, the configuration file is uninitialized like when `load()` fails.
+        """
+
+        if self.__pending_payload is not None:
+            pending_payload = self.__pending_payload
+            self.__pending_payload = None
+            try:
+                self.__contents = pending_payload()
+
+            except Exception:
+                self.__initialized = False
+                self.__contents = {}
+                raise
+
+            finally:
+                self.__closeKeyIndex()
+
+        return self.__contents
+
+    @__data.setter
+    def __data(self, data: Dict[str, Any]):
+        # The new contents replace the payload that is not yet decoded.
+        self.__pending_payload = None
+        self.__shard_decoder = None
+        self.__decoded_shards = {}
+        self.__closeKeyIndex()
+        self.__contents = data
+
+    def __closeKeyIndex(self) -> None:
+        if self.__key_index is not None:
+            self.__key_index.close()
+            self.__key_index = None
+
+    def __partialData(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        If the configuration file is not yet decoded, decode and return only the part of the data
+        that contains <key>: its shard if the configuration file is sharded, or the key-value pair
+        itself if it is indexed. Otherwise, return None.
+        """
+
+        if self.__pending_payload is None or type(key) is not str:
+            return None
+
+        if self.__key_index is not None:
+            try:
+                return {key: self.__key_index[key]}
+
+            except KeyError:
+                return {}
+
+            except Exception:
+                self.__initialized = False
+                self.__data = {}
+                raise
+
+        if self.__shard_decoder is None:
+            return None
+
+        index = _shards.shardIndex(key, len(self.__packed_shards))
+        if index not in self.__decoded_shards:
+            try:
+                self.__decoded_shards[index] = self.__shard_decoder(index)
+
+            except Exception:
+                self.__initialized = False
+                self.__data = {}
+                raise
+
+        return self.__decoded_shards[index]
+
     @property
     def config_path(self) -> str:
         return self._config_path
@@ -191,7 +406,10 @@ class Advanced:
         Check if the compression algorithm is supported first before setting.
         """
 
-        if compression_name in self.supported_compression:
+        if compression_name == "auto":
+            self._compression = compression_name  # Choose the algorithm when saving. See `self._chooseCompression()`.
+
+        elif compression_name in self.supported_compression or compression_name in compression.registry:
             if compression.isAvailable(compression_name):
                 self._compression = compression_name
 
@@ -201,6 +419,27 @@ class Advanced:
         else:
             raise ValueError(f"Unsupported compression algorithm: {compression_name}")
 
+    @property
+    def compression_options(self) -> Dict[str, Any]:
+        """
+        The keyword arguments of the compression algorithm, such as `level`.
+        The options are ignored in "auto" mode.
+        """
+
+        return self._compression_options
+
+    @compression_options.setter
+    def compression_options(self, options: Optional[Dict[str, Any]]):
+        """
+        Check if the compression algorithm accepts the options first before setting.
+        """
+
+        options = dict(options or {})
+        if options and self.compression not in (None, "auto"):
+            compression.compressBytes(b"", self.compression, options)  # Raises an exception if the options are invalid.
+
+        self._compression_options = options
+
     @property
     def encryption(self) -> Union[str, None]:
         return self._encryption
@@ -211,8 +450,11 @@ class Advanced:
         Check if the encryption algorithm is supported first before setting.
         """
 
-        if encryption_name in self.supported_encryption:
+        if encryption_name in self.supported_encryption or encryption_name in encryption.registry:
             if encryption.isAvailable(encryption_name):
+                if encryption_name != self._encryption:
+                    self.__salt = None  # The salt of another encryption algorithm cannot be reused.
+
                 self._encryption = encryption_name
 
             else:
@@ -232,17 +474,50 @@ class Advanced:
     @config_pass.setter
     def config_pass(self, config_pass: str):
         self.__config_pass = config_pass
+        self.__checksum = None  # The payload must be packed again using the new password.
 
     @property
     def checksum(self) -> str:
         """
         Get the checksum of the configuration file data.
+
+        The checksum of the last packed payload is reused until the configuration file
+        is modified, so it matches the checksum of the file after `load()` or `save()`.
         """
 
         if not self.__initialized:
             raise exceptions.ConfigFileNotInitializedError
 
-        return self._generateChecksum(self._pack(json.dumps(self.__data)))
+        if self.__checksum is None or self.__checksum_format != self.__packFormat():
+            if self.shards:
+                self.__packed_shards = self.__packShards(self.__data)
+                self.__packed_shards_format = self.__packFormat()
+                self.__cacheChecksum(_shards.indexChecksum([entry for _, entry in self.__packed_shards]))  # type: ignore
+                return self.__checksum  # type: ignore
+
+            if self.indexed:
+                hasher = blake2b(digest_size=8)
+                for chunk in self.__packIndexed(self.__data)[1]:
+                    hasher.update(chunk)
+
+                self.__cacheChecksum(hasher.hexdigest())
+                return self.__checksum  # type: ignore
+
+            hasher = blake2b(digest_size=8)
+            for chunk in self._packStream(*self._chooseCompression(self._encodeChunks())):
+                hasher.update(chunk)
+
+            self.__cacheChecksum(hasher.hexdigest())
+
+        return self.__checksum  # type: ignore
+
+    @property
+    def is_dirty(self) -> bool:
+        """
+        Check if the configuration file is modified since the last `load()` or `save()`.
+        """
+
+        return self.__dirty
 
     @property
     def exists(self) -> bool:
@@ -256,7 +531,72 @@ class Advanced:
     def is_initialized(self) -> bool:
         return self.__initialized
 
-    def _generateChecksum(self, data: Union[str, bytes], digest_size: int = 8) -> str:
+    @property
+    def is_decoded(self) -> bool:
+        """
+        Check if the payload is decoded. This is only False after `load(lazy=True)`
+        until the data is accessed.
+        """
+
+        return self.__pending_payload is None
+
+    def __markDirty(self, key: Optional[str] = None, secret: bool = False) -> None:
+        """
+        Mark the configuration file as modified and invalidate the cached checksum.
+
+        :param key: The modified key. Only its shard is packed again when saving. If None, every shard is.
+        :param secret: True if the new value of <key> is a secret. (See `self.set_secret()`)
+        """
+
+        self.__checksum = None
+        if key is None:
+            self.__secret_keys.clear()
+            self.__secret_values.clear()
+
+        else:
+            self.__secret_values.pop(key, None)
+            if secret:
+                self.__secret_keys.add(key)
+
+            else:
+                self.__secret_keys.discard(key)  # The new value is not a secret unless it is set using `set_secret()`.
+
+        if key is None or type(key) is not str:
+            self.__packed_shards = []
+
+        elif self.__packed_shards:
+            self.__packed_shards[_shards.shardIndex(key, len(self.__packed_shards))] = None
+
+        # This is done last, so a commit that starts in the meantime keeps the configuration file dirty.
+        self.__dirty = True
+        self.__generation += 1
+        if self.__auto_saver is not None:
+            self.__auto_saver.notify()
+
+    def __cacheChecksum(self, checksum: str) -> None:
+        """
+        Cache the <checksum> of the packed payload.
+        """
+
+        self.__checksum = checksum
+        self.__checksum_format = self.__packFormat()
+
+    def __packFormat(self) -> tuple:
+        """
+        Return the properties that the packed payload depends on.
+        """
+
+        return (
+            self.compression,
+            json.dumps(self.compression_options, sort_keys=True),
+            self.encryption,
+            self.encoding,
+            self.json_backend if self.json_backend is not None else info.defaults["json_backend"],
+            self.shards,
+            self.indexed
+        )
+
+    def _generateChecksum(self, data: Union[str, bytes, memoryview], digest_size: int = 8) -> str:
         """
         Generate a BLAKE2 hash of <data>.
 
@@ -308,19 +648,194 @@ class Advanced:
 
         return type(key) is str  # The key is valid if it is a string.
 
-    def _pack(self, data: str) -> str:
+    def _encodeChunks(self, data: Optional[Dict[str, Any]] = None) -> Iterator[bytes]:
+        """
+        Encode <data> (Default: the configuration file data) to JSON incrementally using the JSON backend.
+        The items are encoded in batches of `self._encode_batch_size`, and the result is yielded
+        in chunks of about `self._chunk_size` bytes. Using the `json` backend, the result is the
+        same as `json.dumps(self.__data)`. The `json` backend is always used if the encoding
+        is not UTF-8.
+        """
+
+        transcode = not self.__isUTF8()  # The backends return UTF-8.
+        # One incremental encoder is used for the whole payload, so encodings with a BOM (e.g., UTF-16) write it once.
+        encoder = codecs.getincrementalencoder(self.encoding)() if transcode else None
+        if transcode:
+            # The other backends write non-ASCII characters as-is, which may not exist in the encoding.
+            # The `json` backend escapes them, so its output can be written in any encoding.
+            backend = json_backends.registry.get("json")
+
+        else:
+            backend = json_backends.getBackend(self.json_backend)
+
+        dumps = backend.dumps
+        item_separator = getattr(backend, "item_separator", b", ")
+        chunk_size = self._chunk_size
+        batch_size = self._encode_batch_size
+
+        fragments = [b'{']
+        size = 1
+        separator = b""  # The first batch is not preceded by a separator.
+        items = iter((self.__data if data is None else data).items())
+        while True:
+            batch = dict(itertools.islice(items, batch_size))
+            if not batch:
+                break
+
+            fragment = dumps(batch)[1:-1]  # Remove the braces so the batches can be joined.
+            fragments.append(separator)
+            fragments.append(fragment)
+            separator = item_separator
+            size += len(separator) + len(fragment)
+            if size >= chunk_size:
+                chunk = b''.join(fragments)
+                yield encoder.encode(chunk.decode("utf-8")) if encoder is not None else chunk
+                fragments = []
+                size = 0
+
+        fragments.append(b'}')
+        chunk = b''.join(fragments)
+        yield encoder.encode(chunk.decode("utf-8"), final=True) if encoder is not None else chunk
+
+    def __isUTF8(self) -> bool:
+        """
+        Check if the encoding of the configuration file is UTF-8.
+        """
+
+        return codecs.lookup(self.encoding).name == "utf-8"
+
+    def _chooseCompression(self, chunks: Iterator[bytes]) -> Tuple[Optional[str], Iterator[bytes]]:
+        """
+        Choose the compression algorithm of the payload.
+
+        In "auto" mode, payloads smaller than `self.auto_compression_threshold` are not compressed.
+        Otherwise, the first chunk is compressed using LZ4 as a sample. LZ4 is used if the sample
+        compresses worse than `self.auto_compression_ratio`, since zlib would be slower without
+        saving much space, and zlib is used otherwise. Data that does not compress is stored as-is.
+
+        :param chunks: The chunks of the payload.
+
+        :returns: The compression algorithm, and the chunks of the payload.
+        """
+
+        if self.compression != "auto":
+            return self.compression, chunks
+
+        sample = next(chunks, b"")
+        next_chunk = next(chunks, None)
+        if next_chunk is None:
+            chunks = iter((sample,))
+            if len(sample) < self.auto_compression_threshold:
+                return None, chunks
+
+        else:
+            chunks = itertools.chain((sample, next_chunk), chunks)
+
+        fast_compression = "lz4" if compression.isAvailable("lz4") else "zlib"
+        ratio = len(compression.compressBytes(sample, fast_compression)) / len(sample)
+        if ratio >= 1:
+            return None, chunks  # The data does not compress.
+
+        if ratio > self.auto_compression_ratio:
+            return fast_compression, chunks
+
+        return "zlib", chunks
+
+    def _packStream(
+        self,
+        compression_name: Optional[str],
+        chunks: Iterable[Union[bytes, memoryview]],
+        salt: Optional[bytes] = None
+    ) -> Iterator[bytes]:
+        """
+        Perform compression and encryption to the data in <chunks> if needed.
+        The packed data is yielded as soon as it is available.
+
+        :param compression_name: The compression algorithm to use. (See `self._chooseCompression()`)
+        :param chunks: The data to pack.
+        :param salt: The salt to encrypt with. If None, the salt of the last loaded or packed payload
+                     is used if `self.reuse_salt` is True, otherwise a new salt is generated.
+        """
+
+        # The compression options are only used if the algorithm is not chosen automatically.
+        compressor = compression.compressor(
+            compression_name,
+            self.compression_options if compression_name == self.compression else None
+        )
+        encryptor = encryption.encryptor(
+            self.encryption,
+            self.__config_pass,
+            salt if salt is not None else self.__salt if self.reuse_salt else None
+        )
+
+        def packed() -> Iterator[bytes]:
+            for chunk in chunks:
+                yield encryptor.update(compressor.compress(chunk))
+
+            yield encryptor.update(compressor.flush())
+            yield encryptor.finalize()
+
+        salt_found = False
+        for chunk in packed():
+            if not chunk:
+                continue
+
+            if not salt_found:
+                # The ciphertext starts with the salt.
+                self.__salt = encryption.getSalt(chunk, self.encryption)
+                salt_found = True
+
+            yield chunk
+
+    def _unpackStream(
+        self,
+        compression_name: Optional[str],
+        chunks: Iterable[Union[bytes, memoryview]]
+    ) -> Iterator[bytes]:
+        """
+        Perform decryption and decompression to the raw data in <chunks> if needed.
+        The unpacked data is yielded as soon as it is available.
+
+        The codecs are created immediately, so the algorithms and password
+        at the time of the call are used even if the data is unpacked later.
+        """
+
+        decryptor = encryption.decryptor(self.encryption, self.__config_pass)
+        decompressor = compression.decompressor(
+            compression_name,
+            self.compression_options if compression_name == self.compression else None
+        )
+
+        def unpacked() -> Iterator[bytes]:
+            for chunk in chunks:
+                yield decompressor.decompress(decryptor.update(chunk))
+
+            yield decompressor.decompress(decryptor.finalize())
+            yield decompressor.flush()
+
+        return unpacked()
+
+    def _pack(self, data: Union[bytes, memoryview]) -> bytes:
         """
         Perform compression and encryption to <data> if needed.
+
+        The codecs are chained without converting the data to text, since the
+        container stores the payload as raw bytes.
         """
 
-        data = compression.compress(data, self.compression, self.encoding)
-        data = encryption.encrypt(data, self.encryption, self.__config_pass, self.encoding)
+        return b"".join(self._packStream(*self._chooseCompression(iter((bytes(data),)))))
 
-        return data
+    def _unpack(self, data: Union[bytes, memoryview]) -> bytes:
+        """
+        Perform decryption and decompression to the raw <data> if needed.
+        """
+
+        return b"".join(self._unpackStream(self.__payload_compression, (data,)))
 
-    def _unpack(self, data: str) -> str:
+    def _unpackLegacy(self, data: str) -> str:
         """
-        Perform decryption and decompression to <data> if needed.
+        Perform decryption and decompression to the base64-encoded <data> of a configuration file
+        made by parser version 2.
         """
 
         data = encryption.decrypt(data, self.encryption, self.__config_pass, self.encoding)
@@ -328,12 +843,469 @@ class Advanced:
 
         return data
 
+    def _loadMetadata(self, header: dict) -> None:
+        """
+        Set the configuration file properties from <header>.
+        """
+
+        self.name = header["name"]
+        self.author = header["author"]
+
+        self.compression = header["compression"]
+        # The options are not validated since the preset dictionary may not be registered when only reading the metadata.
+        # They are not in files made by parser version 3.0.0 or older.
+        self._compression_options = dict(header.get("compression_options") or {})
+        self.encryption = header["encryption"]
+        self.encoding = header["encoding"]
+
+        # In "auto" mode, the header also contains the algorithm that was chosen.
+        self.__payload_compression = header.get("payload_compression", self.compression)
+        # Sharded configuration files contain the shard index. (parser version 3.2.0 or newer)
+        self.shards = len(header["shards"]) if header.get("shards") else None
+        self.indexed = bool(header.get("indexed", False))  # parser version 3.2.0 or newer
+        self.secret_encryption = header.get("secret_encryption", type(self).secret_encryption)
+        self.__secret_keys = set(header.get("secret_keys", ()))
+        self.__secret_values = {}
+
+    @classmethod
+    def _readContainerHeader(cls, f: BinaryIO) -> Tuple[dict, int, bytes]:
+        """
+        Read the header of a configuration file made by parser version 3 or newer.
+        The magic bytes must be already read from <f>.
+
+        :returns: The header, the length of the payload, and the checksum of the payload.
+        """
+
+        prefix = f.read(cls._prefix.size)
+        if len(prefix) != cls._prefix.size:
+            raise exceptions.InvalidConfigurationFileError
+
+        header_length, payload_length, checksum = cls._prefix.unpack(prefix)
+        header = f.read(header_length)
+        if len(header) != header_length:
+            raise exceptions.InvalidConfigurationFileError
+
+        return json.loads(header.decode()), payload_length, checksum
+
+    @staticmethod
+    def _parseLegacyHeader(text: str) -> Optional[dict]:
+        """
+        Parse the members of the JSON object at the start of <text> until the `data` member.
+
+        :returns: The parsed members, or None if <text> ends before the `data` member
+                  or the end of the object is reached.
+        """
+
+        decoder = json.JSONDecoder()
+        whitespace = json.decoder.WHITESPACE  # type: ignore
+        members = {}
+
+        position = whitespace.match(text, 0).end()
+        if text[position:position + 1] != '{':
+            return None
+
+        position += 1
+        while True:
+            position = whitespace.match(text, position).end()
+            if text[position:position + 1] == '}':
+                return members
+
+            try:
+                key, position = decoder.raw_decode(text, position)
+                position = whitespace.match(text, position).end()
+                if text[position:position + 1] != ':':
+                    return None
+
+                if key == "data":
+                    return members
+
+                value, position = decoder.raw_decode(text, whitespace.match(text, position + 1).end())
+
+            except json.JSONDecodeError:
+                return None  # The member is incomplete.
+
+            position = whitespace.match(text, position).end()
+            if position >= len(text):
+                return None  # The value might be incomplete.
+
+            members[key] = value
+            if text[position] == ',':
+                position += 1
+
+    @classmethod
+    def _readLegacyHeader(cls, f: BinaryIO) -> dict:
+        """
+        Read the members of a configuration file made by parser version 2 that come before its data.
+
+        Only up to `cls._legacy_header_limit` characters are read. If the metadata is not found
+        by then, the whole configuration file is parsed.
+        """
+
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        text = ""
+        while len(text) < cls._legacy_header_limit:
+            chunk = f.read(cls._legacy_header_chunk_size)
+            text += decoder.decode(chunk, final=not chunk)
+            members = cls._parseLegacyHeader(text)
+            if members is not None and all(key in members for key in cls._metadata_keys):
+                return members
+
+            if not chunk:
+                break
+
+        f.seek(0)
+        return json.loads(f.read().decode())
+
+    def _loadContainer(self, f: BinaryIO, load_meta: bool, lazy: bool = False, workers: Optional[int] = None) -> None:
+        """
+        Load a configuration file made by parser version 3 or newer.
+        The magic bytes must be already read from <f>.
+
+        If <lazy> is True, the payload is read and its checksum is verified,
+        but it is only unpacked and decoded when the data is first accessed.
+        The shards of a sharded configuration file are decoded using <workers> processes.
+        """
+
+        header, payload_length, checksum = self._readContainerHeader(f)
+        try:
+            self._loadMetadata(header)
+
+        except KeyError:
+            raise exceptions.InvalidConfigurationFileError
+
+        if load_meta:
+            return  # Do not read the payload.
+
+        if self.shards:
+            self.__loadShards(f, header["shards"], checksum, lazy, workers)
+            return
+
+        self.__packed_shards = []
+        if self.indexed:
+            self.__loadIndexed(f, payload_length, checksum, lazy)
+            return
+
+        # The authentication tag is verified while decrypting, so the payload does not need to be hashed.
+        hasher = None if encryption.isAuthenticated(self.encryption) else blake2b(digest_size=8)
+
+        if lazy:
+            self.__loadContainerLazily(f, payload_length, checksum, hasher)
+            return
+
+        chunks = self._readPayload(f, payload_length, hasher)
+        first_chunk = next(chunks, b"")
+        self.__salt = encryption.getSalt(first_chunk, self.encryption)
+
+        data = bytearray()
+        try:
+            for unpacked in self._unpackStream(self.__payload_compression, itertools.chain((first_chunk,), chunks)):
+                data += unpacked
+
+        except exceptions.InvalidConfigurationFileError:
+            raise
+
+        except Exception:
+            # The payload may have failed to unpack because it is corrupted.
+            if self.strict and hasher is not None:
+                for _ in chunks:
+                    pass  # Hash the rest of the payload.
+
+                if hasher.hexdigest() != checksum.hex():
+                    raise exceptions.ChecksumError
+
+            raise
+
+        payload_checksum = checksum.hex() if hasher is None else hasher.hexdigest()
+        if self.strict and checksum.hex() != payload_checksum:
+            raise exceptions.ChecksumError
+
+        self.__data = json_backends.decode(data, self.encoding, self.json_backend)
+        self.__cacheChecksum(payload_checksum)
+
+    def __loadContainerLazily(self, f: BinaryIO, payload_length: int, checksum: bytes, hasher: Optional[Any]) -> None:
+        """
+        Read the payload from <f> and verify its <checksum>, but defer unpacking and decoding it.
+        The payload of an authenticated encryption algorithm is only verified when it is decrypted.
+        """
+
+        payload = b"".join(self._readPayload(f, payload_length, hasher))
+        payload_checksum = checksum.hex() if hasher is None else hasher.hexdigest()
+        if self.strict and checksum.hex() != payload_checksum:
+            raise exceptions.ChecksumError
+
+        self.__salt = encryption.getSalt(payload[:self._chunk_size], self.encryption)
+
+        view = memoryview(payload)
+        unpacked = self._unpackStream(
+            self.__payload_compression,
+            (view[position:position + self._chunk_size] for position in range(0, len(view), self._chunk_size))
+        )
+        encoding = self.encoding  # The encoding may be changed before the payload is decoded.
+
+        def decode() -> Dict[str, Any]:
+            data = bytearray()
+            for chunk in unpacked:
+                data += chunk
+
+            return json_backends.decode(data, encoding, self.json_backend)
+
+        self.__data = {}
+        self.__pending_payload = decode
+        self.__cacheChecksum(payload_checksum)
+
+    def __loadShards(
+        self,
+        f: BinaryIO,
+        index: List[_shards.ShardEntry],
+        checksum: bytes,
+        lazy: bool,
+        workers: Optional[int]
+    ) -> None:
+        """
+        Read the shards in the shard <index> from <f> and decode them.
+
+        The checksum of each shard is verified when it is decoded, so a lazily-loaded
+        configuration file only reads the shards and verifies the shard index.
+        """
+
+        if self.strict and _shards.indexChecksum(index) != checksum.hex():
+            raise exceptions.ChecksumError
+
+        packed_shards = []
+        for entry in index:
+            payload = f.read(entry[0])  # type: ignore
+            if len(payload) != entry[0]:
+                raise exceptions.InvalidConfigurationFileError  # The payload is truncated.
+
+            packed_shards.append((payload, entry))
+
+        self.__salt = encryption.getSalt(packed_shards[0][0][:self._chunk_size], self.encryption)
+
+        # The properties are captured now, since they may be changed before the shards are decoded lazily.
+        # The authentication tag is verified while decrypting, so the shards do not need to be hashed.
+        verify = self.strict and not encryption.isAuthenticated(self.encryption)
+        arguments = [
+            (
+                payload,
+                entry[1] if verify else None,
+                entry[2],
+                self.compression_options if entry[2] == self.compression else None,
+                self.encryption,
+                self.__config_pass,
+                self.encoding,
+                self.json_backend
+            )
+            for payload, entry in packed_shards
+        ]
+
+        if lazy:
+            decoded_shards: Dict[int, Dict[str, Any]] = {}
+
+            def decode() -> Dict[str, Any]:
+                data = {}
+                for shard_index, shard_arguments in enumerate(arguments):
+                    if shard_index in decoded_shards:
+                        data.update(decoded_shards.pop(shard_index))  # The shard is already decoded by `get()`.
+
+                    else:
+                        data.update(_shards.decodeShard(*shard_arguments))
+
+                return data
+
+            self.__data = {}
+            self.__pending_payload = decode
+            self.__shard_decoder = lambda shard_index: _shards.decodeShard(*arguments[shard_index])
+            self.__decoded_shards = decoded_shards
+
+        elif workers is not None and workers > 1:
+            data = {}
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for shard in executor.map(_shards.decodeShard, *zip(*arguments)):
+                    data.update(shard)
+
+            self.__data = data
+
+        else:
+            data = {}
+            for shard_arguments in arguments:
+                data.update(_shards.decodeShard(*shard_arguments))
+
+            self.__data = data
+
+        self.__cacheChecksum(checksum.hex())
+        self.__packed_shards = packed_shards  # type: ignore
+        self.__packed_shards_format = self.__packFormat()
+
+    def __loadIndexed(self, f: BinaryIO, payload_length: int, checksum: bytes, lazy: bool) -> None:
+        """
+        Load an indexed configuration file.
+
+        If <lazy> is True and the configuration file is read-only, it is memory-mapped, and only
+        the checksums of the block table and of the blocks that are read are verified.
+        Otherwise, the payload is read to memory and its checksum is verified.
+        """
+
+        if lazy and self.readonly:
+            buffer: Any = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            payload_offset = f.tell()
+
+        else:
+            hasher = blake2b(digest_size=8)
+            buffer = b"".join(self._readPayload(f, payload_length, hasher))
+            payload_offset = 0
+            if self.strict and hasher.digest() != checksum:
+                raise exceptions.ChecksumError
+
+        key_index = _index.KeyIndex(
+            buffer,
+            payload_offset,
+            payload_length,
+            self.__payload_compression,
+            self.compression_options if self.__payload_compression == self.compression else None,
+            self.json_backend,
+            self.strict
+        )
+
+        if lazy:
+            self.__data = {}
+            self.__pending_payload = key_index.decode
+            self.__key_index = key_index
+
+        else:
+            self.__data = key_index.decode()
+
+        self.__cacheChecksum(checksum.hex())
+
+    def __packIndexed(self, data: Dict[str, Any]) -> Tuple[Optional[str], Iterator[bytes]]:
+        """
+        Pack <data> as the payload of an indexed configuration file.
+
+        :returns: The compression algorithm of the blocks, and the chunks of the payload.
+        """
+
+        # In "auto" mode, the algorithm is chosen using the start of the encoded data as a sample.
+        compression_name = self._chooseCompression(itertools.islice(self._encodeChunks(data), 2))[0]
+        options = self.compression_options if compression_name == self.compression else None
+        chunks = _index.packIndexed(
+            data.items(),
+            json_backends.getBackend(self.json_backend).dumps,
+            lambda block: compression.compressBytes(block, compression_name, options),
+            self._index_block_size
+        )
+
+        return compression_name, chunks
+
+    def __packShards(self, data: Dict[str, Any]) -> List[Tuple[bytes, _shards.ShardEntry]]:
+        """
+        Pack <data> as the shards of the configuration file. The shards that are not modified
+        since they were last loaded or packed are reused. The caller decides whether
+        the result is kept as `self.__packed_shards`.
+
+        :returns: Each packed shard and its entry in the shard index.
+        """
+
+        shard_count: int = self.shards  # type: ignore
+        if self.__packed_shards_format != self.__packFormat() or len(self.__packed_shards) != shard_count:
+            packed_shards: List[Optional[Tuple[bytes, _shards.ShardEntry]]] = [None] * shard_count
+
+        else:
+            packed_shards = list(self.__packed_shards)
+
+        modified = [index for index, packed_shard in enumerate(packed_shards) if packed_shard is None]
+        if modified:
+            shard_data: Dict[int, Dict[str, Any]] = {index: {} for index in modified}
+            for key, value in data.items():
+                shard = shard_data.get(_shards.shardIndex(key, shard_count))
+                if shard is not None:
+                    shard[key] = value
+
+            salt = None  # Use the same salt for every shard so the encryption key is only derived once.
+            for index in modified:
+                compression_name, chunks = self._chooseCompression(self._encodeChunks(shard_data.pop(index)))
+                payload = b"".join(self._packStream(compression_name, chunks, salt))
+                packed_shards[index] = (
+                    payload,
+                    [len(payload), blake2b(payload, digest_size=8).hexdigest(), compression_name]
+                )
+                salt = self.__salt
+
+        return packed_shards  # type: ignore
+
+    def _readPayload(self, f: BinaryIO, payload_length: int, hasher: Optional[Any] = None) -> Iterator[bytes]:
+        """
+        Read the payload from <f> in chunks of `self._chunk_size` bytes.
+
+        :param f: The configuration file, positioned at the start of the payload.
+        :param payload_length: The length of the payload.
+        :param hasher: If not None, update this hash object with the payload.
+        """
+
+        remaining = payload_length
+        while remaining > 0:
+            chunk = f.read(min(self._chunk_size, remaining))
+            if not chunk:
+                raise exceptions.InvalidConfigurationFileError  # The payload is truncated.
+
+            if hasher is not None:
+                hasher.update(chunk)
+
+            remaining -= len(chunk)
+            yield chunk
+
+    def _loadLegacyContainer(self, f: BinaryIO, load_meta: bool) -> None:
+        """
+        Load a configuration file made by parser version 2.
+
+        :param f: The configuration file.
+        :param load_meta: Load the configuration file, but do not attempt to unpack it.
+        """
+
+        # Only read the data if it is needed.
+        config = self._readLegacyHeader(f) if load_meta else json_backends.getBackend(self.json_backend).loads(f.read())
+        self.__checksum = None  # The checksum of the legacy payload is not the checksum of the current format.
+
+        # ? Decrypt
+        # ? Decompress
+        # ? Verify checksum
+        # ? json.decode() to dict
+
+        # Get configuration file properties.
+        if "parser" not in config:
+            raise NotImplementedError("Backwards compatibility to older configuration files has not yet been implemented.")
+            # TODO: The configuration file was made by an old version of ConfigHandler.
+
+        else:
+            try:
+                self._loadMetadata(config)
+
+                # Step 1: Decrypt, decompress, and load the data.
+                if not load_meta:
+                    self.__data = json_backends.getBackend(self.json_backend).loads(self._unpackLegacy(config["data"]))
+
+                if self.strict and not load_meta:
+                    # Step 2: Verify the checksum if strict.
+                    if self._checkOldConfigVersion(config["parser"]["version"], (2, 3, 0))[1] < 0:
+                        if config["checksum"] != self._generateChecksum(json.dumps(self.__data).encode(self.encoding)):
+                            # Perform old method of generating checksum if config file is created with old ConfigHandler.
+                            # NOTE: Support will be removed in the next major release.
+                            raise exceptions.ChecksumError
+
+                    else:
+                        if config["checksum"] != self._generateChecksum(config["data"]):
+                            raise exceptions.ChecksumError
+
+            except KeyError:
+                raise exceptions.InvalidConfigurationFileError
+
     def new(
         self,
         name: str = __name__,
         author: Optional[str] = None,
         compression: Optional[str] = None,
-        encryption: Optional[str] = None
+        encryption: Optional[str] = None,
+        compression_options: Optional[Dict[str, Any]] = None,
+        shards: Optional[int] = None,
+        indexed: bool = False
     ) -> None:
         """
         Create a new configuration file to <self.config_path>.
@@ -341,8 +1313,20 @@ class Advanced:
 
         :param name: The name of the configuration file. (default: <__name__>)
         :param author: The author of the configuration file. (default: None)
-        :param compression: The compression algorithm to use. (default: None)
+        :param compression: The compression algorithm to use, or "auto" to choose it when saving. (default: None)
         :param encryption: The encryption algorithm to use. (default: None)
+        :param compression_options: The keyword arguments of the compression algorithm.
+                                    zlib accepts `level` (0-9), and lz4 accepts `level` (0-16),
+                                    `block_size` (in bytes), and `acceleration`. Both accept
+                                    `dictionary`, the ID of a preset dictionary registered using
+                                    `dictionary.register()`. (default: None)
+        :param shards: Split the keys into this many shards that are packed separately, so that
+                       reading a key after `load(lazy=True)` only decodes its shard, and saving
+                       only packs the modified shards again. (default: None; not sharded)
+        :param indexed: Add a key index to the payload, so that reading a key after `load(lazy=True)`
+                        only reads and decodes the block that contains it. The configuration file
+                        is memory-mapped if it is read-only. Indexed configuration files cannot be
+                        encrypted or sharded. (default: False)
         """
 
         if self.readonly:
@@ -351,17 +1335,27 @@ class Advanced:
         self.name = name
         self.author = author
         self.compression = compression
+        self.compression_options = compression_options
         self.encryption = encryption
+        self.shards = shards
+        self.indexed = indexed
+        self.__checkLayout()
+        self.__secret_keys = set()
+        self.__secret_values = {}
 
         self.__initialized = True
         self.__data = {}
+        self.__dirty = False
+        self.__checksum = None
+        self.__packed_shards = []
+        self.__saved = None
 
         # ? I think we should not call `save()` here.
         # ? Let the user manually save it.
         # ? This also allows in-memory configuration manipulation.
         # self.save()
 
-    def load(self, load_meta: bool = False) -> None:
+    def load(self, load_meta: bool = False, lazy: bool = False, workers: Optional[int] = None) -> None:
         """
         Load the configuration file contents to memory.
         Call this method when you want to read the configuration file.
@@ -370,64 +1364,138 @@ class Advanced:
 
         :param load_meta: Load the configuration file, but do not attempt to unpack it.
                           This will keep the configuration file in uninitialized state.
+                          Only the metadata is read from the configuration file, so the
+                          checksum is not verified.
+        :param lazy: Read the payload and verify its checksum, but only decrypt, decompress,
+                     and decode it when the data is first accessed. Errors in the payload
+                     (e.g., a wrong password) are raised on first access instead.
+                     If the configuration file is sharded or indexed, only the shard or block
+                     of the accessed key is decoded by `get()`, `__getitem__()`, and `__contains__()`.
+                     Configuration files made by parser version 2 are always loaded eagerly.
+        :param workers: If the configuration file is sharded and not loaded lazily, decode the
+                        shards in this many processes. The codecs and preset dictionaries
+                        registered at runtime must also be available in the worker processes.
+                        (Default: `None`; decode the shards in this process)
         """
 
         if not self.exists:
             raise FileNotFoundError(f"Configuration file not found: {self.config_path}")
 
-        # ? Decrypt
-        # ? Decompress
-        # ? Verify checksum
-        # ? json.decode() to dict
-
         with open(self.config_path, "rb") as f:
-            # Step 1: Read the file.
-            config = json.loads(f.read().decode())
+            file_state = _io.fileState(f.fileno())
+            legacy = f.read(len(self._magic)) != self._magic
+            if not legacy:
+                self._loadContainer(f, load_meta, lazy, workers)
 
-        # Get configuration file properties.
-        if "parser" not in config:
-            raise NotImplementedError("Backwards compatibility to older configuration files has not yet been implemented.")
-            # TODO: The configuration file was made by an old version of ConfigHandler.
+            else:
+                f.seek(0)
+                self._loadLegacyContainer(f, load_meta)
+                self.__packed_shards = []
 
-        else:
-            # TODO: If there are any breaking changes to how the configuration file is read in the future, add version checks here.
-            try:
-                # Step 2: Decrypt and decompress the data.
-                self.name = config["name"]
-                self.author = config["author"]
+        if not load_meta:
+            self.__initialized = True
+            self.__dirty = False
+            # Legacy configuration files are always saved again, in the current format.
+            self.__saved = (file_state, None if legacy else self.__saveFormat(), self.__checksum)
+            if self.__auto_saver is not None:
+                self.__auto_saver.cancel()
 
-                self.compression = config["compression"]
-                self.encryption = config["encryption"]
-                self.encoding = config["encoding"]
+    def reload_if_changed(self, lazy: bool = False, workers: Optional[int] = None) -> bool:
+        """
+        Load the configuration file again if it is modified since it was last loaded or saved.
+        The file is considered modified if its modification time, size, or inode number changed.
+        Like `load()`, the unsaved modifications are discarded when it is loaded again.
 
-                # Step 3: Unpack and load the data.
-                if not load_meta:
-                    self.__data = json.loads(self._unpack(config["data"]))
+        :param lazy: See `self.load()`.
+        :param workers: See `self.load()`.
 
-                if self.strict:
-                    # Step 4: Verify the checksum if strict.
-                    if self._checkOldConfigVersion(config["parser"]["version"], (2, 3, 0))[1] < 0:
-                        if config["checksum"] != self._generateChecksum(json.dumps(self.__data).encode(self.encoding)):
-                            # Perform old method of generating checksum if config file is created with old ConfigHandler.
-                            # NOTE: Support will be removed in the next major release.
-                            raise exceptions.ChecksumError
+        :returns: True if the configuration file is loaded again.
+        """
 
-                    else:
-                        if config["checksum"] != self._generateChecksum(config["data"]):
-                            raise exceptions.ChecksumError
+        if self.__saved is not None and self.__saved[0] is not None and self.__saved[0] == _io.fileState(self.config_path):
+            return False
+
+        self.load(lazy=lazy, workers=workers)
+        return True
+
+    @classmethod
+    def read_metadata(cls, paths: Iterable[str]) -> Dict[str, dict]:
+        """
+        Read the metadata of configuration files without reading their data.
+
+        :param paths: The paths of the configuration files.
+
+        :returns: A dictionary of each path and the metadata of its configuration file
+                  (`name`, `author`, `compression`, `encryption`, `encoding`, and `parser`).
+        """
+
+        metadata = {}
+        for path in paths:
+            with open(path, "rb") as f:
+                if f.read(len(cls._magic)) == cls._magic:
+                    header = cls._readContainerHeader(f)[0]
+
+                else:
+                    f.seek(0)
+                    header = cls._readLegacyHeader(f)
+
+            try:
+                metadata[path] = {key: header[key] for key in cls._metadata_keys}
 
             except KeyError:
                 raise exceptions.InvalidConfigurationFileError
 
-        if not load_meta:
-            self.__initialized = True
+        return metadata
 
-    def save(self) -> None:
+    @classmethod
+    def train_dictionary(
+        cls,
+        paths: Iterable[str],
+        config_pass: Optional[str] = None,
+        size: int = dictionary.default_size
+    ) -> bytes:
+        """
+        Build a preset compression dictionary from a sample of existing configuration files.
+        Register the result using `dictionary.register()`, and store it
+        somewhere so it can be registered again before loading the configuration files.
+
+        :param paths: The paths of the sample configuration files.
+        :param config_pass: The password of the sample configuration files, if they are encrypted.
+        :param size: The maximum size of the dictionary in bytes.
+
+        :returns: The contents of the dictionary.
+        """
+
+        samples = []
+        for path in paths:
+            config = cls(path, config_pass, readonly=True)
+            config.load()
+            samples.append(b"".join(config._encodeChunks()))
+
+        return dictionary.train(samples, size)
+
+    def save(self, wait: bool = True) -> Optional[Future]:
         """
         Save the configuration file to <self.config_path>.
         This method raises a `PermissionError` if the configuration file is read-only.
         This method raises a `ConfigFileNotInitializedError` if the configuration file is
         not initialized.
+
+        The configuration file is written to a temporary file first, which then replaces it,
+        so readers never see a partially-written configuration file. (See `self.durability`)
+
+        Nothing is written if the configuration file is not modified since the last `load()` or
+        `save()` and the file is not modified by others in the meantime, or if the new payload
+        is the same as the payload in the file.
+
+        If `self.group_commit` is not None, a commit is requested instead, and a background
+        thread saves the configuration file once for every request made within the window.
+        (See `_background.GroupCommitter`)
+
+        :param wait: If False, return a future that is resolved when the group commit finishes
+                     instead of waiting for it. Ignored if `self.group_commit` is None. (Default: `True`)
+
+        :returns: The future of the group commit if <wait> is False, otherwise None.
         """
 
         # Check if the configuration file is not initialized or is read-only.
@@ -438,36 +1506,274 @@ class Advanced:
         if not self.__initialized:
             raise exceptions.ConfigFileNotInitializedError
 
-        # ? dict to json.encode()
-        # ? Generate checksum
-        # ? Compress
-        # ? Encrypt
+        self.__checkLayout()
+        if self.group_commit is None:
+            self.__commit(snapshot=False)
+            return None
+
+        if self.__group_committer is None:
+            self.__group_committer = _background.GroupCommitter(self.__commit, self.group_commit)
+
+        self.__group_committer.window = self.group_commit
+        future = self.__group_committer.submit()
+        if not wait:
+            return future
+
+        future.result()
+        return None
+
+    def flush(self) -> None:
+        """
+        Wait until the requested group commits finish (See `self.save()`), then save the
+        modifications that are not yet auto-saved and wait until they are saved.
+
+        This is also done when the interpreter exits, and when leaving a `with` block.
+        If a group commit failed, its exception is raised. If a background save failed,
+        the save is retried and its exception is raised.
+        """
+
+        if self.__group_committer is not None:
+            self.__group_committer.flush()
+
+        if self.__auto_saver is not None:
+            self.__auto_saver.flush()
+
+    def __autoSave(self) -> None:
+        """
+        Save the configuration file if it is still modified. This is called by the auto-saver.
+        """
+
+        if self.__dirty:
+            self.__checkLayout()
+            self.__commit()
+
+    def __commit(self, snapshot: bool = True) -> None:
+        """
+        Write the configuration file.
+
+        :param snapshot: True to write a copy of the data taken when the commit starts, so that
+                         other threads can modify the configuration file while it is written.
+                         The configuration file stays dirty if it is modified in the meantime.
+        """
+
+        with self.__commit_lock:
+            if not self.__dirty and self.__isSaved() and not self.__hasMutableValues():
+                return  # Nothing changed since the last load or save.
+
+            generation = self.__generation
+            data = dict(self.__data) if snapshot else self.__data
+            if self.shards:
+                self.__saveShards(data, generation)
+                return
+
+            # ? dict to json.encode()
+            # ? Compress
+            # ? Encrypt
+            # ? Generate checksum
+
+            # Step 1: Create the header.
+            if self.indexed:
+                payload_compression, chunks = self.__packIndexed(data)
+
+            else:
+                payload_compression, chunks = self._chooseCompression(self._encodeChunks(data))
+
+            header_data = self.__headerData()
+            if self.compression == "auto":
+                header_data["payload_compression"] = payload_compression
+
+            if self.indexed:
+                header_data["indexed"] = True
+
+            header = json.dumps(header_data).encode()
+
+            with _io.atomicWrite(self.config_path, "wb", self.durability) as f:
+                # The payload length and checksum are only known after the payload is written,
+                # so the prefix is written again at the end.
+                f.write(self._magic)
+                f.write(self._prefix.pack(len(header), 0, bytes(8)))
+                f.write(header)
+
+                # Step 2: Convert dictionary to JSON, compress and encrypt it, and write it in chunks.
+                # Step 3: Generate checksum of the data.
+                hasher = blake2b(digest_size=8)
+                payload_length = 0
+                for chunk in chunks if self.indexed else self._packStream(payload_compression, chunks):
+                    f.write(chunk)
+                    hasher.update(chunk)
+                    payload_length += len(chunk)
+
+                if self.__isSaved(hasher.hexdigest()):
+                    raise _io.Discard  # The file already contains the same payload.
+
+                f.seek(len(self._magic))
+                f.write(self._prefix.pack(len(header), payload_length, hasher.digest()))
+
+            self.__payload_compression = payload_compression
+            self.__saved = (_io.fileState(self.config_path), self.__saveFormat(), hasher.hexdigest())
+            if generation == self.__generation:
+                self.__cacheChecksum(hasher.hexdigest())
+                self.__packed_shards = []
+                self.__dirty = False
+
+    def __saveFormat(self) -> Tuple[str, tuple, str]:
+        """
+        Return the properties that the saved configuration file depends on, other than its data.
+        """
+
+        return self.config_path, self.__packFormat(), json.dumps(self.__headerData(), sort_keys=True)
+
+    def __isSaved(self, checksum: Optional[str] = None) -> bool:
+        """
+        Check if the configuration file is unchanged since it was last loaded or saved,
+        and if it was written using the current properties.
+
+        :param checksum: If not None, also check if the file contains a payload with this checksum.
+        """
+
+        if self.__saved is None:
+            return False
+
+        file_state, save_format, saved_checksum = self.__saved
+        if checksum is not None and checksum != saved_checksum:
+            return False
+
+        return file_state is not None and file_state == _io.fileState(self.config_path) and save_format == self.__saveFormat()
+
+    def __hasMutableValues(self) -> bool:
+        """
+        Check if a decoded value is a list or a dictionary. Their in-place modifications
+        are not tracked, so the configuration file is saved even if it is not dirty.
+        """
+
+        if self.__pending_payload is not None or self.shards:
+            return False  # The unchanged shards and payloads that are not decoded are not packed again.
+
+        return not {list, dict}.isdisjoint(map(type, self.__contents.values()))
+
+    def __checkLayout(self) -> None:
+        """
+        Check if the layout of the payload can be used with the other properties of the configuration file.
+        """
+
+        if self.shards is not None and (type(self.shards) is not int or self.shards < 1):
+            raise ValueError("The number of shards must be a positive integer.")
 
-        # Step 1: Convert dictionary to JSON.
-        dictionary: str = self._pack(json.dumps(self.__data))
+        if self.indexed and self.shards:
+            raise ValueError("Indexed configuration files cannot be sharded.")
 
-        # Step 2: Create the JSON data.
-        # Step 3: Generate checksum of the data.
-        # Step 4: Compress and encrypt the data.
-        to_write = {
+        if self.indexed and self.encryption is not None:
+            raise ValueError("Indexed configuration files cannot be encrypted, since the key index is not encrypted.")
+
+    def __headerData(self) -> Dict[str, Any]:
+        """
+        Return the metadata to write to the header of the configuration file.
+        """
+
+        header_data = {
             "name": self.name,
             "author": self.author,
 
             "compression": self.compression,
+            "compression_options": self.compression_options,
             "encryption": self.encryption,
             "encoding": self.encoding,
 
             "parser": {
                 "version": self.parser_version
-            },
-
-            "checksum": self._generateChecksum(dictionary),
-            "data": dictionary
+            }
         }
+        if self.__secret_keys:
+            header_data["secret_keys"] = sorted(self.__secret_keys)
+            header_data["secret_encryption"] = self.secret_encryption
+
+        return header_data
+
+    def __saveShards(self, data: Dict[str, Any], generation: int) -> None:
+        """
+        Save <data> as a sharded configuration file. Only the modified shards are packed again.
+
+        :param generation: `self.__generation` when <data> was taken.
+        """
+
+        packed_shards = self.__packShards(data)
+        index = [entry for _, entry in packed_shards]
+        checksum = _shards.indexChecksum(index)
+        header_data = self.__headerData()
+        header_data["shards"] = index
+        header = json.dumps(header_data).encode()
+
+        if not self.__isSaved(checksum):  # Otherwise, the file already contains the same shards.
+            with _io.atomicWrite(self.config_path, "wb", self.durability) as f:
+                f.write(self._magic)
+                f.write(self._prefix.pack(len(header), sum(entry[0] for entry in index), bytes.fromhex(checksum)))  # type: ignore
+                f.write(header)
+                for payload, _ in packed_shards:
+                    f.write(payload)
+
+            self.__saved = (_io.fileState(self.config_path), self.__saveFormat(), checksum)
+
+        if generation == self.__generation:  # Otherwise, some of the packed shards are outdated.
+            self.__packed_shards = packed_shards  # type: ignore
+            self.__packed_shards_format = self.__packFormat()
+            self.__cacheChecksum(checksum)
+            self.__dirty = False
+
+    def __reveal(self, key: str, value: Any) -> Any:
+        """
+        Return the decrypted value if <key> is a secret, otherwise return <value>.
+        The decrypted values are cached.
+        """
+
+        if key not in self.__secret_keys:
+            return value
+
+        if key not in self.__secret_values:
+            plaintext = encryption.decryptBytes(base64.b64decode(value), self.secret_encryption, self.__config_pass)
+            self.__secret_values[key] = json_backends.decode(plaintext, "utf-8", self.json_backend)
+
+        return self.__secret_values[key]
+
+    def set_secret(self, key: str, value: Any) -> None:
+        """
+        Set the value of <key> to <value>, encrypted separately from the other values using
+        `self.secret_encryption` and the configuration file password.
 
-        with open(self.config_path, "wb") as f:
-            # Step 5: Write to file.
-            f.write(json.dumps(to_write).encode())
+        The other values can be read without decrypting the secrets, and the secrets are only
+        decrypted when they are accessed. The secrets share the same salt, so the encryption
+        key is only derived once. The keys of the secrets are not encrypted.
+        """
+
+        if not self.__initialized:
+            raise exceptions.ConfigFileNotInitializedError
+
+        if not self._parseKey(key):
+            raise ValueError("Key contains invalid characters.")
+
+        if not encryption.isAvailable(self.secret_encryption):
+            raise NotImplementedError(f"The encryption feature {self.secret_encryption} is not found or unavailable.")
+
+        ciphertext = encryption.encryptBytes(
+            json_backends.getBackend(self.json_backend).dumps(value),
+            self.secret_encryption,
+            self.__config_pass,
+            self.__secret_salt
+        )
+        self.__secret_salt = encryption.getSalt(ciphertext, self.secret_encryption)
+
+        self.__data[key] = base64.b64encode(ciphertext).decode("ascii")
+        self.__markDirty(key, secret=True)
+        self.__secret_values[key] = value
+
+    def is_secret(self, key: str) -> bool:
+        """
+        Check if the value of <key> is set using `self.set_secret()`.
+        """
+
+        if not self.__initialized:
+            raise exceptions.ConfigFileNotInitializedError
+
+        return key in self.__secret_keys
 
     def setdefault(self, key: str, default: Any = None) -> Any:
         """
@@ -483,7 +1789,10 @@ class Advanced:
         if not self._parseKey(key):
             raise ValueError("Key contains invalid characters.")
 
-        return self.__data.setdefault(key, default)
+        if key not in self.__data:
+            self.__markDirty(key)
+
+        return self.__reveal(key, self.__data.setdefault(key, default))
 
     def set(self, key: str, value: Union[str, int, float, bool, None]) -> None:
         """
@@ -497,6 +1806,7 @@ class Advanced:
             raise ValueError("Key contains invalid characters.")
 
         self.__data[key] = value
+        self.__markDirty(key)
 
     def get(self, key: str, default: Any = None) -> Any:
         """
@@ -506,7 +1816,12 @@ class Advanced:
         if not self.__initialized:
             raise exceptions.ConfigFileNotInitializedError
 
-        return self.__data.get(key, default)
+        shard = self.__partialData(key)
+        data = self.__data if shard is None else shard
+        if key not in data:
+            return default
+
+        return self.__reveal(key, data[key])
 
     def remove(self, key: str) -> None:
         """
@@ -514,6 +1829,7 @@ class Advanced:
         """
 
         del self.__data[key]
+        self.__markDirty(key)
 
     def pop(self, key: str, default: Any = None) -> Any:
         """
@@ -523,7 +1839,13 @@ class Advanced:
         if not self.__initialized:
             raise exceptions.ConfigFileNotInitializedError
 
-        return self.__data.pop(key, default)
+        if key not in self.__data:
+            return default
+
+        value = self.__reveal(key, self.__data.pop(key))
+        self.__markDirty(key)
+
+        return value
 
     def popitem(self) -> Tuple[str, Any]:
         """
@@ -533,7 +1855,11 @@ class Advanced:
         if not self.__initialized:
             raise exceptions.ConfigFileNotInitializedError
 
-        return self.__data.popitem()
+        key, value = self.__data.popitem()
+        value = self.__reveal(key, value)
+        self.__markDirty(key)
+
+        return key, value
 
     def items(self) -> List[Tuple[str, Any]]:
         """
@@ -543,7 +1869,10 @@ class Advanced:
         if not self.__initialized:
             raise exceptions.ConfigFileNotInitializedError
 
-        return list(self.__data.items())
+        if not self.__secret_keys:
+            return list(self.__data.items())
+
+        return [(key, self.__reveal(key, value)) for key, value in self.__data.items()]
 
     def keys(self) -> List[str]:
         """
@@ -563,7 +1892,10 @@ class Advanced:
         if not self.__initialized:
             raise exceptions.ConfigFileNotInitializedError
 
-        return list(self.__data.values())
+        if not self.__secret_keys:
+            return list(self.__data.values())
+
+        return [self.__reveal(key, value) for key, value in self.__data.items()]
 
     def clear(self) -> None:
         """
@@ -574,3 +1906,4 @@ class Advanced:
             raise exceptions.ConfigFileNotInitializedError
 
         self.__data.clear()
+        self.__markDirty()
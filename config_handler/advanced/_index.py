@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+MIT License
+Copyright (c) 2020-2023 Chris1320
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import struct
+from array import array
+from typing import Any
+from typing import Dict
+from typing import Final
+from typing import Tuple
+from typing import Union
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+from hashlib import blake2b
+
+from config_handler import exceptions
+from config_handler.advanced import compression
+from config_handler.advanced import json_backends
+
+# The payload of an indexed configuration file contains:
+#
+# - The blocks. Each block is a run of JSON-encoded key-value pairs (e.g., `"foo":"bar","nums":123`),
+#   compressed separately.
+# - The block table. It contains the offset, length, and checksum of each packed block.
+# - The hash table. Each slot contains the hash of a key, the block that contains the key,
+#   and the offset and length of the key-value pair in the unpacked block.
+#   Empty slots have a length of 0.
+# - The trailer. It contains the offset of the block table, the number of blocks,
+#   the number of slots of the hash table, and the checksum of the block table,
+#   the hash table, and the other fields of the trailer. (See `tablesChecksum()`)
+#
+# The key-value pairs are always encoded in UTF-8.
+_block_entry: Final[struct.Struct] = struct.Struct(">QI8s")
+_slot: Final[struct.Struct] = struct.Struct(">QIII")
+_trailer: Final[struct.Struct] = struct.Struct(">QIQ8s")
+_trailer_fields: Final[struct.Struct] = struct.Struct(">QIQ")  # The trailer without the checksum.
+
+
+def keyHash(key: str) -> int:
+    """
+    Get the hash of <key> that is stored in the hash table.
+    """
+
+    return int.from_bytes(blake2b(key.encode("utf-8", "surrogatepass"), digest_size=8).digest(), "big")
+
+
+def tablesChecksum(block_table: bytes, table: bytes, block_table_offset: int, block_count: int, capacity: int) -> bytes:
+    """
+    Get the checksum of the block table, the hash table, and the other fields of the trailer.
+    """
+
+    hasher = blake2b(block_table, digest_size=8)
+    hasher.update(table)
+    hasher.update(_trailer_fields.pack(block_table_offset, block_count, capacity))
+    return hasher.digest()
+
+
+def packIndexed(
+    items: Iterable[Tuple[str, Any]],
+    dumps: Callable[[Any], bytes],
+    pack_block: Callable[[bytes], bytes],
+    block_size: int
+) -> Iterator[bytes]:
+    """
+    Encode and pack <items> to the payload of an indexed configuration file.
+    The payload is yielded as soon as it is available.
+
+    :param items: The key-value pairs.
+    :param dumps: Encodes an object to UTF-8 JSON.
+    :param pack_block: Compresses a block.
+    :param block_size: Start a new block when it is at least this long.
+    """
+
+    # The location of each key-value pair. No Python object is kept per key.
+    hashes = array('Q')
+    blocks = array('I')
+    offsets = array('I')
+    lengths = array('I')
+    block_table = bytearray()
+    position = 0  # The offset of the next block in the payload.
+
+    records = []
+    size = 0
+    for key, value in items:
+        record = dumps({key: value})[1:-1]  # Remove the braces so the records can be joined.
+        hashes.append(keyHash(key))
+        blocks.append(len(block_table) // _block_entry.size)
+        offsets.append(size)
+        lengths.append(len(record))
+        records.append(record)
+        size += len(record) + 1  # The records are separated by commas.
+        if size >= block_size:
+            block = pack_block(b','.join(records))
+            block_table += _block_entry.pack(position, len(block), blake2b(block, digest_size=8).digest())
+            position += len(block)
+            yield block
+            records = []
+            size = 0
+
+    if records:
+        block = pack_block(b','.join(records))
+        block_table += _block_entry.pack(position, len(block), blake2b(block, digest_size=8).digest())
+        position += len(block)
+        yield block
+
+    yield bytes(block_table)
+
+    capacity = 8
+    while capacity * 3 < len(hashes) * 4:  # Keep the load factor at 0.75 or lower.
+        capacity *= 2
+
+    mask = capacity - 1
+    table = bytearray(capacity * _slot.size)
+    for entry in range(len(hashes)):
+        slot = hashes[entry] & mask
+        while _slot.unpack_from(table, slot * _slot.size)[3] != 0:  # Linear probing
+            slot = (slot + 1) & mask
+
+        _slot.pack_into(table, slot * _slot.size, hashes[entry], blocks[entry], offsets[entry], lengths[entry])
+
+    block_count = len(block_table) // _block_entry.size
+    yield bytes(table)
+    yield _trailer.pack(position, block_count, capacity, tablesChecksum(block_table, table, position, block_count, capacity))
+
+
+class KeyIndex:
+    """
+    Read the values of an indexed configuration file without decoding the rest of its payload.
+
+    The payload can be in memory or memory-mapped, so looking up a key only reads
+    its slot in the hash table and the block that contains it.
+    """
+
+    def __init__(
+        self,
+        buffer: Any,
+        payload_offset: int,
+        payload_length: int,
+        compression_name: Optional[str],
+        compression_options: Optional[Dict[str, Any]],
+        json_backend: Optional[str],
+        strict: bool
+    ):
+        """
+        :param buffer: The configuration file or its payload. (e.g., `bytes` or `mmap.mmap`)
+        :param payload_offset: The offset of the payload in <buffer>.
+        :param payload_length: The length of the payload.
+        :param compression_name: The compression algorithm of the blocks.
+        :param compression_options: The compression options of the blocks.
+        :param json_backend: The JSON backend to decode the key-value pairs with.
+        :param strict: True to verify the checksums of the tables and the blocks.
+        """
+
+        self._buffer = buffer
+        self._offset = payload_offset
+        self._compression_name = compression_name
+        self._compression_options = compression_options
+        self._backend = json_backends.getBackend(json_backend)
+        self._strict = strict
+        self._cached_block: Tuple[int, bytes] = (-1, b"")  # The last unpacked block.
+
+        if payload_length < _trailer.size:
+            raise exceptions.InvalidConfigurationFileError
+
+        block_table_offset, self._block_count, self._capacity, checksum = _trailer.unpack_from(
+            buffer,
+            payload_offset + payload_length - _trailer.size
+        )
+        self._block_table = payload_offset + block_table_offset
+        self._table = self._block_table + self._block_count * _block_entry.size
+        if self._table + self._capacity * _slot.size + _trailer.size != payload_offset + payload_length:
+            raise exceptions.InvalidConfigurationFileError
+
+        if strict:
+            table_end = self._table + self._capacity * _slot.size
+            tables_checksum = tablesChecksum(
+                buffer[self._block_table:self._table],
+                buffer[self._table:table_end],
+                block_table_offset,
+                self._block_count,
+                self._capacity
+            )
+            if tables_checksum != checksum:
+                raise exceptions.ChecksumError
+
+    def __contains__(self, key: str) -> bool:
+        try:
+            self[key]
+
+        except KeyError:
+            return False
+
+        return True
+
+    def __getitem__(self, key: str) -> Any:
+        """
+        Get the value of <key>.
+        """
+
+        if type(key) is not str:
+            raise KeyError(key)
+
+        key_hash = keyHash(key)
+        mask = self._capacity - 1
+        slot = key_hash & mask
+        while True:
+            slot_hash, block, offset, length = _slot.unpack_from(self._buffer, self._table + slot * _slot.size)
+            if length == 0:
+                raise KeyError(key)
+
+            if slot_hash == key_hash:
+                # Different keys may have the same hash, so the key of the pair is checked.
+                pair = self._backend.loads(b'{' + self._block(block)[offset:offset + length] + b'}')
+                if key in pair:
+                    return pair[key]
+
+            slot = (slot + 1) & mask  # Linear probing
+
+    def _block(self, block: int) -> bytes:
+        """
+        Read, verify, and unpack <block>.
+        """
+
+        if self._cached_block[0] == block:
+            return self._cached_block[1]
+
+        position, length, checksum = _block_entry.unpack_from(self._buffer, self._block_table + block * _block_entry.size)
+        packed = self._buffer[self._offset + position:self._offset + position + length]
+        if self._strict and blake2b(packed, digest_size=8).digest() != checksum:
+            raise exceptions.ChecksumError
+
+        data = compression.decompressBytes(packed, self._compression_name, self._compression_options)
+        self._cached_block = (block, data)
+        return data
+
+    def decode(self) -> Dict[str, Any]:
+        """
+        Decode every key-value pair in the payload.
+        """
+
+        data: Dict[str, Any] = {}
+        for block in range(self._block_count):
+            data.update(self._backend.loads(b'{' + self._block(block) + b'}'))
+
+        self._cached_block = (-1, b"")
+        return data
+
+    def close(self) -> None:
+        """
+        Close the memory map of the configuration file, if any.
+        """
+
+        close: Union[Callable[[], None], None] = getattr(self._buffer, "close", None)
+        if close is not None:
+            close()
+
+        self._buffer = b""
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+MIT License
+Copyright (c) 2020-2023 Chris1320
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Union
+from importlib import metadata
+
+
+class CodecRegistry:
+    """
+    Map algorithm names to codec objects.
+
+    A codec is any object (usually a module) with an `available` attribute and the
+    functions required by its kind, such as `compress()` and `decompress()` for
+    compression codecs. Codecs are registered internally using `register()`, or by
+    other packages using the entry point group given to the registry.
+    """
+
+    def __init__(self, kind: str, entry_point_group: str):
+        """
+        :param kind: The kind of the codecs in the registry. (e.g., "compression algorithm")
+        :param entry_point_group: The entry point group where other packages register their codecs.
+        """
+
+        self.kind = kind
+        self.entry_point_group = entry_point_group
+
+        self.__codecs: Dict[str, Any] = {}
+        self.__availability: Dict[str, bool] = {}  # The cached `available` flag of each codec.
+        self.__entry_points_loaded = False
+
+    def __contains__(self, name: Union[str, None]) -> bool:
+        if name is None:
+            return True  # `None` means that the data is not modified.
+
+        self.__loadEntryPoints()
+        return name in self.__codecs
+
+    def __loadEntryPoints(self) -> None:
+        """
+        Register the codecs of the installed packages. This is only done once.
+        """
+
+        if self.__entry_points_loaded:
+            return
+
+        self.__entry_points_loaded = True
+        for entry_point in metadata.entry_points(group=self.entry_point_group):
+            if entry_point.name in self.__codecs:
+                continue  # Internal codecs cannot be replaced by entry points.
+
+            try:
+                self.register(entry_point.name, entry_point.load())
+
+            except Exception:
+                self.__availability[entry_point.name] = False  # Keep the name so the user knows it exists.
+                self.__codecs[entry_point.name] = None
+
+    def register(self, name: str, codec: Any, replace: bool = False) -> None:
+        """
+        Register <codec> as <name>.
+
+        :param name: The name of the algorithm.
+        :param codec: The codec object.
+        :param replace: Replace the codec if <name> is already registered.
+        """
+
+        if name in self.__codecs and not replace:
+            raise ValueError(f"The {self.kind} {name} is already registered.")
+
+        self.__codecs[name] = codec
+        self.__availability[name] = bool(getattr(codec, "available", False))
+
+    def unregister(self, name: str) -> None:
+        """
+        Remove <name> from the registry.
+        """
+
+        self.__codecs.pop(name, None)
+        self.__availability.pop(name, None)
+
+    def get(self, name: str) -> Any:
+        """
+        Return the codec of <name>.
+        """
+
+        if name not in self or self.__codecs[name] is None:
+            raise ValueError(f"Unsupported {self.kind}: {name}")
+
+        return self.__codecs[name]
+
+    def isAvailable(self, name: Union[str, None]) -> bool:
+        """
+        Check if the codec of <name> is available in the user's machine.
+        """
+
+        if name is None:
+            return True
+
+        if name not in self:
+            raise ValueError(f"Unsupported {self.kind}: {name}")
+
+        return self.__availability[name]
+
+    def names(self) -> List[str]:
+        """
+        Return the names of the registered algorithms.
+        """
+
+        self.__loadEntryPoints()
+        return list(self.__codecs)
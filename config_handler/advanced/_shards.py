@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+MIT License
+Copyright (c) 2020-2023 Chris1320
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import zlib
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Union
+from typing import Optional
+from hashlib import blake2b
+
+from config_handler import exceptions
+from config_handler.advanced import encryption
+from config_handler.advanced import compression
+from config_handler.advanced import json_backends
+
+# An entry of the shard index: the length of the packed shard, its checksum, and its compression algorithm.
+ShardEntry = List[Union[int, str, None]]
+
+
+def shardIndex(key: str, shards: int) -> int:
+    """
+    Get the index of the shard that contains <key>.
+    CRC-32 is used instead of `hash()` since the result must be the same in every process.
+    """
+
+    return zlib.crc32(key.encode("utf-8", "surrogatepass")) % shards
+
+
+def indexChecksum(index: List[ShardEntry]) -> str:
+    """
+    Generate the checksum of a sharded payload from the checksums of its shards in the shard <index>.
+    """
+
+    return blake2b(b"".join(bytes.fromhex(entry[1]) for entry in index), digest_size=8).hexdigest()  # type: ignore
+
+
+def decodeShard(
+    payload: bytes,
+    checksum: Optional[str],
+    compression_name: Optional[str],
+    compression_options: Optional[Dict[str, Any]],
+    encryption_name: Optional[str],
+    config_pass: Optional[str],
+    encoding: str,
+    json_backend: Optional[str]
+) -> Dict[str, Any]:
+    """
+    Verify, decrypt, decompress, and decode a packed shard.
+    This is a module-level function so that it can be run by a `ProcessPoolExecutor`.
+
+    :param payload: The packed shard.
+    :param checksum: The expected checksum of <payload>, or None to skip verifying it.
+
+    :returns: The key-value pairs in the shard.
+    """
+
+    if checksum is not None and blake2b(payload, digest_size=8).hexdigest() != checksum:
+        raise exceptions.ChecksumError
+
+    data = compression.decompressBytes(
+        encryption.decryptBytes(payload, encryption_name, config_pass),
+        compression_name,
+        compression_options
+    )
+
+    return json_backends.decode(data, encoding, json_backend)
@@ -25,12 +25,42 @@ SOFTWARE.
 """
 
 import base64
+from typing import Any
+from typing import Dict
+from typing import List
 from typing import Union
-from importlib import import_module
+from typing import Optional
 
 from config_handler import info
+from config_handler.advanced._registry import CodecRegistry
 from config_handler.advanced.compression import lz4
 from config_handler.advanced.compression import zlib
+from config_handler.advanced.compression import dictionary
+
+# Other packages can add compression algorithms using the `config_handler.compression` entry point group.
+registry = CodecRegistry("compression algorithm", "config_handler.compression")
+registry.register("zlib", zlib)
+registry.register("lz4", lz4)
+
+
+def _codecOptions(options: Optional[Dict[str, Any]], decompress: bool = False) -> Dict[str, Any]:
+    """
+    Convert the compression options to the keyword arguments of a codec.
+    The `dictionary` option is replaced by the `zdict` argument containing the preset dictionary.
+
+    :param options: The compression options.
+    :param decompress: Only return the arguments needed to decompress the data.
+    """
+
+    options = dict(options or {})
+    dictionary_id = options.pop("dictionary", None)
+    if decompress:
+        options = {}  # Only the preset dictionary is needed to decompress the data.
+
+    if dictionary_id is not None:
+        options["zdict"] = dictionary.get(dictionary_id)
+
+    return options
 
 
 def isAvailable(compression_name: Union[str, None]) -> bool:
@@ -38,12 +68,127 @@ def isAvailable(compression_name: Union[str, None]) -> bool:
     Check if <compression_name> is available in the user's machine.
     """
 
-    if compression_name is None:
-        return True  # This means that no compression is needed.
+    return registry.isAvailable(compression_name)
+
+
+def compressBytes(data: bytes, algorithm: Union[str, None], options: Optional[Dict[str, Any]] = None) -> bytes:
+    """
+    Compress <data> using <algorithm>.
+    Return the raw compressed data.
+
+    :param options: The keyword arguments of the codec, such as the compression level.
+    """
+
+    if algorithm is None:
+        return data  # Do not modify the data.
+
+    return registry.get(algorithm).compress(data, **_codecOptions(options))
+
+
+def decompressBytes(data: bytes, algorithm: Union[str, None], options: Optional[Dict[str, Any]] = None) -> bytes:
+    """
+    Decompress the raw compressed <data> using <algorithm>.
+
+    :param options: The compression options that <data> is compressed with.
+    """
+
+    if algorithm is None:
+        return data
+
+    return registry.get(algorithm).decompress(data, **_codecOptions(options, decompress=True))
+
+
+class _Passthrough:
+    """
+    A streaming codec that does not modify the data.
+    """
+
+    def compress(self, data: bytes) -> bytes:
+        return data
 
-    parent_import_path = "config_handler.advanced.compression"
+    def decompress(self, data: bytes) -> bytes:
+        return data
 
-    return getattr(import_module(f"{parent_import_path}.{compression_name}"), "available")
+    def flush(self) -> bytes:
+        return b""
+
+
+class _BufferedCompressor:
+    """
+    Collect the data and compress it all at once using a codec that cannot compress incrementally.
+    """
+
+    def __init__(self, codec: Any, options: Dict[str, Any]):
+        self.__codec = codec
+        self.__options = options
+        self.__chunks: List[bytes] = []
+
+    def compress(self, data: bytes) -> bytes:
+        self.__chunks.append(bytes(data))
+        return b""
+
+    def flush(self) -> bytes:
+        data = b"".join(self.__chunks)
+        self.__chunks = []
+        return self.__codec.compress(data, **self.__options)
+
+
+class _BufferedDecompressor:
+    """
+    Collect the data and decompress it all at once using a codec that cannot decompress incrementally.
+    """
+
+    def __init__(self, codec: Any, options: Dict[str, Any]):
+        self.__codec = codec
+        self.__options = options
+        self.__chunks: List[bytes] = []
+
+    def decompress(self, data: bytes) -> bytes:
+        self.__chunks.append(bytes(data))
+        return b""
+
+    def flush(self) -> bytes:
+        data = b"".join(self.__chunks)
+        self.__chunks = []
+        return self.__codec.decompress(data, **self.__options)
+
+
+def compressor(algorithm: Union[str, None], options: Optional[Dict[str, Any]] = None) -> Any:
+    """
+    Return an object that compresses the data incrementally using <algorithm>.
+    The object has a `compress()` method that returns the compressed data available so far,
+    and a `flush()` method that returns the rest of it.
+
+    :param options: The keyword arguments of the codec, such as the compression level.
+    """
+
+    if algorithm is None:
+        return _Passthrough()
+
+    codec = registry.get(algorithm)
+    if hasattr(codec, "compressor"):
+        return codec.compressor(**_codecOptions(options))
+
+    return _BufferedCompressor(codec, _codecOptions(options))
+
+
+def decompressor(algorithm: Union[str, None], options: Optional[Dict[str, Any]] = None) -> Any:
+    """
+    Return an object that decompresses the data incrementally using <algorithm>.
+    The object has a `decompress()` method that returns the decompressed data available so far,
+    and a `flush()` method that returns the rest of it.
+
+    :param options: The compression options that the data is compressed with.
+    """
+
+    if algorithm is None:
+        return _Passthrough()
+
+    codec = registry.get(algorithm)
+    if hasattr(codec, "decompressor"):
+        return codec.decompressor(**_codecOptions(options, decompress=True))
+
+    return _BufferedDecompressor(codec, _codecOptions(options, decompress=True))
 
 
 def compress(data: str, algorithm: Union[str, None], encoding: str = info.defaults["encoding"]) -> str:
@@ -55,29 +200,15 @@ def compress(data: str, algorithm: Union[str, None], encoding: str = info.defaul
     if algorithm is None:
         return data  # Do not modify the data.
 
-    elif algorithm == "zlib":
-        return base64.b64encode(zlib.compress(data.encode(encoding))).decode(encoding)
-
-    elif algorithm == "lz4":
-        return base64.b64encode(lz4.compress(data.encode(encoding))).decode(encoding)
-
-    else:
-        raise ValueError(f"Unsupported compression algorithm: {algorithm}")
+    return base64.b64encode(compressBytes(data.encode(encoding), algorithm)).decode(encoding)
 
 
 def decompress(data: str, algorithm: Union[str, None], encoding: str = info.defaults["encoding"]) -> str:
     """
-    Decompress <data> using <algorithm>.
+    Decompress the base64-encoded <data> using <algorithm>.
     """
 
     if algorithm is None:
         return data
 
-    elif algorithm == "zlib":
-        return zlib.decompress(base64.b64decode(data)).decode(encoding)
-
-    elif algorithm == "lz4":
-        return lz4.decompress(base64.b64decode(data)).decode(encoding)
-
-    else:
-        raise ValueError(f"Unsupported compression algorithm: {algorithm}")
+    return decompressBytes(base64.b64decode(data), algorithm).decode(encoding)
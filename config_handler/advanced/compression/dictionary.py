@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+MIT License
+Copyright (c) 2020-2023 Chris1320
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import heapq
+from typing import Dict
+from typing import List
+from typing import Final
+from typing import Tuple
+from typing import Iterable
+from hashlib import blake2b
+
+default_size: Final[int] = 32768  # zlib only uses the last 32 KiB of a preset dictionary.
+
+# The registered preset dictionaries, keyed by their IDs.
+_dictionaries: Dict[str, bytes] = {}
+
+
+def dictionaryId(data: bytes) -> str:
+    """
+    Get the ID of the preset dictionary <data>. The ID is derived from the contents of the dictionary.
+    """
+
+    return blake2b(data, digest_size=8).hexdigest()
+
+
+def register(data: bytes) -> str:
+    """
+    Register the preset dictionary <data> so configuration files can be compressed and decompressed with it.
+
+    :returns: The ID of the dictionary. Pass it as the `dictionary` compression option to use the dictionary.
+    """
+
+    dictionary_id = dictionaryId(data)
+    _dictionaries[dictionary_id] = bytes(data)
+
+    return dictionary_id
+
+
+def unregister(dictionary_id: str) -> None:
+    """
+    Remove the preset dictionary <dictionary_id> from the registry.
+    """
+
+    _dictionaries.pop(dictionary_id, None)
+
+
+def get(dictionary_id: str) -> bytes:
+    """
+    Get the contents of the preset dictionary <dictionary_id>.
+    """
+
+    try:
+        return _dictionaries[dictionary_id]
+
+    except KeyError:
+        raise ValueError(f"The compression dictionary {dictionary_id} is not registered.")
+
+
+def train(
+    samples: Iterable[bytes],
+    size: int = default_size,
+    segment_size: int = 64,
+    dmer_size: int = 8
+) -> bytes:
+    """
+    Build a preset dictionary from <samples>.
+
+    The dictionary is made of the segments of the samples that contain the most
+    substrings shared by other samples. Segments are picked greedily, and the
+    substrings of a picked segment do not count towards the other segments.
+    The most useful segments are placed at the end of the dictionary, since
+    they are closer to the data and cost less to reference.
+
+    :param samples: The data that the dictionary will be used for, such as existing payloads.
+    :param size: The maximum size of the dictionary in bytes.
+    :param segment_size: The size of the segments in bytes.
+    :param dmer_size: The size of the substrings that are counted.
+
+    :returns: The contents of the dictionary.
+    """
+
+    samples = [bytes(sample) for sample in samples if len(sample) >= dmer_size]
+
+    # Count the number of samples that contain each substring.
+    frequencies: Dict[bytes, int] = {}
+    for sample in samples:
+        for dmer in {sample[i:i + dmer_size] for i in range(len(sample) - dmer_size + 1)}:
+            frequencies[dmer] = frequencies.get(dmer, 0) + 1
+
+    covered = set()  # The substrings that are already in the dictionary.
+
+    def score(segment: bytes) -> int:
+        dmers = {segment[i:i + dmer_size] for i in range(len(segment) - dmer_size + 1)}
+        # Substrings that only appear in one sample are not useful to other samples.
+        return sum(frequencies[dmer] for dmer in dmers - covered if frequencies[dmer] > 1)
+
+    step = max(segment_size // 4, 1)
+    candidates: List[Tuple[int, int, int]] = []  # (-score, sample index, segment start)
+    for sample_index, sample in enumerate(samples):
+        for start in range(0, max(len(sample) - segment_size, 0) + 1, step):
+            segment_score = score(sample[start:start + segment_size])
+            if segment_score > 0:
+                candidates.append((-segment_score, sample_index, start))
+
+    heapq.heapify(candidates)
+
+    selected: List[bytes] = []
+    selected_size = 0
+    while candidates and selected_size < size:
+        _, sample_index, start = heapq.heappop(candidates)
+        segment = samples[sample_index][start:start + segment_size]
+
+        # The score only decreases as more substrings are covered,
+        # so the score is only updated when the segment is picked.
+        segment_score = score(segment)
+        if segment_score <= 0:
+            continue
+
+        if candidates and segment_score < -candidates[0][0]:
+            heapq.heappush(candidates, (-segment_score, sample_index, start))
+            continue
+
+        selected.append(segment)
+        selected_size += len(segment)
+        covered.update(segment[i:i + dmer_size] for i in range(len(segment) - dmer_size + 1))
+
+    return b"".join(reversed(selected))[-size:]
@@ -24,7 +24,14 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Final
+from typing import Optional
+
 try:
+    import lz4.block
     import lz4.frame
 
 except ImportError:
@@ -34,17 +41,183 @@ else:
     available: bool = True
 
 
-def compress(data: bytes) -> bytes:
+# The block sizes in bytes and their LZ4 frame block size IDs. 0 uses the default block size.
+block_size_ids: Final[Dict[int, int]] = {
+    0: 0,
+    65536: 4,
+    262144: 5,
+    1048576: 6,
+    4194304: 7
+}
+
+
+def _frameOptions(level: int, block_size: int, acceleration: int) -> Dict[str, int]:
+    """
+    Convert the options of `compress()` to the keyword arguments of `lz4.frame`.
+    """
+
+    if block_size not in block_size_ids:
+        raise ValueError(f"Unsupported LZ4 block size: {block_size}")
+
+    if acceleration < 1:
+        raise ValueError("The LZ4 acceleration must be 1 or greater.")
+
+    if acceleration > 1:
+        if level > 0:
+            raise ValueError("The LZ4 acceleration can only be used with the fast compression level (0).")
+
+        level = 1 - acceleration  # LZ4 frames use negative compression levels for acceleration.
+
+    return {"compression_level": level, "block_size": block_size_ids[block_size]}
+
+
+def _blockOptions(level: int, block_size: int, acceleration: int) -> Dict[str, Any]:
+    """
+    Convert the options of `compress()` to the keyword arguments of `lz4.block`.
+    """
+
+    _frameOptions(level, block_size, acceleration)  # Validate the options.
+    if level > 0:
+        return {"mode": "high_compression", "compression": level}
+
+    return {"mode": "fast", "acceleration": acceleration}
+
+
+def compress(
+    data: bytes,
+    level: int = 0,
+    block_size: int = 0,
+    acceleration: int = 1,
+    zdict: Optional[bytes] = None
+) -> bytes:
     """
     Compress the data.
+
+    :param data: The data to compress.
+    :param level: The compression level from 0 (fast) to 16 (smallest). (default: 0)
+    :param block_size: The size of the blocks in bytes. It can be 65536, 262144, 1048576, 4194304,
+                       or 0 to use the default. (default: 0)
+    :param acceleration: Trade compression ratio for speed in fast mode. (default: 1; no acceleration)
+    :param zdict: The preset dictionary. LZ4 frames do not support preset dictionaries,
+                  so the data is compressed as a single LZ4 block if this is not None. (default: None)
     """
 
-    return lz4.frame.compress(data)
+    if zdict is not None:
+        return lz4.block.compress(data, dict=zdict, **_blockOptions(level, block_size, acceleration))
 
+    return lz4.frame.compress(data, **_frameOptions(level, block_size, acceleration))
 
-def decompress(data: bytes) -> bytes:
+
+def decompress(data: bytes, zdict: Optional[bytes] = None) -> bytes:
     """
     Decompress the data.
+
+    :param data: The data to decompress.
+    :param zdict: The preset dictionary that the data is compressed with. (default: None)
     """
 
+    if zdict is not None:
+        return lz4.block.decompress(data, dict=zdict)
+
     return lz4.frame.decompress(data)
+
+
+class Compressor:
+    """
+    Compress the data incrementally into a single LZ4 frame.
+    If a preset dictionary is used, the data is collected and compressed into a single LZ4 block instead.
+    """
+
+    def __init__(self, level: int = 0, block_size: int = 0, acceleration: int = 1, zdict: Optional[bytes] = None):
+        """
+        See `compress()` for the description of the parameters.
+        """
+
+        self.__zdict = zdict
+        self.__chunks: List[bytes] = []
+        if zdict is not None:
+            self.__options = _blockOptions(level, block_size, acceleration)
+
+        else:
+            self.__context = lz4.frame.LZ4FrameCompressor(**_frameOptions(level, block_size, acceleration))
+
+        self.__started = False
+
+    def __begin(self) -> bytes:
+        """
+        Return the frame header if it is not yet written.
+        """
+
+        if self.__started:
+            return b""
+
+        self.__started = True
+        return self.__context.begin()
+
+    def compress(self, data: bytes) -> bytes:
+        if self.__zdict is not None:
+            self.__chunks.append(bytes(data))
+            return b""
+
+        return self.__begin() + self.__context.compress(data)
+
+    def flush(self) -> bytes:
+        if self.__zdict is not None:
+            data = b"".join(self.__chunks)
+            self.__chunks = []
+            return lz4.block.compress(data, dict=self.__zdict, **self.__options)
+
+        return self.__begin() + self.__context.flush()
+
+
+class Decompressor:
+    """
+    Decompress an LZ4 frame incrementally.
+    If a preset dictionary is used, the LZ4 block is collected and decompressed at once instead.
+    """
+
+    def __init__(self, zdict: Optional[bytes] = None):
+        self.__zdict = zdict
+        self.__chunks: List[bytes] = []
+        self.__context = lz4.frame.LZ4FrameDecompressor()
+
+    def decompress(self, data: bytes) -> bytes:
+        if self.__zdict is not None:
+            self.__chunks.append(bytes(data))
+            return b""
+
+        return self.__context.decompress(data)
+
+    def flush(self) -> bytes:
+        if self.__zdict is not None:
+            data = b"".join(self.__chunks)
+            self.__chunks = []
+            return lz4.block.decompress(data, dict=self.__zdict)
+
+        return b""  # The decompressor does not hold back any data.
+
+
+def compressor(
+    level: int = 0,
+    block_size: int = 0,
+    acceleration: int = 1,
+    zdict: Optional[bytes] = None
+) -> Compressor:
+    """
+    Return an object that compresses the data incrementally using
+    its `compress()` and `flush()` methods. See `compress()` for the
+    description of the parameters.
+    """
+
+    return Compressor(level, block_size, acceleration, zdict)
+
+
+def decompressor(zdict: Optional[bytes] = None) -> Decompressor:
+    """
+    Return an object that decompresses the data incrementally using
+    its `decompress()` and `flush()` methods.
+
+    :param zdict: The preset dictionary that the data is compressed with. (default: None)
+    """
+
+    return Decompressor(zdict)
@@ -26,21 +26,66 @@ SOFTWARE.
 
 import zlib
 from typing import Final
+from typing import Optional
 
 available: Final[bool] = True  # zlib is available in Python's standard library.
 
 
-def compress(data: bytes) -> bytes:
+def compress(data: bytes, level: int = -1, zdict: Optional[bytes] = None) -> bytes:
     """
     Compress the data.
+
+    :param data: The data to compress.
+    :param level: The compression level from 0 (no compression) to 9 (smallest). (default: -1; zlib's default)
+    :param zdict: The preset dictionary. (default: None)
     """
 
-    return zlib.compress(data)
+    if zdict is not None:
+        compressor = zlib.compressobj(level, zdict=zdict)
+        return compressor.compress(data) + compressor.flush()
+
+    return zlib.compress(data, level)
 
 
-def decompress(data: bytes) -> bytes:
+def decompress(data: bytes, zdict: Optional[bytes] = None) -> bytes:
     """
     Decompress the data.
+
+    :param data: The data to decompress.
+    :param zdict: The preset dictionary that the data is compressed with. (default: None)
     """
 
+    if zdict is not None:
+        decompressor = zlib.decompressobj(zdict=zdict)
+        return decompressor.decompress(data) + decompressor.flush()
+
     return zlib.decompress(data)
+
+
+def compressor(level: int = -1, zdict: Optional[bytes] = None) -> "zlib._Compress":
+    """
+    Return an object that compresses the data incrementally using
+    its `compress()` and `flush()` methods.
+
+    :param level: The compression level. See `compress()`.
+    :param zdict: The preset dictionary. (default: None)
+    """
+
+    if zdict is not None:
+        return zlib.compressobj(level, zdict=zdict)
+
+    return zlib.compressobj(level)
+
+
+def decompressor(zdict: Optional[bytes] = None) -> "zlib._Decompress":
+    """
+    Return an object that decompresses the data incrementally using
+    its `decompress()` and `flush()` methods.
+
+    :param zdict: The preset dictionary that the data is compressed with. (default: None)
+    """
+
+    if zdict is not None:
+        return zlib.decompressobj(zdict=zdict)
+
+    return zlib.decompressobj()
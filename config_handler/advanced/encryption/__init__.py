@@ -24,11 +24,22 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
+import base64
+from typing import Any
+from typing import List
 from typing import Union
-from importlib import import_module
 
 from config_handler import info
+from config_handler.advanced._registry import CodecRegistry
 from config_handler.advanced.encryption import aes256
+from config_handler.advanced.encryption import aes256_gcm
+from config_handler.advanced.encryption import aes256_gcm_chunked
+
+# Other packages can add encryption algorithms using the `config_handler.encryption` entry point group.
+registry = CodecRegistry("encryption algorithm", "config_handler.encryption")
+registry.register("aes256", aes256)
+registry.register("aes256-gcm", aes256_gcm)
+registry.register("aes256-gcm-chunked", aes256_gcm_chunked)
 
 
 def isAvailable(encryption_name: Union[str, None]) -> bool:
@@ -36,22 +47,48 @@ def isAvailable(encryption_name: Union[str, None]) -> bool:
     Check if <encryption_name> is available in the user's machine.
     """
 
+    return registry.isAvailable(encryption_name)
+
+
+def isAuthenticated(encryption_name: Union[str, None]) -> bool:
+    """
+    Check if <encryption_name> verifies the integrity of the data when decrypting.
+    """
+
     if encryption_name is None:
-        return True  # This means that no encryption is needed.
+        return False
 
-    parent_import_path = "config_handler.advanced.encryption"
+    return getattr(registry.get(encryption_name), "authenticated", False)
 
-    return getattr(import_module(f"{parent_import_path}.{encryption_name}"), "available")
 
+def getSalt(data: bytes, algorithm: Union[str, None]) -> Union[bytes, None]:
+    """
+    Get the salt used to encrypt the raw ciphertext <data> using <algorithm>.
+    Return None if <algorithm> does not use a salt.
+    """
 
-def encrypt(
-    data: str,
+    if algorithm is None:
+        return None
+
+    codec = registry.get(algorithm)
+    if not hasattr(codec, "getSalt"):
+        return None
+
+    return codec.getSalt(data)
+
+
+def encryptBytes(
+    data: bytes,
     algorithm: Union[str, None],
     key: Union[str, None] = None,
-    encoding: str = info.defaults["encoding"]
-) -> str:
+    salt: Union[bytes, None] = None
+) -> bytes:
     """
     Encrypt <data> using <algorithm> as the encryption algorithm and <key> as the key.
+    Return the raw ciphertext.
+
+    <salt> is the salt to derive the encryption key with. A random salt is used if None.
+    Reusing the salt of a previous ciphertext allows the cached derived key to be reused.
     """
 
     if algorithm is None:
@@ -60,31 +97,144 @@ def encrypt(
     if key is None:
         raise ValueError("Configuration password is not set but encryption is on.")
 
-    elif algorithm == "aes256":
-        return aes256.encrypt(data, key, encoding)
+    return registry.get(algorithm).encrypt(data, key, salt)
 
-    else:
-        raise ValueError(f"Unsupported encryption algorithm: {algorithm}")
 
+def decryptBytes(data: bytes, algorithm: Union[str, None], key: Union[str, None] = None) -> bytes:
+    """
+    Decrypt the raw ciphertext <data> using <algorithm> as the encryption algorithm and <key> as the key.
+    """
 
-def decrypt(
+    if algorithm is None:
+        return data
+
+    if key is None:
+        raise ValueError("Configuration password is not set but encryption is on.")
+
+    return registry.get(algorithm).decrypt(data, key)
+
+
+class _Passthrough:
+    """
+    A streaming cipher that does not modify the data.
+    """
+
+    def update(self, data: bytes) -> bytes:
+        return data
+
+    def finalize(self) -> bytes:
+        return b""
+
+
+class _BufferedEncryptor:
+    """
+    Collect the data and encrypt it all at once using a codec that cannot encrypt incrementally.
+    """
+
+    def __init__(self, codec: Any, key: str, salt: Union[bytes, None]):
+        self.__codec = codec
+        self.__key = key
+        self.__salt = salt
+        self.__chunks: List[bytes] = []
+
+    def update(self, data: bytes) -> bytes:
+        self.__chunks.append(bytes(data))
+        return b""
+
+    def finalize(self) -> bytes:
+        data = b"".join(self.__chunks)
+        self.__chunks = []
+        return self.__codec.encrypt(data, self.__key, self.__salt)
+
+
+class _BufferedDecryptor:
+    """
+    Collect the data and decrypt it all at once using a codec that cannot decrypt incrementally.
+    """
+
+    def __init__(self, codec: Any, key: str):
+        self.__codec = codec
+        self.__key = key
+        self.__chunks: List[bytes] = []
+
+    def update(self, data: bytes) -> bytes:
+        self.__chunks.append(bytes(data))
+        return b""
+
+    def finalize(self) -> bytes:
+        data = b"".join(self.__chunks)
+        self.__chunks = []
+        return self.__codec.decrypt(data, self.__key)
+
+
+def encryptor(algorithm: Union[str, None], key: Union[str, None] = None, salt: Union[bytes, None] = None) -> Any:
+    """
+    Return an object that encrypts the data incrementally using <algorithm> as the encryption algorithm
+    and <key> as the key. The object has an `update()` method that returns the ciphertext available so far,
+    and a `finalize()` method that returns the rest of it. The ciphertext is the same as `encryptBytes()`.
+    """
+
+    if algorithm is None:
+        return _Passthrough()
+
+    if key is None:
+        raise ValueError("Configuration password is not set but encryption is on.")
+
+    codec = registry.get(algorithm)
+    if hasattr(codec, "Encryptor"):
+        return codec.Encryptor(key, salt)
+
+    return _BufferedEncryptor(codec, key, salt)
+
+
+def decryptor(algorithm: Union[str, None], key: Union[str, None] = None) -> Any:
+    """
+    Return an object that decrypts the data incrementally using <algorithm> as the encryption algorithm
+    and <key> as the key. The object has an `update()` method that returns the plaintext available so far,
+    and a `finalize()` method that returns the rest of it.
+    """
+
+    if algorithm is None:
+        return _Passthrough()
+
+    if key is None:
+        raise ValueError("Configuration password is not set but encryption is on.")
+
+    codec = registry.get(algorithm)
+    if hasattr(codec, "Decryptor"):
+        return codec.Decryptor(key)
+
+    return _BufferedDecryptor(codec, key)
+
+
+def encrypt(
     data: str,
     algorithm: Union[str, None],
     key: Union[str, None] = None,
     encoding: str = info.defaults["encoding"]
 ) -> str:
     """
-    Decrypt <data> using <algorithm> as the encryption algorithm and <key> as the key.
+    Encrypt <data> using <algorithm> as the encryption algorithm and <key> as the key.
+    Return the base64-encoded result as a string.
     """
 
     if algorithm is None:
-        return data
+        return data  # Do not modify the data.
+
+    return base64.b64encode(encryptBytes(data.encode(encoding), algorithm, key)).decode(encoding)
 
-    if key is None:
-        raise ValueError("Configuration password is not set but encryption is on.")
 
-    if algorithm == "aes256":
-        return aes256.decrypt(data, key, encoding)
+def decrypt(
+    data: str,
+    algorithm: Union[str, None],
+    key: Union[str, None] = None,
+    encoding: str = info.defaults["encoding"]
+) -> str:
+    """
+    Decrypt the base64-encoded <data> using <algorithm> as the encryption algorithm and <key> as the key.
+    """
+
+    if algorithm is None:
+        return data
 
-    else:
-        raise ValueError(f"Unsupported encryption algorithm: {algorithm}")
+    return decryptBytes(base64.b64decode(data), algorithm, key).decode(encoding)
@@ -24,15 +24,15 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
-import base64
+from typing import Final
 from typing import Union
+from typing import Optional
 
-from config_handler import info
+from config_handler.advanced.encryption import kdf
 
 try:
     from Cryptodome import Random
     from Cryptodome.Cipher import AES
-    from Cryptodome.Protocol.KDF import PBKDF2
     from Cryptodome.Util.Padding import pad
     from Cryptodome.Util.Padding import unpad
     available: bool = True
@@ -40,53 +40,179 @@ try:
 except ModuleNotFoundError:
     available: bool = False  # There is no supported cryptography module available.
 
+authenticated: Final[bool] = False  # CBC mode does not verify the integrity of the data.
 
-def encrypt(data: str, key: Union[bytes, str], encoding: str = info.defaults["encoding"]) -> str:
+key_size: Final[int] = 32
+salt_size: Final[int] = 16
+iterations: Final[int] = 50000
+
+
+def getSalt(data: Union[bytes, memoryview]) -> bytes:
+    """
+    Get the salt used to encrypt <data>.
+    """
+
+    return bytes(data[:salt_size])
+
+
+def encrypt(data: Union[bytes, memoryview], key: Union[bytes, str], salt: Optional[bytes] = None) -> bytes:
     """
     Encrypt <data> using <key> as key.
 
     :param data: The data to encrypt.
     :param key: The key to use.
-    :param encoding: The encoding to use.
+    :param salt: The salt to derive the encryption key with. A random salt is generated if None.
+
+    :returns: The salt, initialization vector, and ciphertext.
     """
 
-    key_size = 32
-    salt_size = 16
     block_size = AES.block_size
 
-    salt = Random.new().read(salt_size)  # Generate a random 16-byte salt.
-    key_hash: bytes = PBKDF2(key, salt, dkLen=key_size, count=50000)  # type: ignore
+    if salt is None:
+        salt = Random.new().read(salt_size)  # Generate a random 16-byte salt.
+
+    key_hash: bytes = kdf.deriveKey(key, salt, key_size, iterations)
     iv: bytes = Random.new().read(AES.block_size)  # Generate a random 16-bytes initialization vector.
 
     aes = AES.new(key_hash, AES.MODE_CBC, iv=iv)  # Create a new AES object.
-    return base64.b64encode(  # Encrypt the data.
-        salt + iv + aes.encrypt(
-            pad(data.encode(encoding), block_size)
-        )
-    ).decode(encoding)
 
+    # Encrypt the data directly into the result so the plaintext and ciphertext are not copied.
+    # Only the last partial block needs to be padded.
+    data = memoryview(data).cast('B')
+    full_blocks_size = len(data) - len(data) % block_size
+    header_size = salt_size + block_size
+    result = bytearray(header_size + full_blocks_size + block_size)
+    result[:header_size] = salt + iv
+
+    output = memoryview(result)
+    if full_blocks_size:
+        aes.encrypt(data[:full_blocks_size], output=output[header_size:header_size + full_blocks_size])
+
+    aes.encrypt(pad(bytes(data[full_blocks_size:]), block_size), output=output[header_size + full_blocks_size:])
+    return result  # type: ignore
 
-def decrypt(data: str, key: Union[bytes, str], encoding: str = info.defaults["encoding"]) -> str:
+
+def decrypt(data: Union[bytes, memoryview], key: Union[bytes, str]) -> bytes:
     """
     Decrypt <data> using <key> as key.
 
-    :param data: The data to decrypt.
+    :param data: The salt, initialization vector, and ciphertext.
     :param key: The key to use.
-    :param encoding: The encoding to use.
     """
 
-    key_size = 32
-    salt_size = 16
     block_size = AES.block_size
 
-    decoded_data = base64.b64decode(data)  # Decode the data.
-
-    iv = decoded_data[salt_size:salt_size + block_size]  # Get the iv of the ciphertext.
-    salt = decoded_data[:salt_size]  # Get the first 16 bytes of the data as the salt used.
-    enc_data = decoded_data[salt_size + block_size:]  # Get the encrypted data.
+    data = memoryview(data)  # Slice the data without copying the ciphertext.
+    iv = data[salt_size:salt_size + block_size]  # Get the iv of the ciphertext.
+    salt = data[:salt_size]  # Get the first 16 bytes of the data as the salt used.
+    enc_data = data[salt_size + block_size:]  # Get the encrypted data.
 
-    key_hash: bytes = PBKDF2(key, salt, dkLen=key_size, count=50000)  # type: ignore
+    key_hash: bytes = kdf.deriveKey(key, salt, key_size, iterations)
 
     aes = AES.new(key_hash, AES.MODE_CBC, iv=iv)
 
-    return unpad(aes.decrypt(enc_data), block_size).decode(encoding)
+    return unpad(aes.decrypt(enc_data), block_size)
+
+
+class Encryptor:
+    """
+    Encrypt the data incrementally. The output is in the same format as `encrypt()`.
+    """
+
+    def __init__(self, key: Union[bytes, str], salt: Optional[bytes] = None):
+        """
+        :param key: The key to use.
+        :param salt: The salt to derive the encryption key with. A random salt is generated if None.
+        """
+
+        if salt is None:
+            salt = Random.new().read(salt_size)
+
+        iv: bytes = Random.new().read(AES.block_size)
+        self.__aes = AES.new(kdf.deriveKey(key, salt, key_size, iterations), AES.MODE_CBC, iv=iv)
+        self.__header = salt + iv  # Written before the first block of the ciphertext.
+        self.__pending = b""  # The data that does not fill a whole block yet.
+
+    def update(self, data: Union[bytes, memoryview]) -> bytes:
+        """
+        Encrypt <data> and return the ciphertext of the blocks completed so far.
+        """
+
+        data = self.__pending + bytes(data)
+        full_blocks_size = len(data) - len(data) % AES.block_size
+        self.__pending = data[full_blocks_size:]
+
+        result = self.__header
+        self.__header = b""
+        if full_blocks_size:
+            result += self.__aes.encrypt(data[:full_blocks_size])
+
+        return result
+
+    def finalize(self) -> bytes:
+        """
+        Pad and encrypt the remaining data.
+        """
+
+        result = self.__header + self.__aes.encrypt(pad(self.__pending, AES.block_size))
+        self.__header = b""
+        self.__pending = b""
+
+        return result
+
+
+class Decryptor:
+    """
+    Decrypt the output of `encrypt()` or `Encryptor` incrementally.
+    """
+
+    def __init__(self, key: Union[bytes, str]):
+        """
+        :param key: The key to use.
+        """
+
+        self.__key = key
+        self.__aes = None
+        self.__pending = b""  # The data that cannot be decrypted yet.
+
+    def update(self, data: Union[bytes, memoryview]) -> bytes:
+        """
+        Decrypt <data> and return the plaintext available so far.
+        """
+
+        block_size = AES.block_size
+        data = self.__pending + bytes(data)
+        if self.__aes is None:
+            if len(data) < salt_size + block_size:
+                self.__pending = data
+                return b""
+
+            salt = data[:salt_size]
+            iv = data[salt_size:salt_size + block_size]
+            self.__aes = AES.new(kdf.deriveKey(self.__key, salt, key_size, iterations), AES.MODE_CBC, iv=iv)
+            data = data[salt_size + block_size:]
+
+        # The last block is kept until `finalize()` since it contains the padding.
+        full_blocks_size = len(data) - len(data) % block_size
+        if full_blocks_size == len(data):
+            full_blocks_size -= block_size
+
+        if full_blocks_size <= 0:
+            self.__pending = data
+            return b""
+
+        self.__pending = data[full_blocks_size:]
+        return self.__aes.decrypt(data[:full_blocks_size])
+
+    def finalize(self) -> bytes:
+        """
+        Decrypt and unpad the last block.
+        """
+
+        if self.__aes is None or len(self.__pending) != AES.block_size:
+            raise ValueError("The ciphertext is incomplete.")
+
+        result = unpad(self.__aes.decrypt(self.__pending), AES.block_size)
+        self.__pending = b""
+
+        return result
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+MIT License
+Copyright (c) 2020-2023 Chris1320
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from typing import Final
+from typing import Union
+from typing import Optional
+
+from config_handler import exceptions
+from config_handler.advanced.encryption import kdf
+
+try:
+    from Cryptodome import Random
+    from Cryptodome.Cipher import AES
+    available: bool = True
+
+except ModuleNotFoundError:
+    available: bool = False  # There is no supported cryptography module available.
+
+authenticated: Final[bool] = True  # The authentication tag verifies the integrity of the data.
+
+key_size: Final[int] = 32
+salt_size: Final[int] = 16
+nonce_size: Final[int] = 12
+tag_size: Final[int] = 16
+iterations: Final[int] = 50000
+
+
+def getSalt(data: Union[bytes, memoryview]) -> bytes:
+    """
+    Get the salt used to encrypt <data>.
+    """
+
+    return bytes(data[:salt_size])
+
+
+def encrypt(data: Union[bytes, memoryview], key: Union[bytes, str], salt: Optional[bytes] = None) -> bytes:
+    """
+    Encrypt and authenticate <data> using <key> as key.
+
+    :param data: The data to encrypt.
+    :param key: The key to use.
+    :param salt: The salt to derive the encryption key with. A random salt is generated if None.
+
+    :returns: The salt, nonce, authentication tag, and ciphertext.
+    """
+
+    if salt is None:
+        salt = Random.new().read(salt_size)  # Generate a random 16-byte salt.
+
+    key_hash: bytes = kdf.deriveKey(key, salt, key_size, iterations)
+    nonce: bytes = Random.new().read(nonce_size)  # Generate a random 12-byte nonce.
+
+    aes = AES.new(key_hash, AES.MODE_GCM, nonce=nonce, mac_len=tag_size)
+
+    # Encrypt the data directly into the result so the ciphertext is not copied.
+    header_size = salt_size + nonce_size + tag_size
+    result = bytearray(header_size + len(memoryview(data).cast('B')))
+    aes.encrypt(data, output=memoryview(result)[header_size:])
+    result[:header_size] = salt + nonce + aes.digest()
+
+    return result  # type: ignore
+
+
+def decrypt(data: Union[bytes, memoryview], key: Union[bytes, str]) -> bytes:
+    """
+    Decrypt <data> using <key> as key and verify its authentication tag.
+    This function raises a `ChecksumError` if the data has been altered or the key is wrong.
+
+    :param data: The salt, nonce, authentication tag, and ciphertext.
+    :param key: The key to use.
+    """
+
+    data = memoryview(data)  # Slice the data without copying the ciphertext.
+    salt = data[:salt_size]
+    nonce = data[salt_size:salt_size + nonce_size]
+    tag = data[salt_size + nonce_size:salt_size + nonce_size + tag_size]
+    enc_data = data[salt_size + nonce_size + tag_size:]
+
+    key_hash: bytes = kdf.deriveKey(key, salt, key_size, iterations)
+
+    aes = AES.new(key_hash, AES.MODE_GCM, nonce=nonce, mac_len=tag_size)
+    try:
+        return aes.decrypt_and_verify(enc_data, tag)
+
+    except ValueError:
+        raise exceptions.ChecksumError("The authentication tag of the data is invalid.")
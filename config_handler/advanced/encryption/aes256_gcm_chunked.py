@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+MIT License
+Copyright (c) 2020-2023 Chris1320
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import os
+import struct
+import threading
+from typing import Final
+from typing import Union
+from typing import List
+from typing import Deque
+from typing import Iterator
+from typing import Optional
+from collections import deque
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+
+from config_handler import exceptions
+from config_handler.advanced.encryption import kdf
+
+try:
+    from Cryptodome import Random
+    from Cryptodome.Cipher import AES
+    available: bool = True
+
+except ModuleNotFoundError:
+    available: bool = False  # There is no supported cryptography module available.
+
+authenticated: Final[bool] = True  # Each chunk has its own authentication tag.
+
+key_size: Final[int] = 32
+salt_size: Final[int] = 16
+payload_salt_size: Final[int] = 16  # The random salt used to derive the key of each payload.
+nonce_prefix_size: Final[int] = 7  # The nonce of a chunk is the prefix, the chunk number, and the last chunk flag.
+tag_size: Final[int] = 16
+iterations: Final[int] = 50000
+chunk_size: Final[int] = 1048576  # The size of the plaintext of each chunk.
+
+_header: Final[struct.Struct] = struct.Struct(f">{salt_size}s{payload_salt_size}sI")  # salt, payload salt, chunk size
+_chunk_suffix: Final[struct.Struct] = struct.Struct(">I?")  # chunk number, last chunk flag
+# Each payload is encrypted with its own key, so the nonces only have to be unique within a payload.
+_nonce_prefix: Final[bytes] = bytes(nonce_prefix_size)
+_hkdf_context: Final[bytes] = b"config_handler aes256-gcm-chunked payload key"
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _getExecutor() -> ThreadPoolExecutor:
+    """
+    Get the thread pool that encrypts and decrypts the chunks. The thread pool is created when it is first used.
+    """
+
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(os.cpu_count(), thread_name_prefix="config_handler-aes256-gcm-chunked")
+
+        return _executor
+
+
+def _payloadKey(key: Union[bytes, str], salt: bytes, payload_salt: bytes) -> bytes:
+    """
+    Get the key of a payload. The key derived from the password and <salt> may be reused by many payloads
+    (e.g., when the salt is reused and the derived key is cached), so each payload is encrypted with a key
+    derived from it and the random <payload_salt> instead.
+    """
+
+    return kdf.expandKey(kdf.deriveKey(key, salt, key_size, iterations), payload_salt, key_size, _hkdf_context)
+
+
+def _nonce(chunk_number: int, last: bool) -> bytes:
+    """
+    Get the nonce of a chunk. Including the chunk number and the last chunk flag
+    in the nonce prevents the chunks from being reordered, removed, or truncated.
+    """
+
+    return _nonce_prefix + _chunk_suffix.pack(chunk_number, last)
+
+
+def _encryptChunk(key: bytes, nonce: bytes, data: Union[bytes, memoryview]) -> bytes:
+    aes = AES.new(key, AES.MODE_GCM, nonce=nonce, mac_len=tag_size)
+
+    # Encrypt the data directly into the result so the ciphertext is not copied.
+    result = bytearray(len(data) + tag_size)
+    aes.encrypt(data, output=memoryview(result)[:len(data)])
+    result[len(data):] = aes.digest()
+
+    return result  # type: ignore
+
+
+def _decryptChunk(key: bytes, nonce: bytes, data: Union[bytes, memoryview]) -> bytes:
+    aes = AES.new(key, AES.MODE_GCM, nonce=nonce, mac_len=tag_size)
+    data = memoryview(data)
+    try:
+        return aes.decrypt_and_verify(data[:-tag_size], data[-tag_size:])
+
+    except ValueError:
+        raise exceptions.ChecksumError("The authentication tag of the data is invalid.")
+
+
+class _ChunkPipeline:
+    """
+    Process chunks in a thread pool and return the results in order.
+    """
+
+    def __init__(self, key: bytes):
+        self._key = key
+        self._chunk_number = 0
+        self._buffer = bytearray()  # The data that does not fill a whole chunk yet.
+        self.__pending: Deque[Future] = deque()
+        self.__max_pending = (os.cpu_count() or 1) * 2  # Limit the memory used by the chunks in progress.
+
+    def _submit(self, function, nonce: bytes, data: Union[bytes, memoryview]) -> None:
+        self.__pending.append(_getExecutor().submit(function, self._key, nonce, data))
+        self._chunk_number += 1
+
+    def _split(self, data: Union[bytes, memoryview], size: int) -> Iterator[Union[bytes, memoryview]]:
+        """
+        Add <data> to the buffer and yield the chunks of <size> bytes that are followed by more data.
+        The last chunk is kept in the buffer since it is not known yet if it is the last one.
+        """
+
+        view = memoryview(data).cast('B')
+        if self._buffer:
+            needed = size - len(self._buffer)
+            self._buffer += view[:needed]
+            view = view[needed:]
+            if not view:
+                return
+
+            yield bytes(self._buffer)
+            self._buffer = bytearray()
+
+        if not view.readonly:
+            view = memoryview(bytes(view))  # The chunks are processed later, so <data> must not change.
+
+        while len(view) > size:
+            yield view[:size]
+            view = view[size:]
+
+        self._buffer += view
+
+    def _collect(self, wait: bool = False) -> List[bytes]:
+        """
+        Return the results of the finished chunks at the front of the queue.
+
+        :param wait: Wait for all chunks to finish.
+        """
+
+        results = []
+        while self.__pending and (wait or self.__pending[0].done() or len(self.__pending) > self.__max_pending):
+            results.append(self.__pending.popleft().result())
+
+        return results
+
+    def _idle(self) -> bool:
+        return not self.__pending
+
+
+class Encryptor(_ChunkPipeline):
+    """
+    Encrypt the data incrementally. The output is in the same format as `encrypt()`.
+    """
+
+    def __init__(self, key: Union[bytes, str], salt: Optional[bytes] = None):
+        """
+        :param key: The key to use.
+        :param salt: The salt to derive the encryption key with. A random salt is generated if None.
+        """
+
+        if salt is None:
+            salt = Random.new().read(salt_size)
+
+        payload_salt = Random.new().read(payload_salt_size)
+        super().__init__(_payloadKey(key, salt, payload_salt))
+        self.__header = _header.pack(salt, payload_salt, chunk_size)  # Written before the first chunk.
+
+    def update(self, data: Union[bytes, memoryview]) -> bytes:
+        """
+        Encrypt <data> and return the ciphertext of the chunks finished so far.
+        """
+
+        return b"".join(self._update(data))
+
+    def finalize(self) -> bytes:
+        """
+        Encrypt the last chunk and return the rest of the ciphertext.
+        """
+
+        return b"".join(self._finalize())
+
+    def _update(self, data: Union[bytes, memoryview]) -> List[bytes]:
+        # The last chunk is kept until `finalize()` since it is marked as the last one.
+        for chunk in self._split(data, chunk_size):
+            self._submit(_encryptChunk, _nonce(self._chunk_number, False), chunk)
+
+        return self.__popHeader() + self._collect()
+
+    def _finalize(self) -> List[bytes]:
+        nonce = _nonce(self._chunk_number, True)
+        if self._idle():
+            # Do not use the thread pool for small payloads.
+            last_chunk = [_encryptChunk(self._key, nonce, bytes(self._buffer))]
+            self._chunk_number += 1
+
+        else:
+            self._submit(_encryptChunk, nonce, bytes(self._buffer))
+            last_chunk = []
+
+        self._buffer = bytearray()
+        return self.__popHeader() + self._collect(wait=True) + last_chunk
+
+    def __popHeader(self) -> List[bytes]:
+        """
+        Return the header if it is not yet written.
+        """
+
+        header = [self.__header] if self.__header else []
+        self.__header = b""
+
+        return header
+
+
+class Decryptor(_ChunkPipeline):
+    """
+    Decrypt the output of `encrypt()` or `Encryptor` incrementally.
+    """
+
+    def __init__(self, key: Union[bytes, str]):
+        """
+        :param key: The key to use.
+        """
+
+        self.__password = key
+        self.__header_read = False
+        self.__stored_chunk_size = 0
+        super().__init__(b"")
+
+    def update(self, data: Union[bytes, memoryview]) -> bytes:
+        """
+        Decrypt <data> and return the plaintext of the chunks finished so far.
+        """
+
+        return b"".join(self._update(data))
+
+    def finalize(self) -> bytes:
+        """
+        Decrypt the last chunk and return the rest of the plaintext.
+        """
+
+        return b"".join(self._finalize())
+
+    def _update(self, data: Union[bytes, memoryview]) -> List[bytes]:
+        if not self.__header_read:
+            view = memoryview(data).cast('B')
+            needed = _header.size - len(self._buffer)
+            self._buffer += view[:needed]
+            data = view[needed:]
+            if len(self._buffer) < _header.size:
+                return []
+
+            salt, payload_salt, plaintext_chunk_size = _header.unpack(self._buffer)
+            self._key = _payloadKey(self.__password, salt, payload_salt)
+            self.__header_read = True
+            self.__stored_chunk_size = plaintext_chunk_size + tag_size
+            self._buffer = bytearray()
+
+        # The last chunk is kept until `finalize()` since it is marked as the last one.
+        for chunk in self._split(data, self.__stored_chunk_size):
+            self._submit(_decryptChunk, _nonce(self._chunk_number, False), chunk)
+
+        return self._collect()
+
+    def _finalize(self) -> List[bytes]:
+        if not self.__header_read or len(self._buffer) < tag_size:
+            raise exceptions.ChecksumError("The ciphertext is incomplete.")
+
+        nonce = _nonce(self._chunk_number, True)
+        if self._idle():
+            last_chunk = [_decryptChunk(self._key, nonce, bytes(self._buffer))]
+            self._chunk_number += 1
+
+        else:
+            self._submit(_decryptChunk, nonce, bytes(self._buffer))
+            last_chunk = []
+
+        self._buffer = bytearray()
+        return self._collect(wait=True) + last_chunk
+
+
+def getSalt(data: Union[bytes, memoryview]) -> bytes:
+    """
+    Get the salt used to encrypt <data>.
+    """
+
+    return bytes(data[:salt_size])
+
+
+def encrypt(data: Union[bytes, memoryview], key: Union[bytes, str], salt: Optional[bytes] = None) -> bytes:
+    """
+    Encrypt and authenticate <data> using <key> as key, in chunks of `chunk_size` bytes.
+    The chunks are encrypted in parallel.
+
+    :param data: The data to encrypt.
+    :param key: The key to use.
+    :param salt: The salt to derive the encryption key with. A random salt is generated if None.
+
+    :returns: The salt, payload salt, chunk size, and the ciphertext and authentication tag of each chunk.
+    """
+
+    encryptor = Encryptor(key, salt)
+    return b"".join(encryptor._update(data) + encryptor._finalize())
+
+
+def decrypt(data: Union[bytes, memoryview], key: Union[bytes, str]) -> bytes:
+    """
+    Decrypt <data> using <key> as key and verify the authentication tag of each chunk.
+    This function raises a `ChecksumError` if the data has been altered, reordered, or truncated,
+    or if the key is wrong.
+
+    :param data: The output of `encrypt()`.
+    :param key: The key to use.
+    """
+
+    decryptor = Decryptor(key)
+    return b"".join(decryptor._update(data) + decryptor._finalize())
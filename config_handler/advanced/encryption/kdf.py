@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+MIT License
+Copyright (c) 2020-2023 Chris1320
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import time
+import hashlib
+import threading
+from typing import Dict
+from typing import Tuple
+from typing import Union
+from typing import Optional
+from collections import OrderedDict
+
+from config_handler import info
+
+try:
+    from Cryptodome.Hash import SHA256
+    from Cryptodome.Protocol.KDF import HKDF
+    from Cryptodome.Protocol.KDF import PBKDF2
+    available: bool = True
+
+except ModuleNotFoundError:
+    available: bool = False  # There is no supported cryptography module available.
+
+
+class DerivedKeyCache:
+    """
+    A thread-safe, process-wide LRU cache of keys derived using PBKDF2.
+
+    Keys are cached by the SHA-256 digest of the password, the salt, the number of iterations,
+    and the length of the derived key, so the password itself is never stored.
+    """
+
+    def __init__(self, maxsize: int, ttl: Optional[float]):
+        """
+        :param maxsize: The maximum number of derived keys to keep. Set to 0 to disable caching.
+        :param ttl: The number of seconds a derived key is kept, or None to keep it until it is evicted.
+        """
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+
+        self._keys: Dict[Tuple[bytes, bytes, int, int], Tuple[bytes, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def derive(self, password: Union[bytes, str], salt: bytes, dk_len: int, iterations: int) -> bytes:
+        """
+        Derive a key from <password> and <salt>, or get it from the cache if it is derived before.
+
+        :param password: The password to derive the key from.
+        :param salt: The salt to use.
+        :param dk_len: The length of the derived key in bytes.
+        :param iterations: The number of PBKDF2 iterations.
+        """
+
+        cache_key = (
+            hashlib.sha256(password.encode() if type(password) is str else password).digest(),  # type: ignore
+            bytes(salt),
+            iterations,
+            dk_len
+        )
+        with self._lock:
+            cached = self._keys.get(cache_key)
+            if cached is not None:
+                if self.ttl is None or time.monotonic() - cached[1] < self.ttl:
+                    self._keys.move_to_end(cache_key)  # type: ignore
+                    return cached[0]
+
+                del self._keys[cache_key]  # The cached key has expired.
+
+        derived_key: bytes = PBKDF2(password, salt, dkLen=dk_len, count=iterations)  # type: ignore
+        if self.maxsize > 0:
+            with self._lock:
+                self._keys[cache_key] = (derived_key, time.monotonic())
+                while len(self._keys) > self.maxsize:
+                    self._keys.popitem(last=False)  # type: ignore  # Evict the least recently used key.
+
+        return derived_key
+
+    def clear(self) -> None:
+        """
+        Remove all derived keys from the cache.
+        """
+
+        with self._lock:
+            self._keys.clear()
+
+
+# The cache used by the encryption algorithms. Change its `maxsize` and `ttl` attributes to configure it.
+key_cache = DerivedKeyCache(info.defaults["key_cache_size"], info.defaults["key_cache_ttl"])
+
+
+def deriveKey(password: Union[bytes, str], salt: bytes, dk_len: int, iterations: int) -> bytes:
+    """
+    Derive a key from <password> and <salt> using PBKDF2, using `key_cache` to avoid deriving it again.
+    """
+
+    return key_cache.derive(password, salt, dk_len, iterations)
+
+
+def expandKey(key: bytes, salt: bytes, dk_len: int, context: bytes) -> bytes:
+    """
+    Derive a subkey from <key> and <salt> using HKDF-SHA256.
+    Unlike `deriveKey()`, this is fast and is not cached, so it can be used to derive a new key for each payload.
+    """
+
+    return HKDF(key, dk_len, salt, SHA256, context=context)  # type: ignore
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+MIT License
+Copyright (c) 2020-2023 Chris1320
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import json
+import codecs
+import math
+from typing import Any
+from typing import Final
+from typing import Union
+from typing import Optional
+
+from config_handler import info
+from config_handler.advanced._registry import CodecRegistry
+
+# The backends to try, in order, when the JSON backend is "auto".
+preferred_backends: Final[tuple] = ("orjson", "ujson", "json")
+
+# Integers with this many digits may not fit in 64 bits, which `orjson` would load as floats.
+_large_integer_digits: Final[int] = 19
+_scan_chunk_size: Final[int] = 1048576
+# Maps digits to b"0" and everything else to b" " so runs of digits can be found using `bytes.find()`.
+_digit_table: Final[bytes] = bytes(48 if 48 <= byte <= 57 else 32 for byte in range(256))
+
+
+def _hasLargeInteger(data: Union[bytes, bytearray, str]) -> bool:
+    """
+    Check if <data> contains a run of digits that may be an integer larger than 64 bits.
+    This is much faster than a regular expression, and only copies <data> in chunks.
+    """
+
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+
+    run = b"0" * _large_integer_digits
+    overlap = _large_integer_digits - 1  # A run of digits may cross the boundary of a chunk.
+    for position in range(0, len(data), _scan_chunk_size):
+        if run in data[max(0, position - overlap):position + _scan_chunk_size].translate(_digit_table):
+            return True
+
+    return False
+
+
+def _hasNonFinite(obj: Any) -> bool:
+    """
+    Check if <obj> contains NaN or infinity.
+    """
+
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if type(item) is float:
+            if not math.isfinite(item):
+                return True
+
+        elif isinstance(item, dict):
+            stack.extend(item.values())
+
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+
+    return False
+
+
+class StdlibBackend:
+    """
+    The `json` module of Python's standard library.
+    This backend is always available, and the other backends fall back to it.
+    """
+
+    available: Final[bool] = True
+    item_separator: Final[bytes] = b", "  # The separator between items, used to join encoded objects.
+
+    @staticmethod
+    def dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+    @staticmethod
+    def loads(data: Union[bytes, bytearray, str]) -> Any:
+        return json.loads(data)
+
+
+class ORJSONBackend:
+    """
+    The `orjson` module.
+
+    `orjson` writes NaN and infinity as null, and cannot write integers larger than 64 bits,
+    strings with lone surrogates, or the types that the `json` module rejects. It also loads
+    integers larger than 64 bits as floats. The data is handled by the `json` module in those cases.
+    """
+
+    item_separator: Final[bytes] = b","
+
+    def __init__(self):
+        try:
+            import orjson
+
+        except ImportError:
+            self.available = False
+
+        else:
+            self.available = True
+            self.__orjson = orjson
+            self.__options = (
+                orjson.OPT_NON_STR_KEYS
+                | orjson.OPT_PASSTHROUGH_DATACLASS
+                | orjson.OPT_PASSTHROUGH_DATETIME
+                | orjson.OPT_PASSTHROUGH_SUBCLASS
+            )
+
+    def dumps(self, obj: Any) -> bytes:
+        try:
+            result = self.__orjson.dumps(obj, option=self.__options)
+
+        except TypeError:
+            return StdlibBackend.dumps(obj)
+
+        if b"null" in result and _hasNonFinite(obj):
+            return StdlibBackend.dumps(obj)
+
+        return result
+
+    def loads(self, data: Union[bytes, bytearray, str]) -> Any:
+        if _hasLargeInteger(data):
+            return StdlibBackend.loads(data)
+
+        try:
+            return self.__orjson.loads(data)
+
+        except ValueError:  # e.g., NaN, infinity, or lone surrogates
+            return StdlibBackend.loads(data)
+
+
+class UJSONBackend:
+    """
+    The `ujson` module. The data is handled by the `json` module if `ujson` fails to write or load it.
+    """
+
+    item_separator: Final[bytes] = b","
+
+    def __init__(self):
+        try:
+            import ujson
+
+        except ImportError:
+            self.available = False
+
+        else:
+            self.available = True
+            self.__ujson = ujson
+
+    def dumps(self, obj: Any) -> bytes:
+        if _hasNonFinite(obj):
+            return StdlibBackend.dumps(obj)
+
+        try:
+            return self.__ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False).encode("utf-8")
+
+        except (TypeError, ValueError, OverflowError, UnicodeEncodeError):
+            return StdlibBackend.dumps(obj)
+
+    def loads(self, data: Union[bytes, bytearray, str]) -> Any:
+        if _hasLargeInteger(data):
+            return StdlibBackend.loads(data)
+
+        try:
+            return self.__ujson.loads(data if isinstance(data, (bytes, str)) else bytes(data))
+
+        except ValueError:
+            return StdlibBackend.loads(data)
+
+
+# Other packages can add JSON backends using the `config_handler.json_backends` entry point group.
+registry = CodecRegistry("JSON backend", "config_handler.json_backends")
+registry.register("json", StdlibBackend())
+registry.register("orjson", ORJSONBackend())
+registry.register("ujson", UJSONBackend())
+
+
+def getBackend(name: Optional[str] = None) -> Any:
+    """
+    Get the JSON backend <name>.
+
+    :param name: The name of the backend, or "auto" to use the fastest available backend.
+                 If None, `info.defaults["json_backend"]` is used.
+    """
+
+    if name is None:
+        name = info.defaults["json_backend"]
+
+    if name == "auto":
+        for backend_name in preferred_backends:
+            if registry.isAvailable(backend_name):
+                return registry.get(backend_name)
+
+    if not registry.isAvailable(name):
+        raise NotImplementedError(f"The JSON backend {name} is not found or unavailable.")
+
+    return registry.get(name)
+
+
+def decode(data: Union[bytes, bytearray], encoding: str, name: Optional[str] = None) -> Any:
+    """
+    Decode the JSON document <data> in <encoding> using the JSON backend <name>.
+
+    UTF-8 documents are decoded without converting them to text first.
+    Otherwise, if <data> is a bytearray, it is cleared after converting it to text
+    so that only one copy of the document is kept while parsing it.
+    """
+
+    backend = getBackend(name)
+    if codecs.lookup(encoding).name == "utf-8":
+        return backend.loads(data)
+
+    text = data.decode(encoding)
+    if isinstance(data, bytearray):
+        data.clear()
+
+    return backend.loads(text)
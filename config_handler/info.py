@@ -41,5 +41,10 @@ title: Final[str] = "{name} v{version}{release_suffix}".format(
 
 defaults: Dict[str, Any] = {
     "encoding": "utf-8",
-    "browser_items_to_show": 10
+    "browser_items_to_show": 10,
+    "key_cache_size": 64,  # The number of derived encryption keys to cache.
+    "key_cache_ttl": 600,  # The number of seconds to cache a derived encryption key. (None to disable expiry)
+    "json_backend": "auto",  # The JSON backend of Advanced configuration files. (`auto`, `json`, `orjson`, or `ujson`)
+    "durability": "none",  # The durability policy when saving. (`none`, `data`, or `full`; see `config_handler._io`)
+    "auto_save_max_delay": 10.0  # The maximum number of seconds an auto-saved modification stays unsaved.
 }
@@ -24,15 +24,82 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
+import io
 import os
 import base64
+import locale
+import secrets
+import itertools
+from hashlib import blake2b
 from typing import Any
 from typing import List
 from typing import Final
 from typing import Tuple
 from typing import Union
+from typing import Iterable
+from typing import TextIO
+from typing import BinaryIO
+from typing import Iterator
+from typing import Optional
 
+from config_handler import _io
 from config_handler import info
+from config_handler import _background
+from config_handler.simple._index import KeyIndex
+
+
+class _Base64Reader(io.RawIOBase):
+    """
+    A read-only raw stream that decodes a Base64-encoded file incrementally.
+    """
+
+    # Bytes that are not part of the Base64 alphabet. `base64.b64decode()` discards them too.
+    _junk: Final[bytes] = bytes(
+        set(range(256)) - set(b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/=")
+    )
+
+    def __init__(self, raw: BinaryIO, chunk_size: int):
+        """
+        :param raw: The Base64-encoded file object.
+        :param chunk_size: The number of bytes to read from <raw> at a time.
+        """
+
+        super().__init__()
+        self._raw = raw
+        self._chunk_size = chunk_size
+        self._remainder = b""  # Encoded bytes that do not form a complete 4-byte group yet.
+        self._buffer = b""  # Decoded bytes that are not yet returned.
+        self._position = 0  # The position of the next byte to return in `self._buffer`.
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        while self._position >= len(self._buffer):
+            chunk = self._raw.read(self._chunk_size)
+            if not chunk:
+                if not self._remainder:
+                    return 0  # EOF
+
+                # Decode the last (possibly padded) group.
+                self._buffer, self._remainder = base64.b64decode(self._remainder), b""
+
+            else:
+                chunk = self._remainder + chunk.translate(None, self._junk)
+                cut = len(chunk) - len(chunk) % 4  # Only decode complete 4-byte groups.
+                self._buffer, self._remainder = base64.b64decode(chunk[:cut]), chunk[cut:]
+
+            self._position = 0
+
+        size = min(len(b), len(self._buffer) - self._position)
+        b[:size] = self._buffer[self._position:self._position + size]
+        self._position += size
+
+        return size
+
+    def close(self) -> None:
+        self._raw.close()
+        super().close()
 
 
 class Simple:
@@ -48,24 +115,54 @@ class Simple:
         - Keys must not contain an equal (=) sign.
     - Values must be any string, integer, float, or boolean.
     - Values must not contain a newline (\n).
+
+    In journal mode, `save()` appends the changes made since the last `load()` or `save()`
+    to a sidecar journal file (`<config_path>.journal`) instead of rewriting the whole file.
+    The journal is replayed by `load()` and merged to the configuration file by `compact()`,
+    which is called automatically once the journal becomes too large.
+
+    The first record of the journal contains the token of the configuration file that it extends,
+    which is stored in a comment on the first line of the configuration file. `compact()` writes
+    a new token if a journal exists, so a journal that is left behind (e.g., by a crash before
+    it is removed) is ignored instead of being replayed on top of the compacted file.
     """
 
-    parser_version: Final[Tuple[int, int, int]] = (0, 5, 1)  # Parser version
+    parser_version: Final[Tuple[int, int, int]] = (0, 6, 0)  # Parser version
     _separator: Final[str] = '='
     _comment_char: Final[str] = '#'
+    _tombstone: Final[str] = "#-"  # Journal records starting with this string remove a key.
+    _journal_header: Final[str] = "##"  # The first journal record contains the token of its configuration file.
+    _journal_base_comment: Final[str] = "#journal-base:"  # The comment that contains the token of the configuration file.
+    _journal_suffix: Final[str] = ".journal"
+    _chunk_size: Final[int] = 65536  # Number of characters to buffer before writing to file.
+
+    journal_max_size: int = 1048576  # Compact the journal once it is larger than this many bytes...
+    journal_max_ratio: float = 1.0  # ...or larger than this ratio of the configuration file size.
 
     def __init__(
         self,
         config_path: str,
         isbase64: bool = False,
         readonly: bool = False,
-        encoding: str = info.defaults["encoding"]
+        encoding: str = info.defaults["encoding"],
+        journal: bool = False,
+        durability: str = info.defaults["durability"],
+        auto_save: Optional[float] = None,
+        auto_save_max_delay: float = info.defaults["auto_save_max_delay"]
     ):
         """
         :param config_path: The path of the configuration file to open or create.
         :param isbase64: True if the configuration file is encoded via Base64.
         :param readonly: True if the configuration file is read-only.
         :param encoding: The encoding to use.
+        :param journal: True to append changes to a journal file when saving.
+        :param durability: The durability policy when saving: `none`, `data` to flush the file to
+                           the disk before replacing the old file, or `full` to also flush the
+                           directory.
+        :param auto_save: If not None, save the configuration file in a background thread once it is
+                          not modified for this many seconds. (See `self.flush()`)
+        :param auto_save_max_delay: The maximum number of seconds to wait after the first unsaved
+                                    modification before auto-saving.
 
         Read-only mode allows manipulation but not writing to the configuration file.
         """
@@ -74,14 +171,53 @@ class Simple:
         self.isbase64 = isbase64
         self.readonly = readonly
         self.encoding = encoding
+        self.journal = journal
+        self.durability = durability
 
         self.__data = {}  # The configuration file contents.
+        self.__index: Optional[KeyIndex] = None  # The index of the configuration file if loaded lazily.
+        self.__journal_records: List[str] = []  # Changes that are not yet saved to the journal.
+        # The (isbase64, encoding) of the file that `self.__data` was loaded from or saved to.
+        # This is None if the journal cannot be appended to the file.
+        self.__journal_format: Optional[Tuple[bool, str]] = None
+        # The token of the configuration file that the journal extends. (See `self._replayJournal()`)
+        self.__journal_base: Optional[str] = None
+
+        # Dirty tracking. The configuration file is dirty if it is modified since the last `load()` or `save()`.
+        self.__dirty = False
+        # Incremented every time the configuration file is modified, so a save can tell
+        # if the configuration file is modified while it is being saved.
+        self.__generation = 0
+        # The state of the configuration and journal files after the last `load()` or `save()` (See `self.__fileState()`),
+        # and the checksum of the last written configuration file. Used to skip saves that would not change the files,
+        # and loads that would not change the pairs. (See `self.reload_if_changed()`)
+        self.__saved_state: Optional[tuple] = None
+        self.__saved_checksum: Optional[bytes] = None
+        self.__auto_saver: Optional[_background.AutoSaver] = None
+        if auto_save is not None:
+            if readonly:
+                raise ValueError("Auto-save is not supported in read-only mode.")
+
+            self.__auto_saver = _background.AutoSaver(self.__autoSave, auto_save, auto_save_max_delay)
+
+    def __enter__(self) -> "Simple":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """
+        Save the unsaved modifications if auto-save is enabled.
+        """
+
+        self.flush()
 
     def __contains__(self, key: str) -> bool:
         """
         Check if <key> exists in the configuration file.
         """
 
+        if self.__index is not None:
+            return key in self.__index
+
         return key in self.__data
 
     def __delitem__(self, key: str) -> None:
@@ -89,7 +225,11 @@ class Simple:
         Remove a key from the configuration file.
         """
 
+        self.__materialize()
+
         del self.__data[key]
+        self.__recordDelete(key)
+        self.__markDirty()
 
     def __setitem__(self, key: str, value: Union[str, int, float, bool]) -> None:
         """
@@ -106,13 +246,20 @@ class Simple:
         if not self._parseValue(value):
             raise ValueError("Value contains invalid characters.")
 
+        self.__materialize()
+
         self.__data[key] = value
+        self.__recordSet(key, value)
+        self.__markDirty()
 
     def __getitem__(self, key: str) -> Union[str, int, float, bool]:
         """
         Get the value of <key>.
         """
 
+        if self.__index is not None:
+            return self._convertValue(self.__index[key])
+
         return self.__data[key]
 
     def __repr__(self) -> str:
@@ -127,6 +274,9 @@ class Simple:
         Return the number of pairs present in the configuration file.
         """
 
+        if self.__index is not None:
+            return len(self.__index)
+
         return len(self.__data)
 
     def __call__(self) -> dict:
@@ -140,7 +290,7 @@ class Simple:
             "isbase64": self.isbase64,
             "readonly": self.readonly,
             "encoding": self.encoding,
-            "dict_size": len(self.__data)
+            "dict_size": len(self)
         }
 
     @property
@@ -151,6 +301,19 @@ class Simple:
     def config_path(self, new_path: str):
         self._config_path = os.path.abspath(new_path)
 
+    @property
+    def journal_path(self) -> str:
+        return self.config_path + self._journal_suffix
+
+    @property
+    def is_dirty(self) -> bool:
+        """
+        Check if the configuration file is modified since the last `load()` or `save()`.
+        Values that are modified in-place are not tracked.
+        """
+
+        return self.__dirty
+
     @property
     def exists(self) -> bool:
         """
@@ -202,63 +365,445 @@ class Simple:
         else:  # Return True when no additional checks are needed.
             return True
 
-    def load(self) -> None:
+    @staticmethod
+    def _b64encodeChunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """
+        Encode <chunks> to Base64 incrementally.
+
+        The concatenated output is the same as encoding all chunks in one call.
+        """
+
+        remainder = b""
+        for chunk in chunks:
+            chunk = remainder + chunk
+            cut = len(chunk) - len(chunk) % 3  # Only encode complete 3-byte groups so that no padding is added.
+            yield base64.b64encode(chunk[:cut])
+            remainder = chunk[cut:]
+
+        yield base64.b64encode(remainder)
+
+    @staticmethod
+    def _convertValue(value: str) -> Union[str, int, float, bool]:
+        """
+        Convert a value read from the configuration file to its original data type.
+        """
+
+        if value.isdigit():  # Check if the value is an int.
+            return int(value)
+
+        lowered = value.lower()
+        if lowered == "true":  # Check if the value is a bool.
+            return True
+
+        elif lowered == "false":
+            return False
+
+        integer, _, decimal = value.partition('.')
+        if integer.isdigit() and decimal.isdigit():  # Check if the value is a float.
+            return float(value)
+
+        return value  # If none of the above is true, the value is a string.
+
+    def _open(self) -> TextIO:
+        """
+        Open the configuration file for reading in text mode.
+        The file is decoded from Base64 on the fly if `self.isbase64` is True.
+        """
+
+        if self.isbase64:
+            return io.TextIOWrapper(
+                io.BufferedReader(_Base64Reader(open(self.config_path, "rb"), self._chunk_size)),
+                encoding=self.encoding
+            )
+
+        return open(self.config_path, 'r')
+
+    def __materialize(self) -> None:
+        """
+        Parse all values of a lazily-loaded configuration file and release its index.
+        Nothing is done if the configuration file is not loaded lazily.
+        """
+
+        if self.__index is None:
+            return
+
+        self.__data = {}
+        for key, value in self.__index.items():
+            self.__data[key] = self._convertValue(value)
+
+        self.__index.close()
+        self.__index = None
+
+    def __markDirty(self) -> None:
+        """
+        Mark the configuration file as modified, and schedule an auto-save if it is enabled.
+        """
+
+        self.__dirty = True
+        self.__generation += 1
+        if self.__auto_saver is not None:
+            self.__auto_saver.notify()
+
+    def __fileState(self) -> tuple:
+        """
+        Return the state of the configuration and journal files, and the properties used to write them.
+        """
+
+        return (
+            self.config_path,
+            self.isbase64,
+            self.encoding,
+            _io.fileState(self.config_path),
+            _io.fileState(self.journal_path)
+        )
+
+    def __autoSave(self) -> None:
+        """
+        Save the configuration file if it is still modified. This is called by the auto-saver.
+        """
+
+        if self.__dirty:
+            self.save()
+
+    def __recordSet(self, key: str, value: Union[str, int, float, bool]) -> None:
+        """
+        Add a journal record that sets <key> to <value>.
+        """
+
+        if self.journal:
+            self.__journal_records.append(f"{key}{self._separator}{value}")
+
+    def __recordDelete(self, key: str) -> None:
+        """
+        Add a journal record that removes <key>.
+        """
+
+        if self.journal:
+            self.__journal_records.append(f"{self._tombstone}{key}")
+
+    def _readJournalBase(self) -> Optional[str]:
+        """
+        Read the token of the configuration file from its first line, or None if it has none.
+        """
+
+        try:
+            with self._open() as f:
+                line = f.readline().rstrip('\n')
+
+        except FileNotFoundError:
+            return None
+
+        return line[len(self._journal_base_comment):] if line.startswith(self._journal_base_comment) else None
+
+    def _replayJournal(self) -> bool:
+        """
+        Apply the records of the journal file, if it exists, to the loaded pairs.
+        Later records override earlier ones. The journal is ignored if it extends
+        another version of the configuration file. (See `self.__journal_base`)
+
+        :returns: False if the journal exists but is ignored.
+        """
+
+        try:
+            f = open(self.journal_path, "rb" if self.isbase64 else 'r')
+
+        except FileNotFoundError:
+            return True
+
+        with f:
+            for number, record in enumerate(f):
+                if self.isbase64:
+                    record = base64.b64decode(record).decode(self.encoding)
+
+                record = record.rstrip('\n')
+                if number == 0:
+                    # Journals without a header extend configuration files without a token.
+                    base = record[len(self._journal_header):] if record.startswith(self._journal_header) else None
+                    if (base or None) != self.__journal_base:
+                        return False
+
+                    if base is not None:
+                        continue
+
+                if record.startswith(self._tombstone):
+                    self.__data.pop(record[len(self._tombstone):], None)
+
+                else:
+                    key, _, value = record.partition(self._separator)
+                    self.__data[key] = self._convertValue(value)
+
+        return True
+
+    def _appendJournal(self) -> None:
+        """
+        Append the unsaved journal records to the journal file.
+        """
+
+        if not self.__journal_records:
+            return
+
+        # The records added while this method runs (e.g., by another thread) are saved next time.
+        records, self.__journal_records = self.__journal_records, []
+        created = not os.path.isfile(self.journal_path)
+        try:
+            with open(self.journal_path, "ab" if self.isbase64 else 'a') as f:
+                header = [f"{self._journal_header}{self.__journal_base or ''}"] if created else []
+                if self.isbase64:
+                    f.writelines(
+                        base64.b64encode(record.encode(self.encoding)) + b'\n'
+                        for record in itertools.chain(header, records)
+                    )
+
+                else:
+                    f.writelines(f"{record}\n" for record in itertools.chain(header, records))
+
+                _io.sync(f, self.durability)
+
+        except BaseException:
+            self.__journal_records[:0] = records  # Keep the records for the next save.
+            raise
+
+        if created:
+            _io.syncDirectory(self.journal_path, self.durability)
+
+    def _shouldCompact(self) -> bool:
+        """
+        Check if the journal file is large enough to be merged to the configuration file.
+        """
+
+        try:
+            journal_size = os.path.getsize(self.journal_path)
+
+        except FileNotFoundError:
+            return False
+
+        config_size = os.path.getsize(self.config_path) if self.exists else 0
+
+        return journal_size > self.journal_max_size or journal_size > config_size * self.journal_max_ratio
+
+    def _serialize(self) -> Iterator[str]:
+        """
+        Yield the configuration file contents in chunks of about `self._chunk_size` characters.
+        """
+
+        buffer: List[str] = []
+        buffered = 0
+        # Iterate over a copy of the pairs, so they can be modified by another thread (e.g., while auto-saving).
+        for key, value in list(self.__data.items()):
+            line = f"{key}{self._separator}{value}\n"
+            buffer.append(line)
+            buffered += len(line)
+            if buffered >= self._chunk_size:
+                yield ''.join(buffer)
+                buffer.clear()
+                buffered = 0
+
+        if buffer:
+            yield ''.join(buffer)
+
+    def load(self, lazy: bool = False) -> None:
         """
         Load the configuration file contents to memory.
         Call this method when you want to read the configuration file.
         If `self.save()` is called without calling this method, the configuration file
         will be overwritten.
-        """
 
-        self.__data = {}
-        # Open in `rb` mode if self.isbase64 is True.
-        with open(self.config_path, "rb" if self.isbase64 else 'r') as f:
-            # Decode from Base64 if self.base64 is True.
-            config_data = base64.b64decode(f.read()).decode(self.encoding) if self.isbase64 else f.read()
+        :param lazy: Memory-map the configuration file and only index the location of each key.
+                     Values are parsed when they are requested. The pairs are fully loaded once
+                     the configuration file is modified or all of its pairs are requested.
+                     This is only supported in read-only mode and without Base64 encoding.
+                     The pairs are fully loaded immediately if the configuration file has a journal.
 
-        # Parse the configuration file contents
-        for line in config_data.splitlines():
-            if line.startswith(self._comment_char):
-                continue  # Skip comments.
+        The journal file, if it exists, is replayed even if journal mode is off.
+        """
 
-            data = line.partition(self._separator)
+        if lazy and (not self.readonly or self.isbase64):
+            raise ValueError("Lazy loading is only supported in read-only mode and without Base64 encoding.")
 
-            if data[2].isdigit():  # Check if the value is an int.
-                self.__data[data[0]] = int(data[2])
+        if self.__index is not None:
+            self.__index.close()
+            self.__index = None
 
-            elif data[2].lower() in ("true", "false"):  # Check if the value is a bool.
-                if data[2].lower() == "true":
-                    self.__data[data[0]] = True
+        self.__data = {}
+        self.__journal_records.clear()
+        # The files are checked before they are read, so they are saved again if they change while loading.
+        file_state = self.__fileState()
+        journal_applies = True
+        self.__journal_base = self._readJournalBase()
+        if lazy and not os.path.isfile(self.journal_path):
+            # Files without Base64 encoding are read and written in the locale encoding. (See `self._open()`)
+            self.__index = KeyIndex(
+                self.config_path,
+                locale.getpreferredencoding(False),
+                self._separator,
+                self._comment_char
+            )
+
+        else:  # The index cannot contain the changes in a journal, so the pairs are loaded eagerly.
+            self.__data.update(self.iter_file())  # Parse the configuration file contents line by line.
+            journal_applies = self._replayJournal()
+
+        # The journal is not appended to if it is ignored. It is removed by the next save instead.
+        self.__journal_format = (self.isbase64, self.encoding) if journal_applies else None
+        self.__dirty = False
+        self.__saved_state = file_state
+        if self.__auto_saver is not None:
+            self.__auto_saver.cancel()
+
+    def reload_if_changed(self, lazy: bool = False) -> bool:
+        """
+        Load the configuration file again if it or its journal file is modified since it was last
+        loaded or saved. A file is considered modified if its modification time, size, or inode
+        number changed. Like `load()`, the unsaved modifications are discarded when it is loaded again.
+
+        :param lazy: See `self.load()`.
+
+        :returns: True if the configuration file is loaded again.
+        """
+
+        file_state = self.__fileState()
+        if self.__saved_state == file_state and file_state[3] is not None:  # The configuration file still exists.
+            return False
 
-                elif data[2].lower() == "false":
-                    self.__data[data[0]] = False
+        self.load(lazy)
+        return True
 
-                else:
-                    raise ValueError("Key value has unknown boolean state.")
+    def iter_file(self) -> Iterator[Tuple[str, Union[str, int, float, bool]]]:
+        """
+        Yield the key-value pairs of the configuration file one at a time.
+        Unlike `self.load()`, this does not store the pairs in memory.
+        """
+
+        convert = self._convertValue
+        separator = self._separator
+        comment_char = self._comment_char
 
-            elif data[2].partition('.')[0].isdigit() and data[2].partition('.')[2].isdigit():  # Check if the value is a float.
-                self.__data[data[0]] = float(data[2])
+        with self._open() as f:
+            for line in f:
+                line = line.rstrip('\n')
+                if line.startswith(comment_char):
+                    continue  # Skip comments.
 
-            else:  # If none of the above is true, the value is a string.
-                self.__data[data[0]] = data[2]
+                key, _, value = line.partition(separator)
+                yield key, convert(value)
 
     def save(self) -> None:
         """
         Save the configuration file to <self.config_path>.
         This method raises a `PermissionError` if the configuration file is read-only.
+
+        In journal mode, only the changes made since the last `load()` or `save()` are
+        appended to the journal file. The whole file is rewritten instead if it was not
+        loaded or saved before, if its Base64 mode or encoding was changed, or if its files
+        were modified by others since.
+
+        Nothing is written if the configuration file is not modified since the last `load()`
+        or `save()`, and its files are not modified by others in the meantime.
         """
 
         if self.readonly:
             raise PermissionError("The configuration file is read-only.")
 
-        config_data = ""  # The string to be written to file.
-        for key in self.__data:
-            config_data += f"{key}={self.__data[key]}\n"  # Write the key-value pair to the config file.
+        unchanged_files = self.__saved_state == self.__fileState()
+        if not self.__dirty and unchanged_files:
+            return
+
+        self.__materialize()
+
+        if self.journal and self.__journal_format == (self.isbase64, self.encoding) and unchanged_files:
+            generation = self.__generation
+            self._appendJournal()
+            if not self._shouldCompact():
+                self.__saved_state = self.__fileState()
+                if generation == self.__generation:
+                    self.__dirty = False
+
+                return
+
+        self.compact()
+
+    def compact(self) -> None:
+        """
+        Rewrite the whole configuration file and remove its journal file.
+        This method raises a `PermissionError` if the configuration file is read-only.
+
+        The configuration file is written to a temporary file first, which then replaces it,
+        so readers never see a partially-written configuration file. (See `self.durability`)
+        The old file is kept if it already has the same contents.
+        """
+
+        if self.readonly:
+            raise PermissionError("The configuration file is read-only.")
+
+        self.__materialize()
+
+        generation = self.__generation
+        file_state = self.__fileState()
+        # The records added from now on (e.g., by another thread) are appended to the new journal.
+        records, self.__journal_records = self.__journal_records, []
+        if file_state[-1] is not None:
+            journal_base: Optional[str] = secrets.token_hex(8)  # The existing journal no longer applies.
+
+        elif self.journal:
+            journal_base = self.__journal_base or secrets.token_hex(8)
+
+        else:
+            journal_base = None
+
+        chunks: Iterable[str] = self._serialize()
+        if journal_base is not None:
+            chunks = itertools.chain([f"{self._journal_base_comment}{journal_base}\n"], chunks)
+
+        hasher = blake2b(digest_size=8)
+        try:
+            # Open in `wb` mode if self.isbase64 is True.
+            with _io.atomicWrite(self.config_path, "wb" if self.isbase64 else 'w', self.durability) as f:
+                # Stream the key-value pairs to the file instead of building the whole file in memory.
+                if self.isbase64:
+                    # Encode to Base64 if self.base64 is True.
+                    for chunk in self._b64encodeChunks(text.encode(self.encoding) for text in chunks):
+                        f.write(chunk)
+                        hasher.update(chunk)
+
+                else:
+                    for chunk in chunks:
+                        f.write(chunk)
+                        hasher.update(chunk.encode("utf-8", "surrogatepass"))
+
+                if (
+                    hasher.digest() == self.__saved_checksum
+                    and file_state == self.__saved_state
+                    and file_state[-1] is None  # There is no journal to merge.
+                ):
+                    raise _io.Discard  # The file already has the same contents.
+
+        except BaseException:
+            self.__journal_records[:0] = records  # Keep the records for the next save.
+            raise
+
+        # The journal is already merged to the configuration file. It is only removed after the
+        # configuration file is replaced, and it is ignored in the meantime since its token is outdated.
+        if os.path.isfile(self.journal_path):
+            os.remove(self.journal_path)
+
+        self.__journal_base = journal_base
+        self.__journal_format = (self.isbase64, self.encoding)
+        self.__saved_state = self.__fileState()
+        self.__saved_checksum = hasher.digest()
+        if generation == self.__generation:
+            self.__dirty = False
+
+    def flush(self) -> None:
+        """
+        Save the modifications that are not yet auto-saved, and wait until they are saved.
+        Nothing is done if auto-save is disabled.
+
+        This is also done when the interpreter exits, and when leaving a `with` block.
+        If a background save failed, the save is retried and its exception is raised.
+        """
 
-        # Open in `wb` mode if self.isbase64 is True.
-        with open(self.config_path, "wb" if self.isbase64 else 'w') as f:
-            # Encode to Base64 if self.base64 is True.
-            f.write(base64.b64encode(config_data.encode(self.encoding)) if self.isbase64 else config_data)
+        if self.__auto_saver is not None:
+            self.__auto_saver.flush()
 
     def setdefault(self, key: str, default: Any = None) -> Any:
         """
@@ -274,6 +819,12 @@ class Simple:
         if not self._parseValue(default):
             raise ValueError("Default value contains invalid characters.")
 
+        self.__materialize()
+
+        if key not in self.__data:
+            self.__recordSet(key, default)
+            self.__markDirty()
+
         return self.__data.setdefault(key, default)
 
     def set(self, key: str, value: Union[str, int, float, bool]) -> None:
@@ -291,13 +842,24 @@ class Simple:
         if not self._parseValue(value):
             raise ValueError("Value contains invalid characters.")
 
+        self.__materialize()
+
         self.__data[key] = value
+        self.__recordSet(key, value)
+        self.__markDirty()
 
     def get(self, key: str, default: Any = None) -> Any:
         """
         Get the value of <key> or <default> if the key does not exist.
         """
 
+        if self.__index is not None:
+            try:
+                return self._convertValue(self.__index[key])
+
+            except KeyError:
+                return default
+
         return self.__data.get(key, default)
 
     def remove(self, key: str) -> None:
@@ -305,13 +867,23 @@ class Simple:
         Remove a key from the configuration file.
         """
 
+        self.__materialize()
+
         del self.__data[key]
+        self.__recordDelete(key)
+        self.__markDirty()
 
     def pop(self, key: str, default: Any = None) -> Any:
         """
         Remove and return the value of <key>. <default> is returned if the key does not exist.
         """
 
+        self.__materialize()
+
+        if key in self.__data:
+            self.__recordDelete(key)
+            self.__markDirty()
+
         return self.__data.pop(key, default)
 
     def popitem(self) -> Tuple[str, Any]:
@@ -319,13 +891,21 @@ class Simple:
         Pop a key-pair value from the configuration file.
         """
 
-        return self.__data.popitem()
+        self.__materialize()
+
+        key, value = self.__data.popitem()
+        self.__recordDelete(key)
+        self.__markDirty()
+
+        return key, value
 
     def items(self) -> List[Tuple[str, Any]]:
         """
         Return a list of key-value pairs of the configuration file.
         """
 
+        self.__materialize()
+
         return list(self.__data.items())
 
     def keys(self) -> List[str]:
@@ -333,6 +913,8 @@ class Simple:
         Return existing keys in the configuration file.
         """
 
+        self.__materialize()
+
         return list(self.__data.keys())
 
     def values(self) -> List[Any]:
@@ -340,6 +922,8 @@ class Simple:
         Return a list of values in the configuration file.
         """
 
+        self.__materialize()
+
         return list(self.__data.values())
 
     def clear(self) -> None:
@@ -347,4 +931,9 @@ class Simple:
         Clear all key-value pairs in the configuration file.
         """
 
+        self.__materialize()
+
         self.__data.clear()
+        self.__journal_records.clear()
+        self.__journal_format = None  # Rewrite the whole file on the next save.
+        self.__markDirty()
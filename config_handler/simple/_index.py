@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+MIT License
+Copyright (c) 2020-2023 Chris1320
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import mmap
+from array import array
+from typing import Final
+from typing import Tuple
+from typing import Iterator
+from typing import Optional
+
+
+class KeyIndex:
+    """
+    A read-only index of the key-value pairs in a memory-mapped simple configuration file.
+
+    The file is scanned once to record where each line starts and how long its key and value are.
+    The offsets are stored in arrays and looked up using an open-addressing hash table,
+    so no Python object is kept per key. Values are only read when they are requested.
+    If a key appears more than once, the last occurrence is used.
+    """
+
+    _empty_slot: Final[int] = -1
+    _count_chunk_size: Final[int] = 1048576
+
+    def __init__(self, path: str, encoding: str, separator: str, comment_char: str):
+        """
+        :param path: The path of the configuration file to index.
+        :param encoding: The encoding of the configuration file.
+        :param separator: The character that separates the key and the value.
+        :param comment_char: Lines that start with this character are skipped.
+        """
+
+        self.encoding = encoding
+        self._separator_length = len(separator.encode(encoding))
+
+        self._offsets = array('Q')  # The offset of the start of each line.
+        self._key_lengths = array('I')  # The length of the key of each line in bytes.
+        self._value_lengths = array('I')  # The length of the value of each line in bytes.
+        self._slots = array('q')  # The hash table. Each slot contains an index to the arrays above.
+        self._size = 0  # The number of unique keys.
+
+        self._map: Optional[mmap.mmap]
+        with open(path, "rb") as f:
+            try:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+            except ValueError:
+                self._map = None  # The file is empty and cannot be memory-mapped.
+
+        self._build(separator.encode(encoding), comment_char.encode(encoding))
+
+    def __contains__(self, key: str) -> bool:
+        return self._find(key) != self._empty_slot
+
+    def __getitem__(self, key: str) -> str:
+        """
+        Get the raw value of <key>.
+        """
+
+        entry = self._find(key)
+        if entry == self._empty_slot:
+            raise KeyError(key)
+
+        return self._value(entry)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _build(self, separator: bytes, comment_char: bytes) -> None:
+        """
+        Record the location of each key-value pair in the file and build the hash table of their keys.
+        """
+
+        line_count = 0
+        if self._map is not None:
+            for position in range(0, len(self._map), self._count_chunk_size):  # Count the lines without copying the whole file.
+                line_count += self._map[position:position + self._count_chunk_size].count(b'\n')
+
+        capacity = 8
+        while capacity < (line_count + 1) * 2:  # Keep the load factor at 0.5 or lower.
+            capacity *= 2
+
+        self._slots = array('q', [self._empty_slot]) * capacity
+        if self._map is None:
+            return
+
+        # Attribute lookups are done once since this loop runs for every line of the file.
+        data = self._map
+        offsets = self._offsets
+        key_lengths = self._key_lengths
+        value_lengths = self._value_lengths
+        slots = self._slots
+        empty_slot = self._empty_slot
+        mask = capacity - 1
+
+        offset = 0
+        for line in iter(data.readline, b""):
+            if not line.startswith(comment_char):
+                key, _, value = line.rstrip(b"\r\n").partition(separator)
+                entry = len(offsets)
+                offsets.append(offset)
+                key_lengths.append(len(key))
+                value_lengths.append(len(value))
+
+                slot = hash(key) & mask
+                while True:  # Linear probing; see `self._probe()`.
+                    other = slots[slot]
+                    if other == empty_slot:
+                        self._size += 1
+                        break
+
+                    other_offset = offsets[other]
+                    if data[other_offset:other_offset + key_lengths[other]] == key:
+                        break  # Replace the previous occurrence of the key.
+
+                    slot = (slot + 1) & mask
+
+                slots[slot] = entry
+
+            offset += len(line)
+
+    def _probe(self, key: bytes) -> int:
+        """
+        Return the slot that contains <key>, or the empty slot where it should be inserted.
+        """
+
+        mask = len(self._slots) - 1
+        slot = hash(key) & mask
+        while True:
+            entry = self._slots[slot]
+            if entry == self._empty_slot or self._key(entry) == key:
+                return slot
+
+            slot = (slot + 1) & mask  # Linear probing
+
+    def _find(self, key: str) -> int:
+        """
+        Return the entry of <key>, or `self._empty_slot` if it does not exist.
+        """
+
+        if type(key) is not str:
+            return self._empty_slot
+
+        return self._slots[self._probe(key.encode(self.encoding))]
+
+    def _key(self, entry: int) -> bytes:
+        offset = self._offsets[entry]
+        return self._map[offset:offset + self._key_lengths[entry]]
+
+    def _value(self, entry: int) -> str:
+        value_length = self._value_lengths[entry]
+        if value_length == 0:
+            return ""
+
+        value_end = self._offsets[entry] + self._key_lengths[entry] + self._separator_length + value_length
+        return self._map[value_end - value_length:value_end].decode(self.encoding)
+
+    def items(self) -> Iterator[Tuple[str, str]]:
+        """
+        Yield every raw key-value pair in the order they appear in the file,
+        including repeated keys.
+        """
+
+        for entry in range(len(self._offsets)):
+            yield self._key(entry).decode(self.encoding), self._value(entry)
+
+    def close(self) -> None:
+        """
+        Close the memory map of the configuration file.
+        """
+
+        if self._map is not None:
+            self._map.close()
+            self._map = None
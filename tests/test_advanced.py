@@ -25,12 +25,26 @@ SOFTWARE.
 """
 
 import os
+import json
+import lzma
+import time
+import itertools
+import random
+import threading
+from types import SimpleNamespace
 from typing import Any
 from typing import Dict
 from typing import Final
+from typing import Tuple
+
+import pytest
 
 from config_handler import exceptions
 from config_handler.advanced import Advanced
+from config_handler.advanced import encryption
+from config_handler.advanced import compression
+from config_handler.advanced import json_backends
+from config_handler.advanced import _index
 
 
 class TestAdvancedConfigHandler:
@@ -38,6 +52,7 @@ class TestAdvancedConfigHandler:
     advanced_configpath: Final[str] = os.path.join(_tests_folder, "test.conf")
 
     bulk_ops_range: Final[int] = 10000
+    json_backend_ops_ranges: Final[Tuple[int, ...]] = (1000, 100000)
 
     test_password: Final[str] = "test_password"
     key_value_pairs: Final[Dict[str, Any]] = {
@@ -188,5 +203,891 @@ class TestAdvancedConfigHandler:
                 config.load()
                 assert len(config) == len(self.key_value_pairs)
 
+    def testContainerFormat(self):
+        config = Advanced(self.advanced_configpath, self.test_password)
+        config.new(name="Container Test", compression="zlib", encryption="aes256")
+        for key, value in self.key_value_pairs.items():
+            config[key] = value
+
+        config.save()
+
+        with open(self.advanced_configpath, "rb") as f:
+            contents = f.read()
+
+        assert contents.startswith(Advanced._magic)
+
+        config = Advanced(self.advanced_configpath, self.test_password)
+        config.load(load_meta=True)
+        assert config.name == "Container Test"
+        assert config.compression == "zlib"
+        assert config.encryption == "aes256"
+        assert not config.is_initialized
+
+        # Corrupt the last byte of the payload.
+        with open(self.advanced_configpath, "wb") as f:
+            f.write(contents[:-1] + bytes([contents[-1] ^ 0xFF]))
+
+        try:
+            Advanced(self.advanced_configpath, self.test_password).load()
+
+        except exceptions.ChecksumError:
+            pass
+
+        else:
+            raise AssertionError("ChecksumError should've been raised.")
+
+        # Truncate the payload.
+        with open(self.advanced_configpath, "wb") as f:
+            f.write(contents[:-1])
+
+        try:
+            Advanced(self.advanced_configpath, self.test_password).load()
+
+        except exceptions.InvalidConfigurationFileError:
+            pass
+
+        else:
+            raise AssertionError("InvalidConfigurationFileError should've been raised.")
+
+    def testLoadLegacyConfig(self):
+        for current_compression in Advanced.supported_compression:
+            for current_encryption in Advanced.supported_encryption:
+                # Create a configuration file using the parser version 2 format.
+                data = json.dumps(self.key_value_pairs)
+                data = compression.compress(data, current_compression)
+                data = encryption.encrypt(data, current_encryption, self.test_password)
+                with open(self.advanced_configpath, "wb") as f:
+                    f.write(json.dumps({
+                        "name": "Legacy Test",
+                        "author": "ConfigHandler Test",
+                        "compression": current_compression,
+                        "encryption": current_encryption,
+                        "encoding": "utf-8",
+                        "parser": {"version": (2, 5, 0)},
+                        "checksum": Advanced(self.advanced_configpath)._generateChecksum(data),
+                        "data": data
+                    }).encode())
+
+                config = Advanced(self.advanced_configpath, self.test_password)
+                config.load()
+                assert config.name == "Legacy Test"
+                assert config.items() == list(self.key_value_pairs.items())
+
+                config.save()  # Convert to the current format.
+                config = Advanced(self.advanced_configpath, self.test_password)
+                config.load()
+                assert config.items() == list(self.key_value_pairs.items())
+
+    def testReadMetadata(self):
+        legacy_configpath = os.path.join(self._tests_folder, "legacy_test.conf")
+        with open(legacy_configpath, "wb") as f:
+            f.write(json.dumps({
+                "name": "Legacy Test",
+                "author": "ConfigHandler Test",
+                "compression": None,
+                "encryption": None,
+                "encoding": "utf-8",
+                "parser": {"version": (2, 5, 0)},
+                "checksum": "",
+                "data": json.dumps({f"key_{index}": index for index in range(0, self.bulk_ops_range)})
+            }).encode())
+
+        with open(legacy_configpath, "rb") as f:
+            Advanced._readLegacyHeader(f)
+            assert f.tell() <= Advanced._legacy_header_chunk_size  # The data is not read.
+
+        config = Advanced(self.advanced_configpath)
+        config.new(name="Metadata Test", compression="zlib")
+        config.save()
+
+        metadata = Advanced.read_metadata((legacy_configpath, self.advanced_configpath))
+        assert metadata[legacy_configpath] == {
+            "name": "Legacy Test",
+            "author": "ConfigHandler Test",
+            "compression": None,
+            "encryption": None,
+            "encoding": "utf-8",
+            "parser": {"version": [2, 5, 0]}
+        }
+        assert metadata[self.advanced_configpath]["name"] == "Metadata Test"
+        assert metadata[self.advanced_configpath]["compression"] == "zlib"
+
+        config = Advanced(legacy_configpath)
+        config.load(load_meta=True)
+        assert config.name == "Legacy Test"
+        assert not config.is_initialized
+
+    def testChecksumCache(self):
+        config = Advanced(self.advanced_configpath, self.test_password)
+        config.new(compression="zlib", encryption="aes256")
+        config["foo"] = "bar"
+        assert config.is_dirty
+
+        checksum = config.checksum
+        assert config.checksum == checksum  # The checksum is reused until the next mutation.
+
+        config.save()
+        assert not config.is_dirty
+        saved_checksum = config.checksum
+        assert saved_checksum != checksum  # The payload is encrypted using a new salt.
+
+        config = Advanced(self.advanced_configpath, self.test_password)
+        config.load()
+        assert not config.is_dirty
+        assert config.checksum == saved_checksum  # The checksum of the file is reused after loading.
+
+        for mutate in (
+            lambda: config.set("nums", 123),
+            lambda: config.setdefault("dec", 3.14),
+            lambda: config.pop("nums"),
+            lambda: config.remove("dec"),
+            lambda: config.popitem(),
+            lambda: config.clear()
+        ):
+            checksum = config.checksum
+            mutate()
+            assert config.is_dirty
+            assert config.checksum != checksum
+
+        checksum = config.checksum
+        config.pop("non-existent")
+        config.compression = None  # The payload must be packed again if the compression algorithm is changed.
+        assert config.checksum != checksum
+
+    def testReuseSalt(self):
+        config = Advanced(self.advanced_configpath, self.test_password, reuse_salt=True)
+        config.new(encryption="aes256")
+        config["foo"] = "bar"
+        config.save()
+
+        with open(self.advanced_configpath, "rb") as f:
+            contents = f.read()
+
+        config = Advanced(self.advanced_configpath, self.test_password, reuse_salt=True)
+        config.load()
+        config["foo"] = "barred"
+        config.save()
+
+        with open(self.advanced_configpath, "rb") as f:
+            new_contents = f.read()
+
+        # The payload starts with the salt.
+        payload_offset = len(Advanced._magic) + Advanced._prefix.size + Advanced._prefix.unpack_from(contents, len(Advanced._magic))[0]
+        assert contents[payload_offset:payload_offset + 16] == new_contents[payload_offset:payload_offset + 16]
+
+        config.load()
+        assert config["foo"] == "barred"
+
+    def testAuthenticatedEncryption(self):
+        config = Advanced(self.advanced_configpath, self.test_password)
+        config.new(encryption="aes256-gcm")
+        config["foo"] = "bar"
+        config.save()
+
+        config = Advanced(self.advanced_configpath, self.test_password)
+        config.load()
+        assert config["foo"] == "bar"
+
+        with open(self.advanced_configpath, "rb") as f:
+            contents = bytearray(f.read())
+
+        contents[-1] ^= 1
+        with open(self.advanced_configpath, "wb") as f:
+            f.write(contents)
+
+        try:
+            Advanced(self.advanced_configpath, self.test_password).load()
+
+        except exceptions.ChecksumError:
+            pass
+
+        else:
+            assert False, "Tampered configuration file was loaded."
+
+    def testRegisteredCodec(self):
+        codec = SimpleNamespace(available=True, compress=lzma.compress, decompress=lzma.decompress)
+        compression.registry.register("lzma", codec)
+        try:
+            config = Advanced(self.advanced_configpath)
+            config.new(compression="lzma")
+            config["foo"] = "bar"
+            config.save()
+
+            config = Advanced(self.advanced_configpath)
+            config.load()
+            assert config.compression == "lzma"
+            assert config["foo"] == "bar"
+
+        finally:
+            compression.registry.unregister("lzma")
+
+        compression.registry.register("lzma", SimpleNamespace(available=False))
+        try:
+            config = Advanced(self.advanced_configpath)
+            try:
+                config.load()
+
+            except NotImplementedError:
+                pass
+
+            else:
+                assert False, "An unavailable algorithm was used."
+
+        finally:
+            compression.registry.unregister("lzma")
+
+    def testStreamingPayload(self):
+        data = {f"key{i}": f"value{i}" * (i % 7) for i in range(20000)}  # Larger than `Advanced._chunk_size`.
+        for compression_name, encryption_name in (
+            (None, None),
+            ("zlib", "aes256"),
+            ("lz4", "aes256-gcm"),
+            (None, "aes256-gcm-chunked")
+        ):
+            config = Advanced(self.advanced_configpath, self.test_password, json_backend="json")
+            config.new(compression=compression_name, encryption=encryption_name)
+            for key, value in data.items():
+                config[key] = value
+
+            assert b"".join(config._encodeChunks()) == json.dumps(data).encode()
+            config.save()
+            checksum = config.checksum
+
+            config = Advanced(self.advanced_configpath, self.test_password)
+            config.load()
+            assert config.checksum == checksum
+            assert all(config[key] == value for key, value in data.items())
+
+    def testCompressionOptions(self):
+        config = Advanced(self.advanced_configpath)
+        config.new(compression="lz4", compression_options={"level": 9, "block_size": 65536})
+        config["foo"] = "bar" * 1000
+        config.save()
+
+        config = Advanced(self.advanced_configpath)
+        config.load()
+        assert config.compression_options == {"level": 9, "block_size": 65536}
+        assert config["foo"] == "bar" * 1000
+
+        try:
+            config.compression_options = {"unknown": 1}
+
+        except TypeError:
+            pass
+
+        else:
+            assert False, "Invalid compression options were accepted."
+
+    def testAutoCompression(self):
+        def payloadCompression() -> Any:
+            with open(self.advanced_configpath, "rb") as f:
+                f.read(len(Advanced._magic))
+                return Advanced._readContainerHeader(f)[0]["payload_compression"]
+
+        config = Advanced(self.advanced_configpath)
+        config.new(compression="auto")
+        config["foo"] = "bar"
+        config.save()
+        assert payloadCompression() is None  # The payload is too small.
+
+        config = Advanced(self.advanced_configpath)
+        config.load()
+        assert config.compression == "auto"
+        assert config["foo"] == "bar"
+
+        config["foo"] = "bar" * 100000
+        config.save()
+        assert payloadCompression() == "zlib"  # The payload compresses well.
+
+        tokens = [os.urandom(8).hex() for _ in range(2000)]
+        value = ''.join(random.choices(tokens, k=10000))
+        config["foo"] = value
+        config.save()
+        assert payloadCompression() == "lz4"  # The payload does not compress well, so the faster algorithm is used.
+
+        value = os.urandom(100000).hex()
+        config["foo"] = value
+        config.save()
+        assert payloadCompression() is None  # The payload does not compress using the faster algorithm.
+
+        config = Advanced(self.advanced_configpath)
+        config.load()
+        assert config["foo"] == value
+
+    def testCompressionDictionary(self):
+        config = Advanced(self.advanced_configpath)
+        config.new(compression="zlib")
+        for key, value in self.key_value_pairs.items():
+            config[key] = value
+
+        config.save()
+
+        zdict = Advanced.train_dictionary([self.advanced_configpath] * 2)
+        dictionary_id = compression.dictionary.register(zdict)
+        try:
+            config.compression_options = {"dictionary": dictionary_id}
+            config.save()
+
+            config = Advanced(self.advanced_configpath)
+            config.load()
+            assert config.compression_options == {"dictionary": dictionary_id}
+            assert config.items() == list(self.key_value_pairs.items())
+
+        finally:
+            compression.dictionary.unregister(dictionary_id)
+
+        config = Advanced(self.advanced_configpath)
+        config.load(load_meta=True)  # The metadata can be read without the dictionary.
+        try:
+            config.load()
+
+        except ValueError:
+            pass
+
+        else:
+            assert False, "The configuration file was loaded without its dictionary."
+
+    def testLazyLoad(self):
+        config = Advanced(self.advanced_configpath, self.test_password)
+        config.new(name="lazy", compression="zlib", encryption="aes256")
+        for key, value in self.key_value_pairs.items():
+            config[key] = value
+
+        config.save()
+        checksum = config.checksum
+
+        for access in (
+            lambda config: config["foo"],
+            lambda config: config.get("foo"),
+            lambda config: config.items(),
+            lambda config: config.keys(),
+            lambda config: "foo" in config,
+            lambda config: len(config)
+        ):
+            config = Advanced(self.advanced_configpath, self.test_password)
+            config.load(lazy=True)
+            assert config.is_initialized and not config.is_decoded
+            assert config.name == "lazy"
+            assert config.checksum == checksum  # The checksum does not need the decoded payload.
+            assert not config.is_decoded
+
+            config.encryption = None  # The payload is still decoded using the properties it was loaded with.
+            access(config)
+            assert config.is_decoded
+            assert config.items() == list(self.key_value_pairs.items())
+
+        config = Advanced(self.advanced_configpath, "wrong_password")
+        config.load(lazy=True)
+        try:
+            config["foo"]
+
+        except Exception:
+            assert not config.is_initialized
+
+        else:
+            assert False, "The payload was decoded using the wrong password."
+
+        with open(self.advanced_configpath, "r+b") as f:
+            f.seek(-1, os.SEEK_END)
+            last_byte = f.read(1)
+            f.seek(-1, os.SEEK_END)
+            f.write(bytes((last_byte[0] ^ 1,)))
+
+        try:
+            Advanced(self.advanced_configpath, self.test_password).load(lazy=True)
+
+        except exceptions.ChecksumError:
+            pass
+
+        else:
+            assert False, "The checksum was not verified."
+
+    def testShards(self):
+        def shardIndex() -> list:
+            with open(self.advanced_configpath, "rb") as f:
+                f.read(len(Advanced._magic))
+                return Advanced._readContainerHeader(f)[0]["shards"]
+
+        for shards in (-1, 0):
+            try:
+                Advanced(self.advanced_configpath).new(shards=shards)
+
+            except ValueError:
+                pass
+
+            else:
+                assert False, f"A configuration file with {shards} shards was made."
+
+        data = {f"key{i}": {"index": i, "value": "value" * (i % 5)} for i in range(5000)}
+        for compression_name, encryption_name in ((None, None), ("auto", "aes256"), ("zlib", "aes256-gcm")):
+            config = Advanced(self.advanced_configpath, self.test_password)
+            config.new(compression=compression_name, encryption=encryption_name, shards=8)
+            for key, value in data.items():
+                config[key] = value
+
+            config.save()
+            checksum = config.checksum
+            index = shardIndex()
+            assert len(index) == 8
+
+            for options in ({}, {"lazy": True}, {"workers": 2}):
+                config = Advanced(self.advanced_configpath, self.test_password)
+                config.load(**options)
+                assert config.shards == 8
+                assert config.checksum == checksum
+                assert config["key42"] == data["key42"]
+                assert config.is_decoded != ("lazy" in options)  # Only the shard of the key is decoded.
+                assert dict(config.items()) == data
+
+            config["key42"] = "modified"
+            config.save()
+            assert config.checksum != checksum
+            new_index = shardIndex()
+            assert sum(entry != new_entry for entry, new_entry in zip(index, new_index)) == 1  # Only one shard is packed again.
+
+            config = Advanced(self.advanced_configpath, self.test_password)
+            config.load(lazy=True)
+            assert config.get("key42") == "modified"
+            assert config.get("key43") == data["key43"]
+
+        config = Advanced(self.advanced_configpath)
+        config.new(compression="zlib", shards=4)
+        for key, value in data.items():
+            config[key] = value
+
+        config.save()
+        with open(self.advanced_configpath, "r+b") as f:
+            f.seek(-1, os.SEEK_END)
+            last_byte = f.read(1)
+            f.seek(-1, os.SEEK_END)
+            f.write(bytes((last_byte[0] ^ 1,)))
+
+        config = Advanced(self.advanced_configpath)
+        config.load(lazy=True)  # The shards are only verified when they are decoded.
+        try:
+            config.items()
+
+        except exceptions.ChecksumError:
+            assert not config.is_initialized
+
+        else:
+            assert False, "A corrupted shard was loaded."
+
+    def testIndexed(self):
+        data = {f"key{i}": {"index": i, "value": "value" * (i % 5)} for i in range(5000)}
+        data["unicode \u00e9"] = "\u4e2d"
+        for compression_name in (None, "zlib", "auto"):
+            config = Advanced(self.advanced_configpath)
+            config.new(compression=compression_name, indexed=True)
+            for key, value in data.items():
+                config[key] = value
+
+            config.save()
+            checksum = config.checksum
+
+            for readonly in (True, False):
+                config = Advanced(self.advanced_configpath, readonly=readonly)
+                config.load(lazy=True)
+                assert config.indexed
+                assert config["key42"] == data["key42"]
+                assert config["unicode \u00e9"] == "\u4e2d"
+                assert config.get("missing", "expected_value") == "expected_value"
+                assert "key4999" in config and "missing" not in config
+                assert not config.is_decoded  # Only the blocks of the keys are decoded.
+                assert config.checksum == checksum
+                assert config.items() == list(data.items())
+
+            config = Advanced(self.advanced_configpath)
+            config.load()
+            assert config.items() == list(data.items())
+            config["key42"] = "modified"
+            config.save()
+            assert config.checksum != checksum
+
+        try:
+            Advanced(self.advanced_configpath, self.test_password).new(encryption="aes256", indexed=True)
+
+        except ValueError:
+            pass
+
+        else:
+            assert False, "The key index of an encrypted configuration file is not encrypted."
+
+        with open(self.advanced_configpath, "r+b") as f:
+            f.seek(len(Advanced._magic))
+            header_length = Advanced._prefix.unpack(f.read(Advanced._prefix.size))[0]
+            f.seek(header_length, os.SEEK_CUR)  # The first block starts after the header.
+            first_byte = f.read(1)
+            f.seek(-1, os.SEEK_CUR)
+            f.write(bytes((first_byte[0] ^ 1,)))
+
+        config = Advanced(self.advanced_configpath, readonly=True)
+        config.load(lazy=True)  # The blocks are only verified when they are read.
+        assert config["key4999"] == data["key4999"]
+        try:
+            config["key0"]
+
+        except exceptions.ChecksumError:
+            assert not config.is_initialized
+
+        else:
+            assert False, "A corrupted block was read."
+
+        config = Advanced(self.advanced_configpath)
+        config.new(indexed=True)
+        for key, value in data.items():
+            config[key] = value
+
+        config.save()
+        with open(self.advanced_configpath, "r+b") as f:
+            trailer = _index._trailer
+            f.seek(-trailer.size, os.SEEK_END)
+            capacity = trailer.unpack(f.read(trailer.size))[2]
+            table_offset = f.seek(-trailer.size - capacity * _index._slot.size, os.SEEK_END)
+            table = f.read(capacity * _index._slot.size)
+            slot = next(slot for slot in range(capacity) if _index._slot.unpack_from(table, slot * _index._slot.size)[3])
+            f.seek(table_offset + slot * _index._slot.size + _index._slot.size - 4)
+            f.write(bytes(4))  # Mark the slot as empty.
+
+        try:
+            Advanced(self.advanced_configpath, readonly=True).load(lazy=True)
+
+        except exceptions.ChecksumError:
+            pass
+
+        else:
+            assert False, "A corrupted hash table was loaded."
+
+    def testSecrets(self):
+        config = Advanced(self.advanced_configpath, self.test_password)
+        config.new()
+        for key, value in self.key_value_pairs.items():
+            config[key] = value
+
+        config.set_secret("token", {"user": "admin", "password": "hunter2"})
+        config.set_secret("api_key", "0123456789")
+        assert config["token"] == {"user": "admin", "password": "hunter2"}
+        config.save()
+
+        with open(self.advanced_configpath, "rb") as f:
+            assert b"hunter2" not in f.read()
+
+        config = Advanced(self.advanced_configpath, self.test_password)
+        config.load()
+        assert config.is_secret("token") and not config.is_secret("foo")
+        assert config.get("api_key") == "0123456789"
+        assert dict(config.items())["token"] == {"user": "admin", "password": "hunter2"}
+        assert config.pop("api_key") == "0123456789"
+
+        config["token"] = "not a secret"
+        assert not config.is_secret("token")
+        config.save()
+
+        config = Advanced(self.advanced_configpath, "wrong_password")
+        config.load()  # The other values are not encrypted.
+        assert config["foo"] == "bar"
+        assert config["token"] == "not a secret"
+        config.set_secret("api_key", "0123456789")
+        config.save()
+
+        config = Advanced(self.advanced_configpath, self.test_password)
+        config.load()
+        try:
+            config["api_key"]
+
+        except Exception:
+            pass
+
+        else:
+            assert False, "The secret was decrypted using the wrong password."
+
+    def testAtomicSave(self):
+        for durability in ("none", "data", "full"):
+            config = Advanced(self.advanced_configpath, durability=durability)
+            config.new()
+            for key, value in self.key_value_pairs.items():
+                config[key] = value
+
+            config.save()
+            config = Advanced(self.advanced_configpath)
+            config.load()
+            assert config.items() == list(self.key_value_pairs.items())
+
+        with open(self.advanced_configpath, "rb") as f:
+            config_contents = f.read()
+
+        config["unserializable"] = object()
+        try:
+            config.save()
+
+        except TypeError:
+            pass
+
+        else:
+            assert False, "An unserializable value was saved."
+
+        with open(self.advanced_configpath, "rb") as f:
+            assert f.read() == config_contents  # The old configuration file is kept.
+
+        assert not any(name.endswith(".tmp") for name in os.listdir(self._tests_folder))
+
+    def testGroupCommit(self):
+        for shards in (None, 4):
+            config = Advanced(self.advanced_configpath, group_commit=0.05)
+            config.new(shards=shards)
+            futures = []
+            for key, value in self.key_value_pairs.items():
+                config[key] = value
+                futures.append(config.save(wait=False))
+
+            assert all(future is futures[0] for future in futures)  # The saves are committed together.
+            futures[0].result(timeout=10)
+            assert not config.is_dirty
+
+            def worker(number: int) -> None:
+                config[f"thread{number}"] = number
+                config.save()
+
+            threads = [threading.Thread(target=worker, args=(number,)) for number in range(8)]
+            for thread in threads:
+                thread.start()
+
+            for thread in threads:
+                thread.join()
+
+            loaded_config = Advanced(self.advanced_configpath)
+            loaded_config.load()
+            assert loaded_config.get("thread7") == 7
+            assert loaded_config.get("foo") == self.key_value_pairs["foo"]
+
+        config["unserializable"] = object()
+        try:
+            config.save()
+
+        except TypeError:
+            pass
+
+        else:
+            assert False, "The error of the group commit was not raised."
+
+        assert config.is_dirty
+
+        with Advanced(self.advanced_configpath, group_commit=60) as config:
+            config.new()
+            config["foo"] = "committed"
+            future = config.save(wait=False)
+
+        assert future.done()  # Leaving the `with` block waits for the group commit.
+        config.load()
+        assert config["foo"] == "committed"
+
+    def testAutoSave(self):
+        with Advanced(self.advanced_configpath, "password", auto_save=0.05, auto_save_max_delay=0.2) as config:
+            config.new(shards=4)
+            config.save()
+            for key, value in self.key_value_pairs.items():
+                config[key] = value
+
+            config.set_secret("password", "hunter2")
+            time.sleep(1)
+            assert not config.is_dirty
+            loaded_config = Advanced(self.advanced_configpath, "password")
+            loaded_config.load()
+            assert loaded_config.get("password") == "hunter2" and loaded_config.is_secret("password")
+            assert loaded_config.get("foo") == self.key_value_pairs["foo"]
+
+            for count in range(100):
+                config["count"] = count
+
+        loaded_config.load()  # Saved when leaving the `with` block.
+        assert loaded_config["count"] == 99
+
+        config = Advanced(self.advanced_configpath, "password", auto_save=60)
+        config.load()
+        config["unserializable"] = object()
+        try:
+            config.flush()
+
+        except TypeError:
+            pass
+
+        else:
+            assert False, "The error of the auto-save was not raised."
+
+        del config["unserializable"]
+        config.flush()
+        assert not config.is_dirty
+
+    def testSkipUnchangedSave(self):
+        def inode() -> int:
+            return os.stat(self.advanced_configpath).st_ino  # The file is replaced when it is saved.
+
+        for shards in (None, 4):
+            config = Advanced(self.advanced_configpath)
+            config.new(shards=shards)
+            for key, value in self.key_value_pairs.items():
+                config[key] = value
+
+            config.save()
+            saved_inode = inode()
+            config.save()
+            config.load()
+            config.save()
+            config["foo"] = self.key_value_pairs["foo"]  # Modified, but the payload is the same.
+            config.save()
+            assert inode() == saved_inode and not config.is_dirty
+
+            config.author = "someone"
+            config.save()
+            assert inode() != saved_inode
+
+            other_config = Advanced(self.advanced_configpath)
+            other_config.load()
+            other_config["foo"] = "modified by others"
+            other_config.save()
+            config.save()  # The file is modified by others, so it is saved again.
+            other_config.load()
+            assert other_config["foo"] == self.key_value_pairs["foo"]
+
+        config = Advanced(self.advanced_configpath)
+        config.new()
+        config["list"] = [1, 2]
+        config.save()
+        config["list"].append(3)  # In-place modifications are not tracked, but still saved.
+        config.save()
+        config.load()
+        assert config["list"] == [1, 2, 3]
+
+    def testReloadIfChanged(self):
+        config = Advanced(self.advanced_configpath, "password")
+        config.new(encryption="aes256")
+        for key, value in self.key_value_pairs.items():
+            config[key] = value
+
+        config.save()
+        assert not config.reload_if_changed()  # The file is not modified since it was saved.
+        config.load()
+        assert not config.reload_if_changed()
+
+        other_config = Advanced(self.advanced_configpath, "password")
+        other_config.load()
+        other_config["foo"] = "modified by others"
+        other_config.save()
+        assert config.reload_if_changed(lazy=True)
+        assert config["foo"] == "modified by others"
+        assert not config.reload_if_changed()
+
+    def testJSONBackends(self):
+        data = {
+            "foo": "bar",
+            "unicode": "\u00e9\u4e2d\U0001f600 / \\",
+            "surrogate": "\ud800",
+            "big": 2 ** 70,
+            "negative": -(2 ** 63) - 1,
+            "float": 0.1,
+            "special": [float("inf"), float("-inf")],
+            "nested": {"list": [1, 2.5, None, True, {"a": []}], "empty": {}}
+        }
+        for backend in json_backends.registry.names():
+            if not json_backends.registry.isAvailable(backend):
+                continue
+
+            config = Advanced(self.advanced_configpath, json_backend=backend)
+            config.new()
+            for key, value in data.items():
+                config[key] = value
+
+            config["nan"] = float("nan")
+            config.save()
+
+            for other_backend in json_backends.registry.names():
+                if not json_backends.registry.isAvailable(other_backend):
+                    continue
+
+                config = Advanced(self.advanced_configpath, json_backend=other_backend)
+                config.load()
+                assert all(config[key] == value and type(config[key]) is type(value) for key, value in data.items())
+                assert config["nan"] != config["nan"]  # NaN is the only value that is not equal to itself.
+
+        try:
+            Advanced(self.advanced_configpath, json_backend="unknown").load()
+
+        except ValueError:
+            pass
+
+        else:
+            assert False, "An unknown JSON backend was used."
+
+    def testNonUTF8Encoding(self):
+        for encoding in ("ascii", "latin-1"):
+            for backend in json_backends.registry.names():
+                if not json_backends.registry.isAvailable(backend):
+                    continue
+
+                config = Advanced(self.advanced_configpath, encoding=encoding, json_backend=backend)
+                config.new()
+                config["unicode"] = "\u4e2d\u00e9"
+                config.save()
+
+                config = Advanced(self.advanced_configpath, encoding=encoding, json_backend=backend)
+                config.load()
+                assert config["unicode"] == "\u4e2d\u00e9"
+
+    def testMultiChunkEncoding(self):
+        for encoding in ("utf-16", "utf-32"):
+            config = Advanced(self.advanced_configpath, encoding=encoding)
+            config.new()
+            for index in range(20000):  # The payload is larger than `Advanced._chunk_size`.
+                config[f"key{index}"] = f"value\u00e9{index}"
+
+            assert len(b"".join(config._encodeChunks())) > Advanced._chunk_size
+            config.save()
+
+            config = Advanced(self.advanced_configpath, encoding=encoding)
+            config.load()
+            assert len(config) == 20000
+            assert config["key19999"] == "value\u00e919999"
+
+    @pytest.mark.parametrize("backend", json_backends.preferred_backends)
+    @pytest.mark.parametrize("bulk_ops_range", json_backend_ops_ranges)
+    def testJSONBackendSave(self, benchmark, backend, bulk_ops_range):
+        """
+        Benchmark the performance of `save()` using the JSON backend <backend>.
+        """
+
+        if not json_backends.registry.isAvailable(backend):
+            pytest.skip(f"The JSON backend {backend} is unavailable.")
+
+        config = Advanced(self._jsonBackendConfigPath(backend, bulk_ops_range), json_backend=backend)
+        config.new()
+        for index in range(bulk_ops_range):
+            config[f"key_{index}"] = {"index": index, "value": f"value_{index}", "ratio": index / 3}
+
+        counter = itertools.count()
+
+        def modify():
+            config["key_0"] = next(counter)  # Unmodified configuration files are not saved.
+
+        benchmark.pedantic(config.save, setup=modify, rounds=5)
+
+    @pytest.mark.parametrize("backend", json_backends.preferred_backends)
+    @pytest.mark.parametrize("bulk_ops_range", json_backend_ops_ranges)
+    def testJSONBackendLoad(self, benchmark, backend, bulk_ops_range):
+        """
+        Load the configuration file made by `self.testJSONBackendSave()`.
+        This benchmarks the performance of `load()` using the JSON backend <backend>.
+        """
+
+        if not json_backends.registry.isAvailable(backend):
+            pytest.skip(f"The JSON backend {backend} is unavailable.")
+
+        config = Advanced(self._jsonBackendConfigPath(backend, bulk_ops_range), json_backend=backend)
+        benchmark(config.load)
+
+        assert len(config) == bulk_ops_range
+
+    def _jsonBackendConfigPath(self, backend: str, bulk_ops_range: int) -> str:
+        return os.path.join(self._tests_folder, f"json_{backend}_{bulk_ops_range}.conf")
+
     def testDunderMethods(self):
         pass
@@ -24,8 +24,10 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
+import bz2
 import random
 import string
+from types import SimpleNamespace
 
 from config_handler.advanced import compression
 
@@ -42,3 +44,100 @@ class TestAdvancedCompressions:
             text = ''.join(random.choices(string.ascii_letters, k=random.randint(64, 128)))
             compressed = compression.compress(text, "lz4")
             assert text == compression.decompress(compressed, "lz4")
+
+    def testStreaming(self):
+        text = ''.join(random.choices(string.ascii_letters, k=100000)).encode()
+        chunks = [text[i:i + 4096] for i in range(0, len(text), 4096)]
+        for algorithm in (None, "zlib", "lz4"):
+            compressor = compression.compressor(algorithm)
+            compressed = b"".join(compressor.compress(chunk) for chunk in chunks) + compressor.flush()
+            assert compression.decompressBytes(compressed, algorithm) == text
+
+            decompressor = compression.decompressor(algorithm)
+            decompressed = b"".join(decompressor.decompress(compressed[i:i + 1000]) for i in range(0, len(compressed), 1000))
+            assert decompressed + decompressor.flush() == text
+
+    def testOptions(self):
+        text = ''.join(random.choices("abc", k=100000)).encode()
+        assert len(compression.compressBytes(text, "zlib", {"level": 9})) < len(compression.compressBytes(text, "zlib", {"level": 0}))
+        for options in ({"level": 9}, {"block_size": 65536}, {"acceleration": 8}, {"level": 0, "block_size": 4194304}):
+            compressed = compression.compressBytes(text, "lz4", options)
+            assert compression.decompressBytes(compressed, "lz4") == text
+
+            compressor = compression.compressor("lz4", options)
+            assert compression.decompressBytes(compressor.compress(text) + compressor.flush(), "lz4") == text
+
+        for options in ({"block_size": 1000}, {"acceleration": 0}, {"level": 9, "acceleration": 2}):
+            try:
+                compression.compressBytes(text, "lz4", options)
+
+            except ValueError:
+                pass
+
+            else:
+                assert False, f"Invalid options were accepted: {options}"
+
+    def testDictionary(self):
+        samples = [
+            f'{{"hostname": "host{i}", "port": {8000 + i}, "timeout": {i % 30}, "enabled": true}}'.encode()
+            for i in range(50)
+        ]
+        zdict = compression.dictionary.train(samples[:25], 4096)
+        assert 0 < len(zdict) <= 4096
+
+        dictionary_id = compression.dictionary.register(zdict)
+        try:
+            assert compression.dictionary.get(dictionary_id) == zdict
+            for algorithm in ("zlib", "lz4"):
+                for sample in samples[25:]:
+                    compressed = compression.compressBytes(sample, algorithm, {"dictionary": dictionary_id})
+                    assert len(compressed) < len(compression.compressBytes(sample, algorithm))
+                    assert compression.decompressBytes(compressed, algorithm, {"dictionary": dictionary_id}) == sample
+
+                    compressor = compression.compressor(algorithm, {"dictionary": dictionary_id})
+                    decompressor = compression.decompressor(algorithm, {"dictionary": dictionary_id})
+                    compressed = compressor.compress(sample) + compressor.flush()
+                    assert decompressor.decompress(compressed) + decompressor.flush() == sample
+
+        finally:
+            compression.dictionary.unregister(dictionary_id)
+
+        try:
+            compression.compressBytes(samples[0], "zlib", {"dictionary": dictionary_id})
+
+        except ValueError:
+            pass
+
+        else:
+            assert False, "An unregistered dictionary was used."
+
+    def testRegistry(self):
+        codec = SimpleNamespace(available=True, compress=bz2.compress, decompress=bz2.decompress)
+        compression.registry.register("bz2", codec)
+        try:
+            assert "bz2" in compression.registry
+            assert compression.isAvailable("bz2")
+            text = ''.join(random.choices(string.ascii_letters, k=random.randint(64, 128)))
+            assert text == compression.decompress(compression.compress(text, "bz2"), "bz2")
+
+            try:
+                compression.registry.register("bz2", codec)
+
+            except ValueError:
+                pass
+
+            else:
+                assert False, "A registered algorithm was replaced."
+
+        finally:
+            compression.registry.unregister("bz2")
+
+        assert "bz2" not in compression.registry
+        try:
+            compression.compressBytes(b"foo", "bz2")
+
+        except ValueError:
+            pass
+
+        else:
+            assert False, "An unregistered algorithm was used."
@@ -24,10 +24,15 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
+import os
 import string
 import random
+import hashlib
 
+from config_handler import exceptions
 from config_handler.advanced import encryption
+from config_handler.advanced.encryption import kdf
+from config_handler.advanced.encryption import aes256_gcm_chunked
 
 
 class TestAdvancedEncryptions:
@@ -38,3 +43,124 @@ class TestAdvancedEncryptions:
         ciphertext = encryption.encrypt(text, "aes256", key)
 
         assert text == encryption.decrypt(ciphertext, "aes256", key)
+
+    def testDerivedKeyCache(self):
+        cache = kdf.DerivedKeyCache(maxsize=2, ttl=None)
+        key = cache.derive("password", b"salt_1", 32, 1000)
+        assert cache.derive("password", b"salt_1", 32, 1000) == key
+        assert cache.derive("another password", b"salt_1", 32, 1000) != key
+        assert len(cache) == 2
+
+        cache.derive("password", b"salt_2", 32, 1000)
+        assert len(cache) == 2  # The least recently used key is evicted.
+        assert (hashlib.sha256(b"password").digest(), b"salt_1", 1000, 32) not in cache._keys
+
+        cache.ttl = 0  # Expire all cached keys.
+        assert cache.derive("password", b"salt_2", 32, 1000) == kdf.PBKDF2("password", b"salt_2", dkLen=32, count=1000)
+
+        cache.maxsize = 0  # Disable caching.
+        cache.clear()
+        cache.derive("password", b"salt_1", 32, 1000)
+        assert len(cache) == 0
+
+    def testAES256SaltReuse(self):
+        key = ''.join(random.choices(string.ascii_letters, k=random.randint(8, 16)))
+        text = ''.join(random.choices(string.ascii_letters, k=random.randint(64, 128))).encode()
+
+        ciphertext = encryption.encryptBytes(text, "aes256", key)
+        salt = encryption.getSalt(ciphertext, "aes256")
+        reencrypted = encryption.encryptBytes(text, "aes256", key, salt)
+
+        assert encryption.getSalt(reencrypted, "aes256") == salt
+        assert reencrypted != ciphertext  # A new initialization vector is still used.
+        assert encryption.decryptBytes(reencrypted, "aes256", key) == text
+
+    def testAES256GCM(self):
+        key = ''.join(random.choices(string.ascii_letters, k=random.randint(8, 16)))
+        text = ''.join(random.choices(string.ascii_letters, k=random.randint(64, 128))).encode()
+
+        assert encryption.isAuthenticated("aes256-gcm")
+        assert not encryption.isAuthenticated("aes256")
+        ciphertext = encryption.encryptBytes(text, "aes256-gcm", key)
+        assert encryption.decryptBytes(ciphertext, "aes256-gcm", key) == text
+
+        tampered = bytearray(ciphertext)
+        tampered[-1] ^= 1
+        try:
+            encryption.decryptBytes(bytes(tampered), "aes256-gcm", key)
+
+        except exceptions.ChecksumError:
+            pass
+
+        else:
+            assert False, "Tampered data was decrypted."
+
+    def testMemoryView(self):
+        key = ''.join(random.choices(string.ascii_letters, k=random.randint(8, 16)))
+        for algorithm in ("aes256", "aes256-gcm", "aes256-gcm-chunked"):
+            for length in (0, 15, 16, 17, 4096):
+                text = ''.join(random.choices(string.ascii_letters, k=length)).encode()
+                ciphertext = encryption.encryptBytes(memoryview(text), algorithm, key)
+                assert encryption.decryptBytes(memoryview(ciphertext), algorithm, key) == text
+
+    def testStreaming(self):
+        key = ''.join(random.choices(string.ascii_letters, k=random.randint(8, 16)))
+        for algorithm in ("aes256", "aes256-gcm", "aes256-gcm-chunked"):
+            for length in (0, 15, 16, 17, 10000):
+                text = ''.join(random.choices(string.ascii_letters, k=length)).encode()
+
+                encryptor = encryption.encryptor(algorithm, key)
+                ciphertext = b"".join(encryptor.update(text[i:i + 7]) for i in range(0, len(text), 7)) + encryptor.finalize()
+                assert encryption.decryptBytes(ciphertext, algorithm, key) == text
+
+                decryptor = encryption.decryptor(algorithm, key)
+                plaintext = b"".join(decryptor.update(ciphertext[i:i + 5]) for i in range(0, len(ciphertext), 5))
+                assert plaintext + decryptor.finalize() == text
+
+    def testAES256GCMChunked(self):
+        key = ''.join(random.choices(string.ascii_letters, k=random.randint(8, 16)))
+        chunk_size = aes256_gcm_chunked.chunk_size
+        stored_chunk_size = chunk_size + aes256_gcm_chunked.tag_size
+        header_size = aes256_gcm_chunked._header.size
+
+        text = os.urandom(chunk_size * 2 + 1000)
+        ciphertext = encryption.encryptBytes(text, "aes256-gcm-chunked", key)
+        assert len(ciphertext) == header_size + len(text) + aes256_gcm_chunked.tag_size * 3
+        assert encryption.decryptBytes(ciphertext, "aes256-gcm-chunked", key) == text
+
+        first_chunk = ciphertext[header_size:header_size + stored_chunk_size]
+        second_chunk = ciphertext[header_size + stored_chunk_size:header_size + stored_chunk_size * 2]
+        tampered = bytearray(ciphertext)
+        tampered[header_size + chunk_size] ^= 1
+        for altered in (
+            bytes(tampered),  # Modified data
+            ciphertext[:header_size + stored_chunk_size * 2],  # Truncated at a chunk boundary
+            ciphertext[:header_size] + second_chunk + first_chunk + ciphertext[header_size + stored_chunk_size * 2:]  # Reordered
+        ):
+            try:
+                encryption.decryptBytes(altered, "aes256-gcm-chunked", key)
+
+            except exceptions.ChecksumError:
+                pass
+
+            else:
+                assert False, "Altered data was decrypted."
+
+        # Payloads encrypted with the same salt (e.g., with `reuse_salt`) are encrypted with different keys.
+        salt = aes256_gcm_chunked.getSalt(ciphertext)
+        payloads = [aes256_gcm_chunked.encrypt(b"data", key, salt) for _ in range(2)]
+        assert [aes256_gcm_chunked.getSalt(payload) for payload in payloads] == [salt, salt]
+        assert payloads[0][:header_size] != payloads[1][:header_size]
+        assert payloads[0][header_size:] != payloads[1][header_size:]
+        for payload in payloads:
+            assert aes256_gcm_chunked.decrypt(payload, key) == b"data"
+
+        swapped = payloads[1][:header_size] + payloads[0][header_size:]  # The payload salt of another payload
+        try:
+            aes256_gcm_chunked.decrypt(swapped, key)
+
+        except exceptions.ChecksumError:
+            pass
+
+        else:
+            assert False, "Data was decrypted using the payload salt of another payload."
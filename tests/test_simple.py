@@ -25,9 +25,15 @@ SOFTWARE.
 """
 
 import os
+import time
+import itertools
+import base64
 from typing import Any
 from typing import Dict
 from typing import Final
+from typing import Tuple
+
+import pytest
 
 from config_handler.simple import Simple
 
@@ -37,7 +43,7 @@ class TestSimpleConfigHandler:
     simple_configpath: Final[str] = os.path.join(_tests_folder, "test.conf")
     simple_base64_configpath: Final[str] = os.path.join(_tests_folder, "base64_test.conf")
 
-    bulk_ops_range: Final[int] = 10000
+    bulk_ops_ranges: Final[Tuple[int, ...]] = (10 ** 4, 10 ** 5, 10 ** 6)
 
     key_value_pairs: Final[Dict[str, Any]] = {
         "foo": "bar",
@@ -71,6 +77,9 @@ class TestSimpleConfigHandler:
     if os.path.exists(simple_base64_configpath):
         os.remove(simple_base64_configpath)
 
+    if os.path.exists(simple_configpath + Simple._journal_suffix):
+        os.remove(simple_configpath + Simple._journal_suffix)
+
     def testNewConfig(self):
         """
         Create a new configuration file.
@@ -309,6 +318,345 @@ class TestSimpleConfigHandler:
         with open(self.simple_configpath, "r") as f:
             assert f.read() == "foo=bar\nnums=123\ndec=3.14\nAboolean=True\n"
 
+    def testIterFile(self):
+        """
+        Test if `iter_file()` yields the same pairs as `load()`, including Base64 files
+        that are wrapped into multiple lines.
+        """
+
+        with open(self.simple_base64_configpath, 'wb') as f:
+            f.write(base64.encodebytes(b"# comment\nfoo=bar\nnums=123\ndec=3.14\nAboolean=True\nfoo=baz\n"))
+
+        config = Simple(self.simple_base64_configpath, isbase64=True)
+        assert list(config.iter_file()) == [
+            ("foo", "bar"),
+            ("nums", 123),
+            ("dec", 3.14),
+            ("Aboolean", True),
+            ("foo", "baz")
+        ]
+        assert len(config) == 0  # `iter_file()` does not load the pairs to memory.
+
+        config.load()
+        assert config.items() == [("foo", "baz"), ("nums", 123), ("dec", 3.14), ("Aboolean", True)]
+
+    def testLazyLoad(self):
+        """
+        Test lazy loading of a memory-mapped configuration file.
+        """
+
+        with open(self.simple_configpath, 'w') as f:
+            f.write("# comment\nfoo=bar\nnums=123\ndec=3.14\nAboolean=True\nempty=\nfoo=baz\n")
+
+        config = Simple(self.simple_configpath)
+        config.load()
+        try:
+            config.load(lazy=True)
+
+        except ValueError:
+            pass  # Lazy loading is only supported in read-only mode.
+
+        else:
+            assert False  # ValueError should've been raised.
+
+        assert config["foo"] == "baz"  # The loaded pairs are kept.
+
+        config = Simple(self.simple_configpath, readonly=True)
+        config.load(lazy=True)
+
+        assert len(config) == 5
+        assert config["foo"] == "baz"  # The last occurrence of a key is used.
+        assert config["nums"] == 123
+        assert config["dec"] == 3.14
+        assert config["Aboolean"] is True
+        assert config["empty"] == ""
+        assert "# comment" not in config
+        assert "missing" not in config
+        assert config.get("missing", "expected_value") == "expected_value"
+        try:
+            config["missing"]
+
+        except KeyError:
+            pass  # This is expected.
+
+        else:
+            assert False  # KeyError should've been raised.
+
+        config["new key"] = "new value"  # Modifying the configuration file loads all pairs.
+        assert len(config) == 6
+        assert config.items() == [
+            ("foo", "baz"),
+            ("nums", 123),
+            ("dec", 3.14),
+            ("Aboolean", True),
+            ("empty", ""),
+            ("new key", "new value")
+        ]
+
+        with open(self.simple_configpath, 'w') as f:
+            f.write("")
+
+        config.load(lazy=True)
+        assert len(config) == 0
+
+    def testJournalMode(self):
+        """
+        Test if journal mode appends changes to the journal file and replays them when loading.
+        """
+
+        for isbase64 in (False, True):
+            journal_path = self.simple_configpath + ".journal"
+            config = Simple(self.simple_configpath, isbase64=isbase64, journal=True)
+            for key, value in self.key_value_pairs.items():
+                config[key] = value
+
+            config.save()  # The whole file is written since it was not loaded before.
+            assert not os.path.exists(journal_path)
+            with open(self.simple_configpath, "rb") as f:
+                config_contents = f.read()
+
+            config["foo"] = "barred"
+            config["nums"] = 456
+            del config["unintentional variable!"]
+            assert config.pop("dec") == 3.14
+            config.setdefault("new key", "new value")
+            config.save()
+
+            with open(self.simple_configpath, "rb") as f:
+                assert f.read() == config_contents  # Only the journal file is written.
+
+            assert os.path.exists(journal_path)
+
+            expected = [("foo", "barred"), ("nums", 456), ("Aboolean", True), ("new key", "new value")]
+            loaded_config = Simple(self.simple_configpath, isbase64=isbase64)
+            loaded_config.load()  # The journal is replayed even if journal mode is off.
+            assert loaded_config.items() == expected
+
+            config.compact()
+            assert not os.path.exists(journal_path)
+            loaded_config.load()
+            assert loaded_config.items() == expected
+
+            config.journal_max_size = 0  # Compact on every save.
+            config["foo"] = "bar"
+            config.save()
+            assert not os.path.exists(journal_path)
+
+            # Simulate a crash after the configuration file is compacted, but before the journal is removed.
+            config.journal_max_size = Simple.journal_max_size
+            config["foo"] = "journaled"
+            config.save()
+            with open(journal_path, "rb") as f:
+                journal_contents = f.read()
+
+            config["foo"] = "compacted"
+            config.compact()
+            with open(journal_path, "wb") as f:
+                f.write(journal_contents)
+
+            loaded_config = Simple(self.simple_configpath, isbase64=isbase64, journal=True)
+            loaded_config.load()
+            assert loaded_config["foo"] == "compacted"  # The outdated journal is ignored.
+            loaded_config["nums"] = 789
+            loaded_config.save()  # The outdated journal is not appended to.
+            assert not os.path.exists(journal_path)
+            loaded_config.load()
+            assert loaded_config["foo"] == "compacted" and loaded_config["nums"] == 789
+
+    def testAtomicSave(self):
+        """
+        Test if the configuration file is replaced atomically using each durability policy.
+        """
+
+        for durability in ("none", "data", "full"):
+            config = Simple(self.simple_configpath, durability=durability, journal=True)
+            for key, value in self.key_value_pairs.items():
+                config[key] = value
+
+            config.save()
+            config["foo"] = "barred"
+            config.save()  # Appended to the journal file.
+
+            loaded_config = Simple(self.simple_configpath)
+            loaded_config.load()
+            assert loaded_config["foo"] == "barred"
+
+        with open(self.simple_configpath, "rb") as f:
+            config_contents = f.read()
+
+        def failingSerialize():
+            yield "foo=baz\n"
+            raise RuntimeError("Failed while writing.")
+
+        config = Simple(self.simple_configpath)
+        config.load()
+        config["foo"] = "baz"  # Unmodified configuration files are not saved.
+        config._serialize = failingSerialize
+        try:
+            config.save()
+
+        except RuntimeError:
+            pass
+
+        else:
+            assert False  # RuntimeError should've been raised by `_serialize()`.
+
+        with open(self.simple_configpath, "rb") as f:
+            assert f.read() == config_contents  # The old configuration file is kept.
+
+        assert not any(name.endswith(".tmp") for name in os.listdir(self._tests_folder))
+
+        try:
+            Simple(self.simple_configpath, durability="unknown").save()
+
+        except ValueError:
+            pass
+
+        else:
+            assert False  # ValueError should've been raised because the durability policy is unknown.
+
+    def testAutoSave(self):
+        """
+        Test if the configuration file is saved in the background after it is modified.
+        """
+
+        with Simple(self.simple_configpath, journal=True, auto_save=0.05) as config:
+            for key, value in self.key_value_pairs.items():
+                config[key] = value
+
+            assert config.is_dirty
+            time.sleep(1)
+            assert not config.is_dirty
+            loaded_config = Simple(self.simple_configpath)
+            loaded_config.load()
+            assert loaded_config.items() == config.items()
+
+            for count in range(100):
+                config["count"] = count
+
+        loaded_config.load()  # Saved when leaving the `with` block.
+        assert loaded_config["count"] == 99
+
+        config = Simple(self.simple_configpath, auto_save=60, auto_save_max_delay=60)
+        config.load()
+        config["foo"] = "flushed"
+        config.flush()
+        loaded_config.load()
+        assert loaded_config["foo"] == "flushed"
+
+        try:
+            Simple(self.simple_configpath, readonly=True, auto_save=1)
+
+        except ValueError:
+            pass
+
+        else:
+            assert False, "Auto-save was enabled in read-only mode."
+
+    def testSkipUnchangedSave(self):
+        """
+        Test if saving an unmodified configuration file does not write it again.
+        """
+
+        def inode() -> int:
+            return os.stat(self.simple_configpath).st_ino  # The file is replaced when it is saved.
+
+        for journal in (False, True):
+            config = Simple(self.simple_configpath, journal=journal)
+            for key, value in self.key_value_pairs.items():
+                config[key] = value
+
+            config.compact()
+            saved_inode = inode()
+            config.save()
+            config.load()
+            config.save()
+            config["foo"] = self.key_value_pairs["foo"]  # Modified, but the contents are the same.
+            config.compact()
+            assert inode() == saved_inode and not os.path.isfile(config.journal_path)
+
+            other_config = Simple(self.simple_configpath)
+            other_config.load()
+            other_config["foo"] = "modified by others"
+            other_config.save()
+            config.save()  # The file is modified by others, so it is saved again.
+            other_config.load()
+            assert other_config["foo"] == self.key_value_pairs["foo"]
+
+    def testLazyLoadEncoding(self):
+        """
+        Test if lazy loading gives the same pairs as loading eagerly when the encoding is not the locale encoding.
+        """
+
+        for encoding in ("latin-1", "utf-16"):
+            config = Simple(self.simple_configpath, encoding=encoding)
+            config["name"] = "caf\u00e9"
+            for index in range(1000):
+                config[f"key{index}"] = f"value{index}"
+
+            config.save()
+
+            eager_config = Simple(self.simple_configpath, encoding=encoding, readonly=True)
+            eager_config.load()
+            lazy_config = Simple(self.simple_configpath, encoding=encoding, readonly=True)
+            lazy_config.load(lazy=True)
+
+            assert "name" in lazy_config and "key999" in lazy_config
+            assert lazy_config["name"] == eager_config["name"] == "caf\u00e9"
+            assert lazy_config["key999"] == eager_config["key999"] == "value999"
+            assert lazy_config.items() == eager_config.items()
+
+    def testSaveThroughSymlink(self):
+        """
+        Test if saving through a symbolic link writes its target instead of replacing the link.
+        """
+
+        target_path = os.path.join(self._tests_folder, "symlink_target.conf")
+        link_path = os.path.join(self._tests_folder, "symlink.conf")
+        for path in (target_path, link_path):
+            if os.path.lexists(path):
+                os.remove(path)
+
+        with open(target_path, 'w') as f:
+            f.write("a=1\n")
+
+        try:
+            os.symlink(target_path, link_path)
+
+        except (OSError, NotImplementedError):
+            pytest.skip("Symbolic links are not supported.")
+
+        config = Simple(link_path)
+        config.load()
+        config["a"] = 2
+        config.save()
+
+        assert os.path.islink(link_path)
+        with open(target_path, 'r') as f:
+            assert f.read() == "a=2\n"
+
+        assert [name for name in os.listdir(self._tests_folder) if name.endswith(".tmp")] == []
+
+    def testReloadIfChanged(self):
+        """
+        Test if the configuration file is only loaded again when it is modified.
+        """
+
+        config = Simple(self.simple_configpath)
+        for key, value in self.key_value_pairs.items():
+            config[key] = value
+
+        config.save()
+        assert not config.reload_if_changed()  # The file is not modified since it was saved.
+
+        other_config = Simple(self.simple_configpath, journal=True)
+        other_config.load()
+        other_config["foo"] = "modified by others"
+        other_config.save()  # Appended to the journal file.
+        assert config.reload_if_changed()
+        assert config["foo"] == "modified by others"
+        assert not config.reload_if_changed()
+
     def testReadOnlyMode(self):
         """
         Test read-only mode of simple ConfigHandler.
@@ -335,26 +683,52 @@ class TestSimpleConfigHandler:
         else:
             assert False  # PermissionError should've been raised because readonly is True.
 
-    def testBulkWriteOperations(self, benchmark):
+    def _bulkConfigPath(self, bulk_ops_range: int) -> str:
+        return os.path.join(self._tests_folder, f"bulk_{bulk_ops_range}.conf")
+
+    @pytest.mark.parametrize("bulk_ops_range", bulk_ops_ranges)
+    def testBulkWriteOperations(self, benchmark, bulk_ops_range):
         """
         Perform many write operations using simple ConfigHandler.
         This also benchmarks the performance of its `save()` method.
+        The save time should grow linearly with <bulk_ops_range>.
         """
 
-        config = Simple(self.simple_configpath)
+        config = Simple(self._bulkConfigPath(bulk_ops_range))
 
-        for index, value in enumerate(range(0, self.bulk_ops_range)):
+        for index, value in enumerate(range(0, bulk_ops_range)):
             config[f"key_{index}"] = value
 
-        benchmark(config.save)
+        counter = itertools.count()
+
+        def modify():
+            config["key_0"] = next(counter)  # Unmodified configuration files are not saved.
 
-    def testBulkLoadOperations(self, benchmark):
+        benchmark.pedantic(config.save, setup=modify, rounds=5)
+
+    @pytest.mark.parametrize("bulk_ops_range", bulk_ops_ranges)
+    def testBulkLoadOperations(self, benchmark, bulk_ops_range):
         """
         Load the configuration file made by `self.testBulkWriteOperations()`.
         This also benchmarks the performance of its `load()` method.
         """
 
-        config = Simple(self.simple_configpath)
+        config = Simple(self._bulkConfigPath(bulk_ops_range))
         benchmark(config.load)
 
-        assert len(config) == self.bulk_ops_range
+        assert len(config) == bulk_ops_range
+
+    def testBulkBase64Operations(self):
+        """
+        Check if the streamed Base64 output is the same as encoding the whole file at once.
+        """
+
+        config = Simple(self.simple_base64_configpath, isbase64=True)
+        for index in range(0, self.bulk_ops_ranges[0]):
+            config[f"key_{index}"] = f"value_{index}" * (index % 7)
+
+        config.save()
+
+        expected = ''.join(f"{key}={value}\n" for key, value in config.items())
+        with open(self.simple_base64_configpath, "rb") as f:
+            assert f.read() == base64.b64encode(expected.encode())